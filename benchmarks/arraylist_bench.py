@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2016 Ludovic Trottier
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+ArrayList benchmarks.
+
+Measure the memory per item of an ArrayList of int32 values stored as
+python ints, in an array.array and, when numpy is installed, in a NumPy
+array. Then time inserts and pops in the middle of lists of 1e3 to 1e7
+items, which shift half of the items with slice moves, and compare them
+with a python list, which shifts with memmove, and with the Deque, which
+shifts item by item.
+
+Usage:
+    python benchmarks/arraylist_bench.py
+"""
+
+import time
+import tracemalloc
+
+from pystruct3.list import ArrayList, Deque
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def bytes_per_item(make_list, n_items):
+    """Return the memory allocated per int32 item held in the list,
+    counting the boxed ints of an untyped list.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = make_list()
+    append = items.append
+    for item in range(n_items):
+        append(item + 2**20)
+    del append
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / n_items
+
+def middle_time(items, n_operations):
+    """Return the mean time of an insert and a pop in the middle of a
+    list.
+    """
+    start = time.perf_counter()
+    if isinstance(items, list):
+        for item in range(n_operations):
+            items.insert(len(items) // 2, item)
+            items.pop(len(items) // 2)
+    else:
+        for item in range(n_operations):
+            items.insert(item, items.size() // 2)
+            items.pop(items.size() // 2)
+    return (time.perf_counter() - start) / n_operations
+
+def filled(make_list, n_items):
+    """Return a list of n_items items.
+    """
+    items = make_list()
+    items.extend(range(n_items))
+    return items
+
+
+if __name__ == '__main__':
+    n_items = 1000000
+    lists = [('python ints', ArrayList),
+             ("array.array 'i'", lambda : ArrayList(2, 'i'))]
+    if numpy is not None:
+        lists.append(('numpy int32', lambda : ArrayList(2, dtype='int32')))
+    print('{:>18} {:>12} {:>16}'.format('storage', 'bytes/item',
+                                        'MB for 100M'))
+    for name, make_list in lists:
+        size = bytes_per_item(make_list, n_items)
+        print('{:>18} {:>12.1f} {:>16.0f}'.format(name, size, size*100))
+
+    n_operations = 100
+    lists = [('python list', list, 10**7),
+             ('ArrayList', ArrayList, 10**7),
+             ("ArrayList 'i'", lambda : ArrayList(2, 'i'), 10**7),
+             ('Deque', Deque, 10**5)]
+    print()
+    print('{:>18}'.format('insert+pop') +
+          ''.join('{:>12}'.format('1e{}'.format(power))
+                  for power in range(3, 8)))
+    for name, make_list, max_items in lists:
+        times = []
+        for power in range(3, 8):
+            if 10**power > max_items:
+                times.append('{:>12}'.format('-'))
+                continue
+            items = filled(make_list, 10**power)
+            times.append('{:>10.1f}us'.format(
+                1e6*middle_time(items, n_operations)))
+            del items
+        print('{:>18}'.format(name) + ''.join(times))
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2016 Ludovic Trottier
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Delay queue benchmarks.
+
+Schedule one million timers with a mix of short, medium and long delays in
+a DelayQueue backed by a heap and in one backed by a timing wheel, then
+drain them while the clock moves forward. The clock is simulated so that
+only the data structures are timed. A plain heapq of (deadline, item)
+tuples is given as a baseline.
+
+Usage:
+    python benchmarks/delay_bench.py
+"""
+
+import gc
+import heapq
+import random
+import time
+
+from pystruct3.queue import DelayQueue
+
+
+def make_delays(n_timers):
+    """Return n_timers delays: 50% under a second, 40% under a minute and
+    10% under an hour.
+    """
+    random.seed(0)
+    delays = []
+    for _ in range(n_timers):
+        draw = random.random()
+        if draw < 0.5:
+            delays.append(random.random())
+        elif draw < 0.9:
+            delays.append(60*random.random())
+        else:
+            delays.append(3600*random.random())
+    return delays
+
+def run_queue(resolution, delays, n_steps):
+    """Return the time needed to put and to drain the timers.
+    """
+    gc.collect()
+    now = [0.0]
+    queue = DelayQueue(resolution, lambda : now[0])
+    put = queue.put
+    start = time.perf_counter()
+    for item, delay in enumerate(delays):
+        put(item, delay)
+    put_time = time.perf_counter() - start
+
+    get_many = queue.get_many
+    n_got = 0
+    start = time.perf_counter()
+    for step in range(1, n_steps + 1):
+        now[0] = 3600.0*step/n_steps
+        while True:
+            try:
+                n_got = n_got + len(get_many(4096, block=False))
+            except ValueError:
+                break
+    get_time = time.perf_counter() - start
+    assert n_got == len(delays)
+    return put_time, get_time
+
+def run_heapq(delays, n_steps):
+    """Return the time needed to push and to drain the timers with heapq.
+    """
+    gc.collect()
+    heap = []
+    push = heapq.heappush
+    start = time.perf_counter()
+    for item, delay in enumerate(delays):
+        push(heap, (delay, item))
+    put_time = time.perf_counter() - start
+
+    pop = heapq.heappop
+    start = time.perf_counter()
+    for step in range(1, n_steps + 1):
+        now = 3600.0*step/n_steps
+        while heap and heap[0][0] <= now:
+            pop(heap)
+    get_time = time.perf_counter() - start
+    return put_time, get_time
+
+
+if __name__ == '__main__':
+    n_timers = 1000000
+    n_steps = 36000
+    delays = make_delays(n_timers)
+    print('{:>20} {:>12} {:>12}'.format('structure', 'put', 'drain'))
+    for name, times in [
+            ('heapq', run_heapq(delays, n_steps)),
+            ('DelayQueue heap', run_queue(None, delays, n_steps)),
+            ('DelayQueue 1ms wheel', run_queue(0.001, delays, n_steps))]:
+        print('{:>20} {:>11.4f}s {:>11.4f}s'.format(name, *times))
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2016 Ludovic Trottier
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Deque benchmarks.
+
+Compare the circular-array Deque with the DoubleLinkedList it replaces as
+queue container, and with collections.deque: time of a FIFO workload and
+memory per item. Then time the same workload moved in batches, with the
+extend and popleft_many slice copies of Deque.
+
+Usage:
+    python benchmarks/deque_bench.py
+"""
+
+import collections
+import time
+import tracemalloc
+
+from pystruct3.list import Deque, DoubleLinkedList
+
+
+def fifo_time(items, n_items):
+    """Return the time spent appending then popping n_items items.
+    """
+    start = time.perf_counter()
+    append = items.append
+    for item in range(n_items):
+        append(item)
+    if isinstance(items, DoubleLinkedList):
+        for _ in range(n_items):
+            items.pop(0)
+    else:
+        popleft = items.popleft
+        for _ in range(n_items):
+            popleft()
+    return time.perf_counter() - start
+
+def batch_time(items, n_items, batch_size):
+    """Return the time spent appending then popping n_items items in
+    batches of batch_size items.
+    """
+    batch = list(range(batch_size))
+    n_batches = n_items // batch_size
+    start = time.perf_counter()
+    extend = items.extend
+    for _ in range(n_batches):
+        extend(batch)
+    if isinstance(items, Deque):
+        popleft_many = items.popleft_many
+        for _ in range(n_batches):
+            popleft_many(batch_size)
+    else:
+        popleft = items.popleft
+        for _ in range(n_batches):
+            [popleft() for _ in range(batch_size)]
+    return time.perf_counter() - start
+
+def bytes_per_item(make_items, n_items):
+    """Return the memory allocated per item held in the container.
+    """
+    payload = list(range(n_items))
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = make_items()
+    for item in payload:
+        items.append(item)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / n_items
+
+
+if __name__ == '__main__':
+    n_items = 200000
+    print('{:>20} {:>12} {:>14}'.format('container', 'fifo', 'bytes/item'))
+    for name, make_items in [('DoubleLinkedList', DoubleLinkedList),
+                             ('Deque', Deque),
+                             ('collections.deque', collections.deque)]:
+        print('{:>20} {:>11.4f}s {:>14.1f}'.format(
+            name, fifo_time(make_items(), n_items),
+            bytes_per_item(make_items, n_items)))
+
+    batch_size = 64
+    print()
+    print('{:>20} {:>12}'.format('container', 'batch fifo'))
+    for name, make_items in [('Deque', Deque),
+                             ('collections.deque', collections.deque)]:
+        print('{:>20} {:>11.4f}s'.format(
+            name, batch_time(make_items(), n_items, batch_size)))
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2016 Ludovic Trottier
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Heap benchmarks.
+
+Compare the array-backed Heap with the PairingHeap on a merge-heavy
+workload: many small shard heaps are repeatedly merged into a single heap,
+which is then partially drained.
+
+Usage:
+    python benchmarks/heap_bench.py
+"""
+
+import random
+import time
+
+from pystruct3.tree import Heap, PairingHeap
+
+
+def merge_workload(heap_class, n_shards, shard_size):
+    """Return the time spent merging the shards and draining the result.
+    """
+    rng = random.Random(0)
+    shards = []
+    for _ in range(n_shards):
+        shard = heap_class()
+        shard.push_many(rng.random() for _ in range(shard_size))
+        shards.append(shard)
+
+    start = time.perf_counter()
+    while len(shards) > 1:
+        # Pairwise merges, as when per-shard queues are combined in a tree.
+        merged = []
+        for i in range(0, len(shards) - 1, 2):
+            shards[i].merge(shards[i + 1])
+            merged.append(shards[i])
+        if len(shards) % 2 == 1:
+            merged.append(shards[-1])
+        shards = merged
+    merge_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(shard_size):
+        shards[0].pop()
+    pop_time = time.perf_counter() - start
+    return merge_time, pop_time
+
+
+if __name__ == '__main__':
+    print('{:>8} {:>8} {:>14} {:>14} {:>14} {:>14}'.format(
+        'shards', 'size', 'Heap merge', 'Pairing merge',
+        'Heap pop', 'Pairing pop'))
+    for n_shards, shard_size in [(16, 10000), (256, 1000), (4096, 10)]:
+        heap_times = merge_workload(Heap, n_shards, shard_size)
+        pairing_times = merge_workload(PairingHeap, n_shards, shard_size)
+        print('{:>8} {:>8} {:>13.4f}s {:>13.4f}s {:>13.4f}s {:>13.4f}s'.format(
+            n_shards, shard_size, heap_times[0], pairing_times[0],
+            heap_times[1], pairing_times[1]))
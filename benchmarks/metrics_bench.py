@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2016 Ludovic Trottier
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Queue metrics benchmarks.
+
+Time a FIFO workload on a plain FIFOQueue, whose code path is untouched by
+the metrics layer, and on the same queue wrapped in a MeteredQueue, item by
+item and in batches.
+
+Usage:
+    python benchmarks/metrics_bench.py
+"""
+
+import time
+
+from pystruct3.queue import FIFOQueue, MeteredQueue
+
+
+def one_time(queue, n_items):
+    """Return the time spent enqueuing then dequeuing n_items items.
+    """
+    start = time.perf_counter()
+    enqueue = queue.enqueue
+    for item in range(n_items):
+        enqueue(item)
+    dequeue = queue.dequeue
+    for _ in range(n_items):
+        dequeue()
+    return time.perf_counter() - start
+
+def many_time(queue, n_items, batch_size):
+    """Return the time spent moving n_items items in batches.
+    """
+    n_batches = n_items // batch_size
+    batches = [list(range(i*batch_size, (i + 1)*batch_size))
+               for i in range(n_batches)]
+    start = time.perf_counter()
+    for batch in batches:
+        queue.enqueue_many(batch)
+    for _ in range(n_batches):
+        queue.dequeue_many(batch_size)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    n_items = 200000
+    batch_size = 64
+    print('{:>14} {:>12} {:>12}'.format('queue', 'one', 'batch'))
+    for name, make_queue in [
+            ('FIFOQueue', FIFOQueue),
+            ('MeteredQueue', lambda : MeteredQueue(FIFOQueue()))]:
+        print('{:>14} {:>11.4f}s {:>11.4f}s'.format(
+            name, one_time(make_queue(), n_items),
+            many_time(make_queue(), n_items, batch_size)))
+    queue = MeteredQueue(FIFOQueue())
+    one_time(queue, n_items)
+    print(queue.snapshot())
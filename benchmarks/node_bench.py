@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2016 Ludovic Trottier
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Linked node lifecycle benchmarks.
+
+Build linked lists and a linked stack of one million items, then drop
+them, and report the time of the construction and of the destruction,
+including the garbage collection of the nodes.
+
+Usage:
+    python benchmarks/node_bench.py
+"""
+
+import gc
+import time
+
+from pystruct3.list import (CircularDoubleLinkedList,
+                            CircularSingleLinkedList, DoubleLinkedList,
+                            SingleLinkedList)
+from pystruct3.stack import Stack
+
+
+def lifecycle_time(make_container, n_items):
+    """Return the times spent filling a container with n_items items and
+    destroying it.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    container = make_container()
+    if isinstance(container, Stack):
+        add = container.push
+        for item in range(n_items):
+            add(item)
+    else:
+        # Insert at the front, which is O(1) for every linked list.
+        add = container.insert
+        for item in range(n_items):
+            add(item, 0)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    del container, add
+    gc.collect()
+    return build_time, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    n_items = 1000000
+    print('{:>26} {:>12} {:>12}'.format('container', 'build', 'destroy'))
+    for make_container in [SingleLinkedList, DoubleLinkedList,
+                           CircularSingleLinkedList, CircularDoubleLinkedList,
+                           Stack]:
+        print('{:>26} {:>11.4f}s {:>11.4f}s'.format(
+            make_container.__name__,
+            *lifecycle_time(make_container, n_items)))
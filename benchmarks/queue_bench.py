@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2016 Ludovic Trottier
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Blocking queue benchmarks.
+
+Move items from several producer threads to several consumer threads
+through a bounded BlockingQueue, with one get per item and with batched
+get_many calls, and compare with the standard library queue.Queue.
+
+Usage:
+    python benchmarks/queue_bench.py
+"""
+
+import queue
+import threading
+import time
+
+from pystruct3.queue import BlockingQueue
+
+
+def run(make_queue, consume, n_producers, n_consumers, n_items):
+    """Return the time needed to move n_items items through a queue.
+    """
+    items_queue = make_queue()
+    per_producer = n_items // n_producers
+    stop = object()
+
+    def produce():
+        put = items_queue.put
+        for item in range(per_producer):
+            put(item)
+
+    threads = [threading.Thread(target=produce) for _ in range(n_producers)]
+    consumers = [threading.Thread(target=consume, args=(items_queue, stop))
+                 for _ in range(n_consumers)]
+    start = time.perf_counter()
+    for thread in threads + consumers:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for _ in consumers:
+        items_queue.put(stop)
+    for thread in consumers:
+        thread.join()
+    return time.perf_counter() - start
+
+def consume_one(items_queue, stop):
+    """Get the items one at a time until stop is received.
+    """
+    get = items_queue.get
+    while get() is not stop:
+        pass
+
+def consume_many(items_queue, stop):
+    """Get the items in batches until stop is received.
+    """
+    get_many = items_queue.get_many
+    while True:
+        items = get_many(64)
+        if stop in items:
+            # Hand back the other stop markers of the batch.
+            for _ in range(items.count(stop) - 1):
+                items_queue.put(stop)
+            return
+
+
+if __name__ == '__main__':
+    n_items = 200000
+    capacity = 1024
+    print('{:>12} {:>14} {:>14} {:>14}'.format(
+        'threads', 'queue.Queue', 'get', 'get_many'))
+    for n_producers, n_consumers in [(1, 1), (4, 4), (8, 2)]:
+        stdlib_time = run(lambda : queue.Queue(capacity), consume_one,
+                          n_producers, n_consumers, n_items)
+        get_time = run(lambda : BlockingQueue(capacity), consume_one,
+                       n_producers, n_consumers, n_items)
+        many_time = run(lambda : BlockingQueue(capacity), consume_many,
+                        n_producers, n_consumers, n_items)
+        print('{:>12} {:>13.4f}s {:>13.4f}s {:>13.4f}s'.format(
+            '{}p/{}c'.format(n_producers, n_consumers),
+            stdlib_time, get_time, many_time))
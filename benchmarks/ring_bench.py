@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2016 Ludovic Trottier
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Shared ring buffer benchmarks.
+
+Move 16-byte records from a producer process to a consumer process
+through a SharedRingBuffer, one record or one batch at a time, and
+through a multiprocessing.Queue carrying batches of records.
+
+Usage:
+    python benchmarks/ring_bench.py
+"""
+
+import multiprocessing
+import os
+import time
+
+from pystruct3.queue import SharedRingBuffer
+
+SLOT_SIZE = 16
+BATCH_SIZE = 256
+
+
+def wait():
+    """Let the other process run, which matters on a single core.
+    """
+    if hasattr(os, 'sched_yield'):
+        os.sched_yield()
+    else:
+        time.sleep(0)
+
+def produce_ring(ring, n_records, batched):
+    """Push n_records records in a ring buffer, yielding while it is full.
+    """
+    record = bytes(SLOT_SIZE)
+    if batched:
+        batch = record * BATCH_SIZE
+        sent = 0
+        while sent < n_records:
+            size = min(BATCH_SIZE, n_records - sent)
+            pushed = ring.push_many(batch[:size*SLOT_SIZE])
+            if pushed == 0:
+                wait()
+            sent = sent + pushed
+    else:
+        push = ring.push
+        sent = 0
+        while sent < n_records:
+            try:
+                push(record)
+                sent = sent + 1
+            except ValueError:
+                wait()
+    ring.close()
+
+def produce_queue(items_queue, n_records):
+    """Put n_records records in a multiprocessing queue, by batches.
+    """
+    batch = bytes(SLOT_SIZE) * BATCH_SIZE
+    for _ in range(n_records // BATCH_SIZE):
+        items_queue.put(batch)
+
+def ring_time(n_records, batched):
+    """Return the time needed to move n_records records through a ring.
+    """
+    ring = SharedRingBuffer(SLOT_SIZE, 4096)
+    producer = multiprocessing.Process(target=produce_ring,
+                                       args=(ring, n_records, batched))
+    start = time.perf_counter()
+    producer.start()
+    received = 0
+    if batched:
+        while received < n_records:
+            records = ring.pop_many(BATCH_SIZE)
+            if not records:
+                wait()
+            received = received + len(records) // SLOT_SIZE
+    else:
+        pop = ring.pop
+        while received < n_records:
+            try:
+                pop()
+                received = received + 1
+            except ValueError:
+                wait()
+    elapsed = time.perf_counter() - start
+    producer.join()
+    ring.close()
+    return elapsed
+
+def queue_time(n_records):
+    """Return the time needed to move n_records records through a
+       multiprocessing queue.
+    """
+    items_queue = multiprocessing.Queue(64)
+    producer = multiprocessing.Process(target=produce_queue,
+                                       args=(items_queue, n_records))
+    start = time.perf_counter()
+    producer.start()
+    for _ in range(n_records // BATCH_SIZE):
+        items_queue.get()
+    elapsed = time.perf_counter() - start
+    producer.join()
+    return elapsed
+
+
+if __name__ == '__main__':
+    n_records = 2**21
+    print('{:>28} {:>16}'.format('method', 'records/s'))
+    for name, elapsed in [
+            ('ring push/pop', ring_time(n_records // 8, False) * 8),
+            ('ring push_many/pop_many', ring_time(n_records, True)),
+            ('multiprocessing.Queue batch', queue_time(n_records))]:
+        print('{:>28} {:>16,.0f}'.format(name, n_records / elapsed))
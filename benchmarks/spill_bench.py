@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2016 Ludovic Trottier
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Spill queue benchmarks.
+
+Enqueue then dequeue a burst of items with a SpillQueue whose in-memory
+deque only holds a fraction of them, and compare time and peak memory
+with the in-memory FIFOQueue.
+
+Usage:
+    python benchmarks/spill_bench.py
+"""
+
+import time
+import tracemalloc
+
+from pystruct3.queue import FIFOQueue, SpillQueue
+
+
+def burst(items_queue, n_items):
+    """Enqueue then dequeue n_items items.
+    """
+    for item in range(n_items):
+        items_queue.enqueue(('record', item))
+    for _ in range(n_items):
+        items_queue.dequeue()
+
+def measure(make_queue, n_items):
+    """Return the time spent and the peak memory used by a burst. Memory
+       is traced in a separate run since tracing slows allocations down.
+    """
+    items_queue = make_queue()
+    start = time.perf_counter()
+    burst(items_queue, n_items)
+    elapsed = time.perf_counter() - start
+    if isinstance(items_queue, SpillQueue):
+        items_queue.close()
+
+    items_queue = make_queue()
+    tracemalloc.start()
+    burst(items_queue, n_items)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    if isinstance(items_queue, SpillQueue):
+        items_queue.close()
+    return elapsed, peak
+
+
+if __name__ == '__main__':
+    n_items = 500000
+    print('{:>26} {:>12} {:>14}'.format('queue', 'time', 'peak memory'))
+    for name, make_queue in [
+            ('FIFOQueue', FIFOQueue),
+            ('SpillQueue, no spill', lambda : SpillQueue(n_items)),
+            ('SpillQueue, 2% in memory', lambda : SpillQueue(10000, 5000))]:
+        elapsed, peak = measure(make_queue, n_items)
+        print('{:>26} {:>11.4f}s {:>12.1f}MB'.format(
+            name, elapsed, peak / 2**20))
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2016 Ludovic Trottier
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Stack benchmarks.
+
+Compare the linked Stack with the ArrayStack on a python list, on a typed
+array and with a capacity reserve, and with a bare python list: time of a
+push then pop workload and memory per item. Then time the snapshots of an
+undo history: a copy of the stack after each push, with the mutable stacks
+and with the PersistentStack, whose copies share their nodes.
+
+Usage:
+    python benchmarks/stack_bench.py
+"""
+
+import time
+import tracemalloc
+
+from pystruct3.stack import ArrayStack, PersistentStack, Stack
+
+
+def push_pop_time(stack, n_items):
+    """Return the time spent pushing then popping n_items items.
+    """
+    start = time.perf_counter()
+    push = stack.append if isinstance(stack, list) else stack.push
+    for item in range(n_items):
+        push(item)
+    pop = stack.pop
+    for _ in range(n_items):
+        pop()
+    return time.perf_counter() - start
+
+def snapshot_time(stack, n_snapshots, depth):
+    """Return the time spent pushing depth items then taking n_snapshots
+    snapshots, each after one push and one pop.
+    """
+    if isinstance(stack, PersistentStack):
+        for item in range(depth):
+            stack = stack.push(item)
+        start = time.perf_counter()
+        snapshots = []
+        for item in range(n_snapshots):
+            stack = stack.pop().push(item)
+            snapshots.append(stack.copy())
+        return time.perf_counter() - start
+    for item in range(depth):
+        stack.push(item)
+    start = time.perf_counter()
+    snapshots = []
+    for item in range(n_snapshots):
+        stack.pop()
+        stack.push(item)
+        snapshots.append(stack.copy())
+    return time.perf_counter() - start
+
+def bytes_per_item(make_stack, n_items):
+    """Return the memory allocated per item held in the stack.
+    """
+    payload = list(range(n_items))
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    stack = make_stack()
+    push = stack.append if isinstance(stack, list) else stack.push
+    for item in payload:
+        push(item)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / n_items
+
+
+if __name__ == '__main__':
+    n_items = 500000
+    print('{:>24} {:>12} {:>14}'.format('stack', 'push/pop', 'bytes/item'))
+    for name, make_stack in [
+            ('Stack', Stack),
+            ('ArrayStack', ArrayStack),
+            ('ArrayStack q', lambda : ArrayStack('q')),
+            ('ArrayStack reserved', lambda : ArrayStack(capacity=n_items)),
+            ('python list', list)]:
+        print('{:>24} {:>11.4f}s {:>14.1f}'.format(
+            name, push_pop_time(make_stack(), n_items),
+            bytes_per_item(make_stack, n_items)))
+
+    n_snapshots = 1000
+    depth = 1000
+    print()
+    print('{:>24} {:>12}'.format('stack', 'snapshots'))
+    for name, make_stack in [('Stack', Stack),
+                             ('ArrayStack', ArrayStack),
+                             ('PersistentStack', PersistentStack)]:
+        print('{:>24} {:>11.4f}s'.format(
+            name, snapshot_time(make_stack(), n_snapshots, depth)))
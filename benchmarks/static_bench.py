@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2016 Ludovic Trottier
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Static lookup table benchmarks.
+
+Compare lookups in an EytzingerTree with a binary search over a sorted
+python list, for one key at a time and for batches of keys. The batch
+lookups are vectorized when numpy is installed.
+
+Usage:
+    python benchmarks/static_bench.py
+"""
+
+import bisect
+import random
+import time
+
+from pystruct3.tree import EytzingerTree
+
+
+def bisect_many(keys, values, queries):
+    """Search the values of queries in a sorted list with bisect.
+    """
+    n_keys = len(keys)
+    results = []
+    for query in queries:
+        index = bisect.bisect_left(keys, query)
+        if index < n_keys and keys[index] == query:
+            results.append(values[index])
+        else:
+            results.append(None)
+    return results
+
+
+if __name__ == '__main__':
+    rng = random.Random(0)
+    print('{:>10} {:>12} {:>12} {:>12}'.format(
+        'keys', 'bisect', 'search', 'search_many'))
+    for n_keys in [1000, 100000, 1000000]:
+        keys = list(range(0, 2*n_keys, 2))
+        tree = EytzingerTree(keys, keys, 'q')
+        queries = [rng.randrange(2*n_keys) for _ in range(100000)]
+
+        start = time.perf_counter()
+        expected = bisect_many(keys, keys, queries)
+        bisect_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for query in queries:
+            query in tree
+        search_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = tree.search_many(queries)
+        many_time = time.perf_counter() - start
+        assert results == expected
+
+        print('{:>10} {:>11.4f}s {:>11.4f}s {:>11.4f}s'.format(
+            n_keys, bisect_time, search_time, many_time))
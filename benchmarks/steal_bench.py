@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2016 Ludovic Trottier
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Work-stealing benchmarks.
+
+Run recursive task graphs with the WorkStealingPool and with a pool of
+threads sharing a single locked BlockingQueue: a binary split of a range
+down to small leaf tasks, and a parallel traversal of an adjacency list
+graph where every visited vertice spawns a task per new neighbor.
+
+Usage:
+    python benchmarks/steal_bench.py
+"""
+
+import random
+import threading
+import time
+
+from pystruct3.graph import AdjacencyListGraph
+from pystruct3.queue import BlockingQueue, WorkStealingPool
+
+
+class SharedQueuePool(object):
+    """Thread pool whose workers share one locked queue of tasks.
+    """
+    def __init__(self, n_workers):
+        self._tasks = BlockingQueue()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._done = threading.Condition(self._lock)
+        self._threads = [threading.Thread(target=self._run, daemon=True)
+                         for _ in range(n_workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, function, *args):
+        with self._lock:
+            self._pending = self._pending + 1
+        self._tasks.put((function, args))
+
+    def _run(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            function, args = task
+            function(*args)
+            with self._lock:
+                self._pending = self._pending - 1
+                if self._pending == 0:
+                    self._done.notify_all()
+
+    def wait(self):
+        with self._lock:
+            while self._pending > 0:
+                self._done.wait()
+
+    def shutdown(self):
+        for _ in self._threads:
+            self._tasks.put(None)
+        for thread in self._threads:
+            thread.join()
+
+
+def split_time(pool, n_leaves):
+    """Return the time spent splitting a range down to n_leaves leaves.
+    """
+    def split(lo, hi):
+        if hi - lo == 1:
+            sum(range(20))
+        else:
+            pool.submit(split, lo, (lo + hi) // 2)
+            pool.submit(split, (lo + hi) // 2, hi)
+
+    start = time.perf_counter()
+    pool.submit(split, 0, n_leaves)
+    pool.wait()
+    return time.perf_counter() - start
+
+def traversal_time(pool, graph, source):
+    """Return the time spent visiting the vertices reachable from source.
+    """
+    visited = {source: None}
+
+    def visit(vertice):
+        token = object()
+        for neighbor in graph.neighbors(vertice):
+            if visited.setdefault(neighbor, token) is token:
+                pool.submit(visit, neighbor)
+
+    start = time.perf_counter()
+    pool.submit(visit, source)
+    pool.wait()
+    elapsed = time.perf_counter() - start
+    assert len(visited) == graph.n_vertices()
+    return elapsed
+
+
+if __name__ == '__main__':
+    rng = random.Random(0)
+    graph = AdjacencyListGraph()
+    n_vertices = 2000
+    for vertice in range(n_vertices):
+        graph.insert(vertice)
+    edges = set()
+    for vertice in range(1, n_vertices):
+        edges.add((rng.randrange(vertice), vertice))
+    while len(edges) < 5*n_vertices:
+        edges.add((rng.randrange(n_vertices), rng.randrange(n_vertices)))
+    for vertice1, vertice2 in edges:
+        graph.connect(vertice1, vertice2)
+
+    print('{:>8} {:>16} {:>16} {:>16} {:>16}'.format(
+        'workers', 'split shared', 'split stealing',
+        'graph shared', 'graph stealing'))
+    for n_workers in [1, 4, 8]:
+        times = []
+        for task in ['split', 'graph']:
+            for pool_class in [SharedQueuePool, WorkStealingPool]:
+                pool = pool_class(n_workers)
+                if task == 'split':
+                    times.append(split_time(pool, 2**16))
+                else:
+                    times.append(traversal_time(pool, graph, 0))
+                pool.shutdown()
+        print('{:>8} {:>15.4f}s {:>15.4f}s {:>15.4f}s {:>15.4f}s'.format(
+            n_workers, *times))
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2016 Ludovic Trottier
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Streaming benchmarks.
+
+Compare the heap-based top-k selection and k-way merge of pystruct3.tree
+with their heapq counterparts: top 100 of a large stream, and merges of
+many sorted shards.
+
+Usage:
+    python benchmarks/stream_bench.py
+"""
+
+import heapq
+import random
+import time
+
+from pystruct3.tree import merge, nlargest, nsmallest
+
+
+def timed(function, *args, **kwargs):
+    """Return the time spent in a call of function.
+    """
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+def drain(iterator):
+    """Consume an iterator.
+    """
+    for _ in iterator:
+        pass
+
+
+if __name__ == '__main__':
+    rng = random.Random(0)
+    stream = [rng.random() for _ in range(1000000)]
+
+    print('{:>24} {:>12} {:>12}'.format('top-k', 'pystruct3', 'heapq'))
+    for name, ours, theirs, kwargs in [
+            ('nlargest(100)', nlargest, heapq.nlargest, {}),
+            ('nsmallest(100)', nsmallest, heapq.nsmallest, {}),
+            ('nlargest(100, key)', nlargest, heapq.nlargest, {'key': abs})]:
+        print('{:>24} {:>11.4f}s {:>11.4f}s'.format(
+            name, timed(ours, 100, stream, **kwargs),
+            timed(theirs, 100, stream, **kwargs)))
+
+    print()
+    print('{:>24} {:>12} {:>12}'.format('merge', 'pystruct3', 'heapq'))
+    for n_shards, shard_size in [(4, 250000), (50, 20000), (500, 2000)]:
+        shards = [sorted(rng.random() for _ in range(shard_size))
+                  for _ in range(n_shards)]
+        print('{:>24} {:>11.4f}s {:>11.4f}s'.format(
+            '{} x {}'.format(n_shards, shard_size),
+            timed(drain, merge(*shards)),
+            timed(drain, heapq.merge(*shards))))
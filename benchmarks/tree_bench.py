@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2016 Ludovic Trottier
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Ordered map benchmarks.
+
+Compare the balanced search trees with a dict paired with a sorted list of
+keys searched with bisect, on insertion, lookup and floor queries, and
+report the memory footprint of each structure. The B+ tree is measured
+with keys in python lists and unboxed in arrays of 64-bit integers. Also
+compare building a red-black tree from sorted pairs with inserting them
+one at a time.
+
+The keys are created before the memory is traced, so boxed integers are
+not counted against the structures that keep references to them.
+
+Usage:
+    python benchmarks/tree_bench.py [n_keys]
+"""
+
+import bisect
+import functools
+import random
+import sys
+import time
+import tracemalloc
+
+from pystruct3.tree import AVLTree, BPlusTree, RedBlackTree
+
+
+class DictBisect(object):
+    """Baseline ordered map: a dict plus a sorted list of its keys.
+    """
+    def __init__(self):
+        self._values = {}
+        self._keys = []
+
+    def insert(self, key, value=None):
+        if key not in self._values:
+            bisect.insort(self._keys, key)
+        self._values[key] = value
+
+    def search(self, key):
+        return self._values[key]
+
+    def floor(self, key):
+        return self._keys[bisect.bisect_right(self._keys, key) - 1]
+
+
+def build(map_class, keys):
+    ordered_map = map_class()
+    for key in keys:
+        ordered_map.insert(key)
+    return ordered_map
+
+
+def measure(map_class, keys, queries):
+    start = time.perf_counter()
+    ordered_map = build(map_class, keys)
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in queries:
+        ordered_map.search(key)
+    search_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in queries:
+        ordered_map.floor(key + 0.5)
+    floor_time = time.perf_counter() - start
+
+    del ordered_map
+    tracemalloc.start()
+    ordered_map = build(map_class, keys)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return insert_time, search_time, floor_time, memory
+
+
+if __name__ == '__main__':
+    n_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(0)
+    keys = rng.sample(range(10 * n_keys), n_keys)
+    queries = [rng.choice(keys) for _ in range(100000)]
+
+    print('{} keys, {} queries'.format(n_keys, len(queries)))
+    print('{:>12} {:>10} {:>10} {:>10} {:>14}'.format(
+        '', 'insert', 'search', 'floor', 'bytes/key'))
+    map_classes = [
+        ('DictBisect', DictBisect),
+        ('AVLTree', AVLTree),
+        ('RedBlackTree', RedBlackTree),
+        ('BPlusTree', BPlusTree),
+        ('BPlusTree q', functools.partial(BPlusTree, typecode='q')),
+    ]
+    for name, map_class in map_classes:
+        insert_time, search_time, floor_time, memory = measure(
+            map_class, keys, queries)
+        print('{:>12} {:>9.3f}s {:>9.3f}s {:>9.3f}s {:>14.1f}'.format(
+            name, insert_time, search_time, floor_time, memory / n_keys))
+
+    sorted_keys = sorted(keys)
+    sorted_items = [(key, None) for key in sorted_keys]
+    start = time.perf_counter()
+    build(RedBlackTree, sorted_keys)
+    insert_time = time.perf_counter() - start
+    start = time.perf_counter()
+    RedBlackTree.from_sorted(sorted_items)
+    bulk_time = time.perf_counter() - start
+    print('RedBlackTree build: insert {:.3f}s, from_sorted {:.3f}s'.format(
+        insert_time, bulk_time))
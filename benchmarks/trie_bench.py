@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2016 Ludovic Trottier
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Prefix lookup benchmarks.
+
+Compare the RadixTree with a sorted python list scanned with bisect on
+exact lookups and prefix scans, and report the memory footprint of each
+structure next to a plain set of the same strings.
+
+The strings are created before the memory is traced. The sorted list and
+the set only reference them, while the radix tree allocates its own edge
+labels, so its footprint includes the characters themselves.
+
+Usage:
+    python benchmarks/trie_bench.py [n_keys]
+"""
+
+import bisect
+import random
+import sys
+import time
+import tracemalloc
+
+from pystruct3.tree import RadixTree
+
+
+def random_words(n_words, rng):
+    syllables = ['ka', 'to', 'ri', 'se', 'nu', 'mo', 'la', 'pe', 'shi', 'tan']
+    words = set()
+    while len(words) < n_words:
+        words.add(''.join(rng.choice(syllables)
+                          for _ in range(rng.randint(2, 6))))
+    return list(words)
+
+
+def prefix_scan(sorted_keys, prefix):
+    index = bisect.bisect_left(sorted_keys, prefix)
+    while index < len(sorted_keys) and sorted_keys[index].startswith(prefix):
+        yield sorted_keys[index]
+        index = index + 1
+
+
+def traced(build):
+    tracemalloc.start()
+    structure = build()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return structure, memory
+
+
+def build_tree(keys):
+    tree = RadixTree()
+    for key in keys:
+        tree.insert(key)
+    return tree
+
+
+if __name__ == '__main__':
+    n_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    rng = random.Random(0)
+    keys = random_words(n_keys, rng)
+    queries = [rng.choice(keys) for _ in range(100000)]
+    prefixes = [query[:rng.randint(2, 6)] for query in queries[:10000]]
+
+    sorted_keys, list_memory = traced(lambda: sorted(keys))
+    _, set_memory = traced(lambda: set(keys))
+    start = time.perf_counter()
+    tree, tree_memory = traced(lambda: build_tree(keys))
+    print('{} keys, radix tree built in {:.3f}s (traced)'.format(
+        n_keys, time.perf_counter() - start))
+    print('bytes/key: set {:.1f}, sorted list {:.1f}, radix tree {:.1f}'
+          .format(set_memory / n_keys, list_memory / n_keys,
+                  tree_memory / n_keys))
+
+    start = time.perf_counter()
+    for query in queries:
+        index = bisect.bisect_left(sorted_keys, query)
+        sorted_keys[index] == query
+    list_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for query in queries:
+        query in tree
+    tree_time = time.perf_counter() - start
+    print('exact lookups: sorted list {:.3f}s, radix tree {:.3f}s'.format(
+        list_time, tree_time))
+
+    for limit in (10, 100):
+        start = time.perf_counter()
+        for prefix in prefixes:
+            for count,_ in enumerate(prefix_scan(sorted_keys, prefix)):
+                if count == limit:
+                    break
+        list_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for prefix in prefixes:
+            for count,_ in enumerate(tree.items(prefix)):
+                if count == limit:
+                    break
+        tree_time = time.perf_counter() - start
+        print('prefix scans (first {} keys): sorted list {:.3f}s, '
+              'radix tree {:.3f}s'.format(limit, list_time, tree_time))
@@ -32,8 +32,18 @@ The available lists are:
     CircularSingleLinkedList
     CircularDoubleLinkedList
     ArrayList
+    Deque
+It also contains SkipList, an ordered map built out of linked lists.
 """
 
+import array as _array
+import random as _random
+
+try:
+    import numpy as _numpy
+except ImportError:
+    _numpy = None
+
 class List(object):
     """List data structure interface.
 
@@ -359,16 +369,12 @@ class SingleLinkedList(List):
             item (object): Item contained in the node.
             next_node (_Node): Pointer to neighbor node.
         """
+        __slots__ = ('item', 'next_node')
 
         def __init__(self, item, next_node=None):
             self.item = item
             self.next_node = next_node
 
-        def __del__(self):
-            # print('deleted', self.item, self.next_node)
-            self.item = None
-            self.next_node = None
-
     class _ForwardIterator(object):
         """Iterator for SingleLinkedList.
 
@@ -507,6 +513,17 @@ class SingleLinkedList(List):
 
         sentinel.item = item
 
+    def clear(self):
+        # Unlink the nodes one by one, so that freeing a long list never
+        # chains deallocations.
+        sentinel = self._head
+        self._head = None
+        while sentinel is not None:
+            next_node = sentinel.next_node
+            sentinel.next_node = None
+            sentinel = next_node
+        self._size = 0
+
 
 class DoubleLinkedList(List):
     """Double linked list data structure.
@@ -534,16 +551,13 @@ class DoubleLinkedList(List):
             next_node (_Node): Pointer to next neighbor node.
             prev_node (_Node): Pointer to previous neighbo node.
         """
+        __slots__ = ('item', 'next_node', 'prev_node')
+
         def __init__(self, item, next_node=None, prev_node=None):
             self.item = item
             self.next_node = next_node
             self.prev_node = prev_node
 
-        def __del__(self):
-            self.item = None
-            self.next_node = None
-            self.prev_node = None
-
     class _ForwardIterator(object):
         """Iterator for DoubleLinkedList.
 
@@ -727,6 +741,19 @@ class DoubleLinkedList(List):
 
         sentinel.item = item
 
+    def clear(self):
+        # Unlink the nodes one by one: this breaks the reference cycles of
+        # the list, which is then freed without the garbage collector.
+        sentinel = self._head
+        self._head = None
+        self._tail = None
+        while sentinel is not None:
+            next_node = sentinel.next_node
+            sentinel.next_node = None
+            sentinel.prev_node = None
+            sentinel = next_node
+        self._size = 0
+
 
 class CircularSingleLinkedList(List):
     """Circular single linked list data structure.
@@ -749,15 +776,12 @@ class CircularSingleLinkedList(List):
             item (object): Item contained in the node.
             next_node (_Node): Pointer to neighbor node.
         """
+        __slots__ = ('item', 'next_node')
 
         def __init__(self, item, next_node=None):
             self.item = item
             self.next_node = next_node
 
-        def __del__(self):
-            self.item = None
-            self.next_node = None
-
     class _ForwardIterator(object):
         """Iterator for SingleLinkedList.
 
@@ -875,6 +899,17 @@ class CircularSingleLinkedList(List):
 
         sentinel.next_node.item = item
 
+    def clear(self):
+        # Unlink the nodes one by one: this breaks the reference cycle of
+        # the list, which is then freed without the garbage collector.
+        sentinel = self._head.next_node
+        self._head.next_node = self._head
+        while sentinel is not self._head:
+            next_node = sentinel.next_node
+            sentinel.next_node = None
+            sentinel = next_node
+        self._size = 0
+
 
 class CircularDoubleLinkedList(List):
     """Circular double linked list data structure.
@@ -899,16 +934,13 @@ class CircularDoubleLinkedList(List):
             next_node (_Node): Pointer to next neighbor node.
             prev_node (_Node): Pointer to previous neighbo node.
         """
+        __slots__ = ('item', 'next_node', 'prev_node')
+
         def __init__(self, item, next_node=None, prev_node=None):
             self.item = item
             self.next_node = next_node
             self.prev_node = prev_node
 
-        def __del__(self):
-            self.item = None
-            self.next_node = None
-            self.prev_node = None
-
     class _ForwardIterator(object):
         """Iterator for CircularDoubleLinkedList.
 
@@ -1046,15 +1078,43 @@ class CircularDoubleLinkedList(List):
 
         sentinel.item = item
 
+    def clear(self):
+        # Unlink the nodes one by one: this breaks the reference cycles of
+        # the list, which is then freed without the garbage collector.
+        sentinel = self._head.next_node
+        self._head.next_node = self._head
+        self._head.prev_node = self._head
+        while sentinel is not self._head:
+            next_node = sentinel.next_node
+            sentinel.next_node = None
+            sentinel.prev_node = None
+            sentinel = next_node
+        self._size = 0
+
 
 class ArrayList(List):
     """Array list data structure.
 
+    The items are stored in a circular array. By default it is a python
+    list of object references; with a typecode it is an array.array, and
+    with a dtype a NumPy array, so that numeric items are stored unboxed,
+    e.g. in 4 bytes each for int32 values. The contents of a typed list
+    can then be shared without copy as a memoryview.
+
     Args:
         capacity (int): Initial capacity of the array.
+        typecode (Optional[str]): Type code of an array.array holding the
+            items, e.g. 'i'. Defaults to None.
+        dtype (Optional[object]): NumPy dtype of an array holding the
+            items, e.g. 'int32'. Defaults to None.
 
     Attributs (public):
         Nothing.
+
+    Raises:
+        ValueError: An error occurs if both typecode and dtype are given,
+                    if typecode is not a valid type code, or if dtype is
+                    given and numpy is not installed.
     """
 
     class _ForwardIterator(object):
@@ -1086,31 +1146,110 @@ class ArrayList(List):
             self.head = (self.head + 1) % len(self.array)
             return item
 
-    def __init__(self, capacity=2):
+    def __init__(self, capacity=2, typecode=None, dtype=None):
+        if (typecode is not None) and (dtype is not None):
+            raise ValueError('Arguments typecode and dtype are exclusive.')
+        if typecode is not None:
+            # Raises ValueError on an invalid type code.
+            _array.array(typecode)
+        if dtype is not None:
+            if _numpy is None:
+                raise ValueError('Argument dtype requires numpy.')
+            _numpy.dtype(dtype)
         List.__init__(self)
+        self._typecode = typecode
+        self._dtype = dtype
+        self._min_capacity = capacity
         self._capacity = capacity
-        self._array = [None] * self._capacity
+        self._array = self._new_array(self._capacity)
         self._head = 0
         self._tail = 0
 
+    def __del__(self):
+        # The array is freed with the list, whereas clear would allocate a
+        # new one of the minimal capacity.
+        pass
+
     def __iter__(self):
         return self._ForwardIterator(self._array, self._head, self._tail)
 
-    def _resize(self):
-        new_array = [None] * self._capacity * 2
-        i = self._head
-        pos = 0
-        while i != self._tail:
-            new_array[pos] = self._array[i]
-            self._array[i] = None
-            i = (i + 1) % self._capacity
-            pos = pos + 1
-
-        self._capacity = self._capacity * 2
+    def _new_array(self, capacity):
+        """Create an array of a given capacity for the items.
+        """
+        if self._typecode is not None:
+            array = _array.array(self._typecode)
+            array.frombytes(bytes(array.itemsize * capacity))
+            return array
+        if self._dtype is not None:
+            return _numpy.zeros(capacity, dtype=self._dtype)
+        return [None] * capacity
+
+    def _is_typed(self):
+        """Verify if the items are stored unboxed.
+        """
+        return (self._typecode is not None) or (self._dtype is not None)
+
+    def _read_run(self, start, n_items):
+        """Return a copy of the n_items items from a position of the array.
+
+        The run is cut in at most two slices at the end of the array.
+        """
+        array = self._array
+        end = start + n_items
+        if end <= self._capacity:
+            run = array[start:end]
+            # NumPy slices are views, they must not see later moves.
+            return run if self._dtype is None else run.copy()
+        if self._dtype is not None:
+            return _numpy.concatenate((array[start:],
+                                       array[:end - self._capacity]))
+        return array[start:] + array[:end - self._capacity]
+
+    def _write_run(self, start, run):
+        """Write a run of items from a position of the array.
+
+        The run is cut in at most two slices at the end of the array.
+        """
+        if len(run) == 0:
+            # An empty slice assignment resizes an array.array, which it
+            # refuses while it exports a buffer.
+            return
+        array = self._array
+        end = start + len(run)
+        if end <= self._capacity:
+            array[start:end] = run
+        else:
+            split = self._capacity - start
+            array[start:] = run[:split]
+            array[:end - self._capacity] = run[split:]
+
+    def _shift(self, start, n_items, step):
+        """Move n_items items from a position of the array by step, 1 or
+           -1, into the free slot next to them.
+
+        The run is moved with slices of its own size, cut in at most two
+        at the end of the array, so the array is never resized and the
+        cost only depends on n_items.
+        """
+        if n_items == 0:
+            return
+        run = self._read_run(start, n_items)
+        self._write_run((start + step) % self._capacity, run)
+
+    def _relocate(self, capacity):
+        """Move the items to the start of a new array of a given capacity.
+        """
+        new_array = self._new_array(capacity)
+        new_array[:self._size] = self._read_run(self._head, self._size)
+
+        self._capacity = capacity
         self._head = 0
         self._tail = self._size
         self._array = new_array
 
+    def _resize(self):
+        self._relocate(self._capacity * 2)
+
     def capacity(self):
         return self._capacity
 
@@ -1124,22 +1263,36 @@ class ArrayList(List):
         if self._size + 1 == self._capacity:
             self._resize()
 
-        if index < self._size / 2:
-            self._head = (self._head - 1) % self._capacity
-            sentinel = self._head
-            for i in range(index):
-                self._array[sentinel] = self._array[(sentinel + 1) % self._capacity]
-                sentinel = (sentinel + 1) % self._capacity
+        # Shift the shorter side of the list by one position.
+        capacity = self._capacity
+        if index < self._size // 2:
+            self._shift(self._head, index, -1)
+            self._head = (self._head - 1) % capacity
         else:
-            sentinel = self._tail
-            self._tail = (self._tail + 1) % self._capacity
-            for i in range(self._size - index):
-                self._array[sentinel] = self._array[(sentinel - 1) % self._capacity]
-                sentinel = (sentinel - 1) % self._capacity
+            self._shift((self._head + index) % capacity, self._size - index, 1)
+            self._tail = (self._tail + 1) % capacity
 
-        self._array[sentinel] = item
+        self._array[(self._head + index) % capacity] = item
         self._size = self._size + 1
 
+    def extend(self, other_list):
+        if self._typecode is not None:
+            run = _array.array(self._typecode, other_list)
+        elif self._dtype is not None:
+            run = _numpy.asarray(list(other_list), dtype=self._dtype)
+        else:
+            run = list(other_list)
+
+        # Grow once, then copy the run in at most two slices.
+        capacity = self._capacity
+        while self._size + len(run) >= capacity:
+            capacity = capacity * 2
+        if capacity != self._capacity:
+            self._relocate(capacity)
+        self._write_run(self._tail, run)
+        self._size = self._size + len(run)
+        self._tail = (self._head + self._size) % self._capacity
+
     def remove(self, item):
         self.pop(self.index(item))
 
@@ -1153,19 +1306,22 @@ class ArrayList(List):
         if index < 0:
             index = self._size + index
 
-        sentinel = (self._head + index) % self._capacity
+        # Shift the shorter side of the list by one position.
+        capacity = self._capacity
+        sentinel = (self._head + index) % capacity
         item = self._array[sentinel]
-        if sentinel < self._size / 2:
-            while sentinel != self._head:
-                self._array[sentinel] = self._array[(sentinel - 1) % self._capacity]
-                sentinel = (sentinel - 1) % self._capacity
-            self._head = (self._head + 1) % self._capacity
+        if index < self._size // 2:
+            self._shift(self._head, index, 1)
+            freed = self._head
+            self._head = (self._head + 1) % capacity
         else:
-            self._tail = (self._tail - 1) % self._capacity
-            while sentinel != self._tail:
-                self._array[sentinel] = self._array[(sentinel + 1) % self._capacity]
-                sentinel = (sentinel + 1) % self._capacity
+            self._shift((sentinel + 1) % capacity, self._size - index - 1, -1)
+            self._tail = (self._tail - 1) % capacity
+            freed = self._tail
 
+        if not self._is_typed():
+            # Release the reference held by the freed slot.
+            self._array[freed] = None
         self._size = self._size - 1
         return item
 
@@ -1201,4 +1357,773 @@ class ArrayList(List):
             index = self._size + index
 
         sentinel = (self._head + index) % self._capacity
-        self._array[sentinel] = item
\ No newline at end of file
+        self._array[sentinel] = item
+
+    def clear(self):
+        self._capacity = self._min_capacity
+        self._array = self._new_array(self._capacity)
+        self._head = 0
+        self._tail = 0
+        self._size = 0
+
+    def copy(self):
+        copy_list = self.__class__(self._min_capacity, self._typecode,
+                                   self._dtype)
+        copy_list._capacity = self._capacity
+        if self._dtype is not None:
+            # NumPy slices are views: copy the array itself.
+            copy_list._array = self._array.copy()
+        else:
+            copy_list._array = self._array[:]
+        copy_list._head = self._head
+        copy_list._tail = self._tail
+        copy_list._size = self._size
+        return copy_list
+
+    def memoryview(self):
+        """Get the items of a typed list as a memoryview, without copy.
+
+        If the items wrap around the end of the circular array, they are
+        first moved to its start, so that they are contiguous. Writes to
+        the items are seen through the view and the other way round. The
+        list can still be modified while the view is alive, but insertions
+        and removals move the items within the array, or to a new one when
+        it grows or is cleared: the view then no longer matches the list,
+        and a new one must be taken.
+
+        Args:
+            Nothing.
+
+        Returns:
+            memoryview: A view of the items, in order.
+
+        Raises:
+            ValueError: An error occurs if the list has no typecode and no
+                        dtype.
+        """
+        if (self._typecode is None) and (self._dtype is None):
+            raise ValueError('The list has no typecode or dtype.')
+        if self._head > self._tail:
+            self._relocate(self._capacity)
+        return memoryview(self._array)[self._head:self._tail]
+
+    def __buffer__(self, flags):
+        return self.memoryview()
+
+
+class Deque(List):
+    """Double-ended queue data structure.
+
+    The items are stored in a circular python list whose capacity is a
+    power of two, so positions wrap around with a bit mask instead of a
+    modulo. Adding or removing an item at either end and reading or
+    writing any index take O(1) time, and an item only costs one slot of
+    the array instead of a linked list node. The array doubles when it is
+    full and halves when it is less than a quarter full. Batches of items
+    are added and removed at either end with slice copies.
+
+    Args:
+        capacity (Optional[int]): Initial capacity of the array, rounded up
+                                  to a power of two. Defaults to 8.
+
+    Attributes (public):
+        Nothing.
+    """
+    def __init__(self, capacity=8):
+        List.__init__(self)
+        min_capacity = 1
+        while min_capacity < capacity:
+            min_capacity = 2*min_capacity
+        self._min_capacity = min_capacity
+        self._array = [None] * min_capacity
+        self._mask = min_capacity - 1
+        self._head = 0
+
+    def _ordered_items(self):
+        """Return the items in a python list, from first to last.
+        """
+        array = self._array
+        head = self._head
+        end = head + self._size
+        if end <= len(array):
+            return array[head:end]
+        return array[head:] + array[:end - len(array)]
+
+    def _resize(self, capacity):
+        """Move the items at the start of an array of a new capacity.
+        """
+        self._array = self._ordered_items() + [None] * (capacity - self._size)
+        self._mask = capacity - 1
+        self._head = 0
+
+    def _take(self, start, n_items):
+        """Remove the n_items items from index start and return them in a
+           python list. The caller updates the head and the size.
+        """
+        array = self._array
+        capacity = len(array)
+        begin = (self._head + start) & self._mask
+        end = begin + n_items
+        if end <= capacity:
+            items = array[begin:end]
+            array[begin:end] = [None] * n_items
+        else:
+            items = array[begin:] + array[:end - capacity]
+            array[begin:] = [None] * (capacity - begin)
+            array[:end - capacity] = [None] * (end - capacity)
+        return items
+
+    def _reduce_capacity_if_needed(self):
+        """Halve the array when it is less than a quarter full.
+        """
+        capacity = len(self._array)
+        if (capacity > self._min_capacity) and (4*self._size < capacity):
+            self._resize(capacity // 2)
+
+    def capacity(self):
+        """Get the capacity of the internal array.
+
+        Args:
+            Nothing.
+
+        Returns:
+            int: The number of items the deque can hold without resizing.
+
+        Raises:
+            Nothing.
+        """
+        return len(self._array)
+
+    def append(self, item):
+        if self._size == len(self._array):
+            self._resize(2*len(self._array))
+        self._array[(self._head + self._size) & self._mask] = item
+        self._size = self._size + 1
+
+    def appendleft(self, item):
+        """Insert an item at the beginning of the deque.
+
+        Args:
+            item (object): The item to add.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        if self._size == len(self._array):
+            self._resize(2*len(self._array))
+        self._head = (self._head - 1) & self._mask
+        self._array[self._head] = item
+        self._size = self._size + 1
+
+    def extend(self, items):
+        """Append several items at the end of the deque.
+
+        The array is resized at most once and the items are copied in at
+        most two slices.
+
+        Args:
+            items (iterable (object)): The items to add, in order.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        items = list(items)
+        n_items = len(items)
+        size = self._size + n_items
+        capacity = len(self._array)
+        if size > capacity:
+            while capacity < size:
+                capacity = 2*capacity
+            self._resize(capacity)
+        array = self._array
+        begin = (self._head + self._size) & self._mask
+        n_first = min(n_items, capacity - begin)
+        array[begin:begin + n_first] = items[:n_first]
+        array[:n_items - n_first] = items[n_first:]
+        self._size = size
+
+    def popleft(self):
+        """Remove the first item of the deque and return it.
+
+        Args:
+            Nothing.
+
+        Returns:
+            object: The first item.
+
+        Raises:
+            ValueError: An error occurs when the deque is empty.
+        """
+        if self._size == 0:
+            raise ValueError('Argument index out of range.')
+        array = self._array
+        head = self._head
+        item = array[head]
+        array[head] = None
+        self._head = (head + 1) & self._mask
+        self._size = self._size - 1
+        self._reduce_capacity_if_needed()
+        return item
+
+    def popleft_many(self, k):
+        """Remove the k first items of the deque and return them.
+
+        Args:
+            k (int): Number of items to remove.
+
+        Returns:
+            python list: The k first items, from first to last.
+
+        Raises:
+            ValueError: An error occurs if k < 0 or if k > deque size.
+        """
+        if (k < 0) or (k > self._size):
+            raise ValueError('Argument k out of range.')
+        items = self._take(0, k)
+        self._head = (self._head + k) & self._mask
+        self._size = self._size - k
+        self._reduce_capacity_if_needed()
+        return items
+
+    def pop_many(self, k):
+        """Remove the k last items of the deque and return them.
+
+        Args:
+            k (int): Number of items to remove.
+
+        Returns:
+            python list: The k last items, from last to first.
+
+        Raises:
+            ValueError: An error occurs if k < 0 or if k > deque size.
+        """
+        if (k < 0) or (k > self._size):
+            raise ValueError('Argument k out of range.')
+        items = self._take(self._size - k, k)
+        items.reverse()
+        self._size = self._size - k
+        self._reduce_capacity_if_needed()
+        return items
+
+    def insert(self, item, index):
+        if (index < -self._size) or (index > self._size):
+            raise ValueError('Argument index out of range.')
+
+        if index < 0:
+            index = self._size + index
+
+        if self._size == len(self._array):
+            self._resize(2*len(self._array))
+
+        # Shift the shorter side of the deque by one position.
+        array = self._array
+        mask = self._mask
+        if index < self._size // 2:
+            self._head = (self._head - 1) & mask
+            head = self._head
+            for i in range(index):
+                array[(head + i) & mask] = array[(head + i + 1) & mask]
+        else:
+            head = self._head
+            for i in range(self._size, index, -1):
+                array[(head + i) & mask] = array[(head + i - 1) & mask]
+        array[(head + index) & mask] = item
+        self._size = self._size + 1
+
+    def remove(self, item):
+        self.pop(self.index(item))
+
+    def pop(self, index=None):
+        if index is None:
+            index = self._size - 1
+
+        if (index < -self._size) or (index >= self._size):
+            raise ValueError('Argument index out of range.')
+
+        if index < 0:
+            index = self._size + index
+
+        # Shift the shorter side of the deque by one position.
+        array = self._array
+        mask = self._mask
+        head = self._head
+        item = array[(head + index) & mask]
+        if index < self._size // 2:
+            for i in range(index, 0, -1):
+                array[(head + i) & mask] = array[(head + i - 1) & mask]
+            array[head] = None
+            self._head = (head + 1) & mask
+        else:
+            for i in range(index, self._size - 1):
+                array[(head + i) & mask] = array[(head + i + 1) & mask]
+            array[(head + self._size - 1) & mask] = None
+        self._size = self._size - 1
+        self._reduce_capacity_if_needed()
+        return item
+
+    def read(self, index):
+        if (index < -self._size) or (index >= self._size):
+            raise ValueError('Argument index out of range.')
+
+        if index < 0:
+            index = self._size + index
+
+        return self._array[(self._head + index) & self._mask]
+
+    def index(self, item):
+        array = self._array
+        mask = self._mask
+        head = self._head
+        for index in range(self._size):
+            if array[(head + index) & mask] == item:
+                return index
+        raise ValueError('Item not found.')
+
+    def write(self, item, index):
+        if (index < -self._size) or (index >= self._size):
+            raise ValueError('Argument index out of range.')
+
+        if index < 0:
+            index = self._size + index
+
+        self._array[(self._head + index) & self._mask] = item
+
+    def clear(self):
+        self._array = [None] * self._min_capacity
+        self._mask = self._min_capacity - 1
+        self._head = 0
+        self._size = 0
+
+    def copy(self):
+        copy_list = self.__class__(self._min_capacity)
+        copy_list._array = self._ordered_items() + \
+            [None] * (len(self._array) - self._size)
+        copy_list._mask = self._mask
+        copy_list._size = self._size
+        return copy_list
+
+    def __iter__(self):
+        array = self._array
+        mask = self._mask
+        head = self._head
+        for index in range(self._size):
+            yield array[(head + index) & mask]
+
+    def __reversed__(self):
+        array = self._array
+        mask = self._mask
+        head = self._head
+        for index in range(self._size - 1, -1, -1):
+            yield array[(head + index) & mask]
+
+
+class SkipList(object):
+    """Skip list data structure.
+
+    Ordered map from keys to values made of linked lists stacked on top of
+    each other: every node is in the bottom list and a node of level l is
+    also in the l - 1 lists above it, so a search skips most of the nodes.
+    The levels are drawn at random, which gives O(log n) expected time for
+    search, insertion and deletion. Each link also stores its width, i.e.
+    the number of bottom-level nodes it skips, so the list can be indexed
+    by position in O(log n) expected time. Insertions and deletions only
+    touch the links around one node and never rebalance the structure.
+
+    Args:
+        seed (Optional[int]): Seed of the level generator. Lists created
+                              with the same seed and the same operations
+                              have the same structure.
+
+    Attributes (public):
+        Nothing.
+    """
+
+    _MAX_LEVEL = 32
+
+    class _Node(object):
+        """Node class for skip list.
+
+        Args:
+            key (object): Key contained in the node.
+            value (object): Value associated with the key.
+            level (int): Number of lists the node belongs to.
+
+        Attributes (public):
+            key (object): Key contained in the node.
+            value (object): Value associated with the key.
+            next_nodes (python list (_Node)): Pointer to the next node in
+                                              each list.
+            widths (python list (int)): Number of bottom-level steps to
+                                        the next node in each list.
+        """
+        __slots__ = ('key', 'value', 'next_nodes', 'widths')
+
+        def __init__(self, key, value, level):
+            self.key = key
+            self.value = value
+            self.next_nodes = [None] * level
+            self.widths = [1] * level
+
+    def __init__(self, seed=None):
+        self._random = _random.Random(seed)
+        self._head = self._Node(None, None, self._MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+
+    def _random_level(self):
+        """Draw the level of a new node: level l has probability 2^-l.
+        """
+        level = 1
+        random = self._random.random
+        while level < self._MAX_LEVEL and random() < 0.5:
+            level = level + 1
+        return level
+
+    def insert(self, key, value=None):
+        """Insert a key in the list.
+
+        If the key is already in the list, its value is replaced.
+
+        Args:
+            key (object): The key to insert.
+            value (Optional[object]): The value associated with the key.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        update = [None] * self._MAX_LEVEL
+        steps = [0] * self._MAX_LEVEL
+        node = self._head
+        for level in range(self._level - 1, -1, -1):
+            next_node = node.next_nodes[level]
+            while next_node is not None and next_node.key < key:
+                steps[level] = steps[level] + node.widths[level]
+                node = next_node
+                next_node = node.next_nodes[level]
+            update[level] = node
+
+        next_node = node.next_nodes[0]
+        if next_node is not None and not key < next_node.key:
+            next_node.value = value
+            return
+
+        new_level = self._random_level()
+        if new_level > self._level:
+            for level in range(self._level, new_level):
+                update[level] = self._head
+                self._head.widths[level] = self._size + 1
+            self._level = new_level
+
+        new_node = self._Node(key, value, new_level)
+        offset = 0
+        for level in range(new_level):
+            previous = update[level]
+            new_node.next_nodes[level] = previous.next_nodes[level]
+            previous.next_nodes[level] = new_node
+            new_node.widths[level] = previous.widths[level] - offset
+            previous.widths[level] = offset + 1
+            offset = offset + steps[level]
+        for level in range(new_level, self._level):
+            update[level].widths[level] = update[level].widths[level] + 1
+        self._size = self._size + 1
+
+    def delete(self, key):
+        """Remove a key from the list.
+
+        Args:
+            key (object): The key to remove.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            ValueError: An error occurs when key is not in the list.
+        """
+        update = [None] * self._level
+        node = self._head
+        for level in range(self._level - 1, -1, -1):
+            next_node = node.next_nodes[level]
+            while next_node is not None and next_node.key < key:
+                node = next_node
+                next_node = node.next_nodes[level]
+            update[level] = node
+
+        node = node.next_nodes[0]
+        if node is None or key < node.key:
+            raise ValueError('Key not found.')
+
+        for level in range(self._level):
+            previous = update[level]
+            if previous.next_nodes[level] is node:
+                previous.next_nodes[level] = node.next_nodes[level]
+                previous.widths[level] = (previous.widths[level] +
+                                          node.widths[level] - 1)
+            else:
+                previous.widths[level] = previous.widths[level] - 1
+        head = self._head
+        while self._level > 1 and head.next_nodes[self._level - 1] is None:
+            self._level = self._level - 1
+        self._size = self._size - 1
+
+    def _find_ge(self, key):
+        """Return the first node whose key is greater than or equal to key.
+        """
+        node = self._head
+        for level in range(self._level - 1, -1, -1):
+            next_node = node.next_nodes[level]
+            while next_node is not None and next_node.key < key:
+                node = next_node
+                next_node = node.next_nodes[level]
+        return node.next_nodes[0]
+
+    def search(self, key):
+        """Get the value associated with a key.
+
+        Args:
+            key (object): The queried key.
+
+        Returns:
+            object: The value associated with the key.
+
+        Raises:
+            ValueError: An error occurs when key is not in the list.
+        """
+        node = self._find_ge(key)
+        if node is None or key < node.key:
+            raise ValueError('Key not found.')
+        return node.value
+
+    def contains(self, key):
+        """Verify if a key is in the list.
+
+        Does not modify the list.
+
+        Args:
+            key (object): The queried key.
+
+        Returns:
+            bool: True if key is in the list, False otherwise.
+
+        Raises:
+            Nothing
+        """
+        node = self._find_ge(key)
+        return node is not None and not key < node.key
+
+    def read(self, index):
+        """Read the key at a certain index in sorted order.
+
+        Does not modify the list.
+
+        Args:
+            index (int): The index in the list.
+
+        Returns:
+            object: The key at position index.
+
+        Raises:
+            ValueError: An error occurs if index is out of range, i.e.
+                        if index < -1 * list size or if index >= list size.
+        """
+        if (index < -self._size) or (index >= self._size):
+            raise ValueError('Argument index out of range.')
+
+        if index < 0:
+            index = self._size + index
+
+        remaining = index + 1
+        node = self._head
+        for level in range(self._level - 1, -1, -1):
+            while ( node.next_nodes[level] is not None and
+                    node.widths[level] <= remaining ):
+                remaining = remaining - node.widths[level]
+                node = node.next_nodes[level]
+        return node.key
+
+    def index(self, key):
+        """Return the index of a key in sorted order.
+
+        Does not modify the list.
+
+        Args:
+            key (object): The queried key.
+
+        Returns:
+            int: The index in the list.
+
+        Raises:
+            ValueError: An error occurs if key is not in the list.
+        """
+        position = 0
+        node = self._head
+        for level in range(self._level - 1, -1, -1):
+            next_node = node.next_nodes[level]
+            while next_node is not None and next_node.key < key:
+                position = position + node.widths[level]
+                node = next_node
+                next_node = node.next_nodes[level]
+
+        node = node.next_nodes[0]
+        if node is None or key < node.key:
+            raise ValueError('Key not found.')
+        return position
+
+    def items(self, lo=None, hi=None):
+        """Iterate over the (key, value) pairs in sorted order.
+
+        The pairs are generated lazily along the bottom list.
+
+        Args:
+            lo (Optional[object]): Smallest key of the range (inclusive).
+            hi (Optional[object]): Largest key of the range (inclusive).
+
+        Returns:
+            generator: The (key, value) pairs such that lo <= key <= hi.
+
+        Raises:
+            Nothing.
+        """
+        if lo is None:
+            node = self._head.next_nodes[0]
+        else:
+            node = self._find_ge(lo)
+        while node is not None and (hi is None or not hi < node.key):
+            yield node.key, node.value
+            node = node.next_nodes[0]
+
+    def clear(self):
+        """Remove all items from the list.
+
+        Args:
+            Nothing.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        self._head = self._Node(None, None, self._MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+
+    def size(self):
+        """Get the size of the list.
+
+        Does not modify the list.
+
+        Args:
+            Nothing.
+
+        Returns:
+            int: The size of the list.
+
+        Raises:
+            Nothing.
+        """
+        return self._size
+
+    def is_empty(self):
+        """Verify if the list is empty.
+
+        Does not modify the list
+
+        Args:
+            Nothing.
+
+        Returns:
+            bool: True if the list is empty, False otherwise.
+
+        Raises:
+            Nothing.
+        """
+        return self._size == 0
+
+    def copy(self):
+        """Copy of the list.
+
+        The copy continues the level generator of the list, so it is as
+        reproducible as the list itself.
+
+        Args:
+            Nothing.
+
+        Returns:
+            SkipList: A copy of the list.
+
+        Raises:
+            Nothing.
+        """
+        copy_list = self.__class__()
+        copy_list._random.setstate(self._random.getstate())
+        for key,value in self.items():
+            copy_list.insert(key, value)
+        return copy_list
+
+    def _is_valid(self):
+        nodes = []
+        node = self._head.next_nodes[0]
+        while node is not None:
+            nodes.append(node)
+            node = node.next_nodes[0]
+        if len(nodes) != self._size:
+            return False
+        for node1,node2 in zip(nodes, nodes[1:]):
+            if not node1.key < node2.key:
+                return False
+
+        positions = {id(node): i + 1 for i,node in enumerate(nodes)}
+        positions[id(self._head)] = 0
+        for level in range(self._level):
+            node = self._head
+            while node is not None:
+                next_node = node.next_nodes[level]
+                if next_node is None:
+                    break
+                if node.widths[level] != (positions[id(next_node)] -
+                                          positions[id(node)]):
+                    return False
+                node = next_node
+        return True
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for key,_ in self.items():
+            yield key
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def __getitem__(self, key):
+        return self.search(key)
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __delitem__(self, key):
+        self.delete(key)
+
+    def __eq__(self, other_list):
+        if len(self) != len(other_list):
+            return False
+
+        for item1,item2 in zip(self.items(), other_list.items()):
+            if item1 != item2:
+                return False
+
+        return True
+
+    def __repr__(self):
+        return '{' + ', '.join(str(key) + ': ' + str(value)
+                               for key,value in self.items()) + '}'
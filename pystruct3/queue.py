@@ -27,10 +27,34 @@ Queue data structures.
 
 This module contains class implementations of several Queue types.
 The available queues are:
-
+    FIFOQueue
+    LIFOQueue
+    PriorityQueue
+    BlockingQueue
+    AsyncQueue
+    AsyncPriorityQueue
+    SpillQueue
+    DelayQueue
+    MeteredQueue
+It also contains SharedRingBuffer, a queue of fixed-size records shared
+between two processes, and WorkStealingDeque, the task queue of the
+WorkStealingPool thread pool.
 """
 
-from pystruct3.list import DoubleLinkedList as _DoubleLinkedList
+import asyncio as _asyncio
+import math as _math
+import mmap as _mmap
+import multiprocessing.shared_memory as _shared_memory
+import operator as _operator
+import os as _os
+import pickle as _pickle
+import shutil as _shutil
+import tempfile as _tempfile
+import threading as _threading
+import time as _time
+
+from pystruct3.list import Deque as _Deque
+from pystruct3.tree import Heap as _Heap
 
 class Queue(object):
     """Queue data structure interface.
@@ -206,11 +230,13 @@ class Queue(object):
     def __repr__(self):
         raise NotImplementedError
 
-class LIFOQueue(Queue):
-    """Queue data structure.
+class FIFOQueue(Queue):
+    """First-in first-out queue data structure.
 
-    This data structure is based on a double linked list as internal container
-    for the items.
+    Items are dequeued in the order they were enqueued. This data structure
+    is based on a circular array deque as internal container for the items,
+    so both ends are read and updated in O(1) time, and batches of items
+    are moved with slice copies.
 
     Args:
         Nothing.
@@ -220,7 +246,7 @@ class LIFOQueue(Queue):
     """
     def __init__(self):
         Queue.__init__(self)
-        self._items = _DoubleLinkedList()
+        self._items = _Deque()
 
     def __del__(self):
         self.clear()
@@ -229,19 +255,60 @@ class LIFOQueue(Queue):
         self._size = self._size + 1
         self._items.append(item)
 
+    def enqueue_many(self, items):
+        """Add several items to the queue.
+
+        Args:
+            items (iterable (object)): Items to add to the queue, in order.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        self._items.extend(items)
+        self._size = self._items.size()
+
     def dequeue(self):
+        if self._size == 0:
+            raise ValueError('The queue is empty.')
         self._size = self._size - 1
-        return self._items.pop(0)
+        return self._items.popleft()
+
+    def dequeue_many(self, k):
+        """Remove the k first items of the queue.
+
+        Args:
+            k (int): Number of items to remove.
+
+        Returns:
+            python list: The k first items of the queue, in order.
+
+        Raises:
+            ValueError: An error occurs if k < 0 or if k > queue size.
+        """
+        items = self._items.popleft_many(k)
+        self._size = self._size - k
+        return items
 
     def first(self):
-        return self._items[0]
+        if self._size == 0:
+            raise ValueError('The queue is empty.')
+        return self._items.read(0)
 
     def last(self):
-        return self._items[-1]
+        if self._size == 0:
+            raise ValueError('The queue is empty.')
+        return self._items.read(-1)
 
     def contains(self, item):
         return (item in self._items)
 
+    def clear(self):
+        self._items.clear()
+        self._size = 0
+
     def copy(self):
         copy_queue = self.__class__()
         copy_queue._items = self._items.copy()
@@ -249,13 +316,2218 @@ class LIFOQueue(Queue):
         return copy_queue
 
     def __eq__(self, other_queue):
-        return self._items == other_queue._items
+        if self._size != other_queue.size():
+            return False
+        for item1, item2 in zip(self, other_queue):
+            if item1 != item2:
+                return False
+        return True
 
     def __iter__(self):
         return self._items.__iter__()
 
     def __repr__(self):
-        return self._items.__repr__()
+        return '[' + ', '.join(str(item) for item in self) + ']'
+
+class LIFOQueue(FIFOQueue):
+    """Last-in first-out queue data structure.
+
+    The most recently enqueued item is dequeued first. The queue shares the
+    circular array deque of FIFOQueue and only differs by the end items are
+    removed from: first and dequeue refer to the newest item, last to the
+    oldest one, and iteration goes from newest to oldest.
+
+    Args:
+        Nothing.
+
+    Attributes (public):
+        Nothing.
+    """
+    def dequeue(self):
+        if self._size == 0:
+            raise ValueError('The queue is empty.')
+        self._size = self._size - 1
+        return self._items.pop()
+
+    def dequeue_many(self, k):
+        """Remove the k first items of the queue, i.e. the k newest ones.
+
+        Args:
+            k (int): Number of items to remove.
+
+        Returns:
+            python list: The k first items of the queue, from newest to
+                         oldest.
+
+        Raises:
+            ValueError: An error occurs if k < 0 or if k > queue size.
+        """
+        items = self._items.pop_many(k)
+        self._size = self._size - k
+        return items
+
+    def first(self):
+        if self._size == 0:
+            raise ValueError('The queue is empty.')
+        return self._items.read(-1)
+
+    def last(self):
+        if self._size == 0:
+            raise ValueError('The queue is empty.')
+        return self._items.read(0)
+
+    def __iter__(self):
+        return reversed(self._items)
 
 class PriorityQueue(Queue):
-    pass
\ No newline at end of file
+    """Priority queue data structure.
+
+    This data structure is based on a heap as internal container for the
+    items. Items of equal priority are dequeued in the order they were
+    enqueued.
+
+    Args:
+        compare (Optional[function]): Function of two items that returns
+            True if the first item has a higher or equal priority than the
+            second one. Defaults to x1 >= x2, i.e. the largest item is
+            dequeued first.
+
+    Attributes (public):
+        Nothing.
+    """
+    def __init__(self, compare=None):
+        Queue.__init__(self)
+        self._compare = compare
+        self._counter = 0
+        if compare is None:
+            # Entries are (item, -counter) tuples, so the default heap
+            # comparison breaks ties in favor of the oldest entry.
+            self._heap = _Heap()
+        else:
+            self._heap = _Heap(
+                lambda e1,e2 : compare(e1[0], e2[0]) and (
+                    e1[1] >= e2[1] or not compare(e2[0], e1[0])))
+
+    def enqueue(self, item):
+        self._counter = self._counter + 1
+        self._heap.push((item, -self._counter))
+        self._size = self._size + 1
+
+    def enqueue_many(self, items):
+        """Add several items to the queue.
+
+        The heap is rebuilt in linear time when the batch is large compared
+        to the queue.
+
+        Args:
+            items (iterable (object)): Items to add to the queue.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        counter = self._counter
+        entries = []
+        for item in items:
+            counter = counter + 1
+            entries.append((item, -counter))
+        self._counter = counter
+        self._heap.push_many(entries)
+        self._size = self._size + len(entries)
+
+    def dequeue(self):
+        if self._size == 0:
+            raise ValueError('The queue is empty.')
+        self._size = self._size - 1
+        return self._heap.pop()[0]
+
+    def dequeue_many(self, k):
+        """Remove the k first items of the queue.
+
+        Args:
+            k (int): Number of items to remove.
+
+        Returns:
+            python list: The k first items of the queue, in order.
+
+        Raises:
+            ValueError: An error occurs if k < 0 or if k > queue size.
+        """
+        if (k < 0) or (k > self._size):
+            raise ValueError('Argument k out of range.')
+        pop = self._heap.pop
+        items = [pop()[0] for _ in range(k)]
+        self._size = self._size - k
+        return items
+
+    def first(self):
+        if self._size == 0:
+            raise ValueError('The queue is empty.')
+        return self._heap.peek()[0]
+
+    def last(self):
+        # The last entry to be dequeued is necessarily a leaf of the heap.
+        if self._size == 0:
+            raise ValueError('The queue is empty.')
+        vertices = self._heap._vertices
+        compare = self._heap._compare
+        last_entry = vertices[self._size]
+        for index in range(self._size // 2 + 1, self._size):
+            if compare(last_entry, vertices[index]):
+                last_entry = vertices[index]
+        return last_entry[0]
+
+    def contains(self, item):
+        vertices = self._heap._vertices
+        for index in range(1, self._size + 1):
+            if vertices[index][0] == item:
+                return True
+        return False
+
+    def clear(self):
+        self._heap.clear()
+        self._size = 0
+
+    def copy(self):
+        copy_queue = self.__class__(self._compare)
+        copy_queue._heap = self._heap.copy()
+        copy_queue._counter = self._counter
+        copy_queue._size = self._size
+        return copy_queue
+
+    def __eq__(self, other_queue):
+        if len(self) != len(other_queue):
+            return False
+
+        for item1,item2 in zip(self, other_queue):
+            if item1 != item2:
+                return False
+
+        return True
+
+    def __iter__(self):
+        for entry in self._heap:
+            yield entry[0]
+
+    def __repr__(self):
+        return '[' + ', '.join(str(item) for item in self) + ']'
+
+class BlockingQueue(Queue):
+    """Thread-safe FIFO queue with an optional capacity.
+
+    All operations hold a single lock. Producers waiting for room and
+    consumers waiting for items sleep on two condition variables sharing
+    that lock, and are woken up one at a time as items move through the
+    queue. enqueue blocks while the queue is full and dequeue never
+    blocks, as in the Queue interface; put and get expose the blocking
+    behavior and the timeouts.
+
+    Args:
+        capacity (Optional[int]): Maximum number of items in the queue.
+            Defaults to None, i.e. the queue is unbounded.
+
+    Attributes (public):
+        Nothing.
+
+    Raises:
+        ValueError: An error occurs if capacity < 1.
+    """
+    def __init__(self, capacity=None):
+        Queue.__init__(self)
+        self._items = _Deque()
+        self._lock = _threading.Lock()
+        self._not_empty = _threading.Condition(self._lock)
+        self._not_full = _threading.Condition(self._lock)
+        if (capacity is not None) and (capacity < 1):
+            raise ValueError('Argument capacity must be at least 1.')
+        self._capacity = capacity
+
+    def _wait(self, condition, predicate, block, timeout, message):
+        """Wait on condition until predicate is True, with the lock held.
+        """
+        if predicate():
+            return
+        if not block:
+            raise ValueError(message)
+        if (timeout is not None) and (timeout < 0):
+            raise ValueError('Argument timeout must be non-negative.')
+        if not condition.wait_for(predicate, timeout):
+            raise ValueError(message)
+
+    def put(self, item, block=True, timeout=None):
+        """Add an item to the queue, waiting for room if it is full.
+
+        Args:
+            item (object): Item to add to the queue.
+            block (Optional[bool]): Whether to wait when the queue is full.
+                                    Defaults to True.
+            timeout (Optional[float]): Maximum time to wait, in seconds.
+                                       Defaults to None, i.e. no limit.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            ValueError: An error occurs if the queue is still full when
+                        block is False or when the timeout expires.
+        """
+        with self._lock:
+            if self._capacity is not None:
+                self._wait(self._not_full,
+                           lambda : self._size < self._capacity,
+                           block, timeout, 'The queue is full.')
+            self._items.append(item)
+            self._size = self._size + 1
+            self._not_empty.notify()
+
+    def get(self, block=True, timeout=None):
+        """Remove the first item of the queue, waiting for one if it is
+           empty.
+
+        Args:
+            block (Optional[bool]): Whether to wait when the queue is empty.
+                                    Defaults to True.
+            timeout (Optional[float]): Maximum time to wait, in seconds.
+                                       Defaults to None, i.e. no limit.
+
+        Returns:
+            object: First item of the queue.
+
+        Raises:
+            ValueError: An error occurs if the queue is still empty when
+                        block is False or when the timeout expires.
+        """
+        with self._lock:
+            self._wait(self._not_empty, lambda : self._size > 0,
+                       block, timeout, 'The queue is empty.')
+            self._size = self._size - 1
+            item = self._items.popleft()
+            self._not_full.notify()
+            return item
+
+    def get_many(self, max_n, block=True, timeout=None):
+        """Remove up to max_n items from the queue at once.
+
+        The lock is acquired once for the whole batch. Only the first item
+        is waited for: the batch holds whatever is in the queue then.
+
+        Args:
+            max_n (int): Maximum number of items to remove.
+            block (Optional[bool]): Whether to wait when the queue is empty.
+                                    Defaults to True.
+            timeout (Optional[float]): Maximum time to wait, in seconds.
+                                       Defaults to None, i.e. no limit.
+
+        Returns:
+            python list: Between 1 and max_n first items of the queue, in
+                         order.
+
+        Raises:
+            ValueError: An error occurs if max_n < 1, or if the queue is
+                        still empty when block is False or when the timeout
+                        expires.
+        """
+        if max_n < 1:
+            raise ValueError('Argument max_n out of range.')
+        with self._lock:
+            self._wait(self._not_empty, lambda : self._size > 0,
+                       block, timeout, 'The queue is empty.')
+            n_items = min(max_n, self._size)
+            items = self._items.popleft_many(n_items)
+            self._size = self._size - n_items
+            self._not_full.notify(n_items)
+            return items
+
+    def enqueue(self, item):
+        self.put(item)
+
+    def dequeue(self):
+        return self.get(block=False)
+
+    def first(self):
+        with self._lock:
+            if self._size == 0:
+                raise ValueError('The queue is empty.')
+            return self._items.read(0)
+
+    def last(self):
+        with self._lock:
+            if self._size == 0:
+                raise ValueError('The queue is empty.')
+            return self._items.read(-1)
+
+    def contains(self, item):
+        with self._lock:
+            return item in self._items
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+            self._not_full.notify_all()
+
+    def copy(self):
+        copy_queue = self.__class__(self._capacity)
+        with self._lock:
+            copy_queue._items = self._items.copy()
+            copy_queue._size = self._size
+        return copy_queue
+
+    def __eq__(self, other_queue):
+        # Compare snapshots so that the two locks are never held together.
+        return list(self) == list(other_queue)
+
+    def __iter__(self):
+        with self._lock:
+            items = list(self._items)
+        return iter(items)
+
+    def __repr__(self):
+        return '[' + ', '.join(str(item) for item in self) + ']'
+
+class AsyncQueue(Queue):
+    """FIFO queue for coroutines of a single event loop.
+
+    get waits while the queue is empty and, if a capacity is given, put
+    waits while it is full, which applies backpressure to producers. A
+    waiting coroutine sleeps on a future that is resolved when an item or
+    a slot becomes available, so items move between coroutines without
+    any thread or lock. Cancelling a waiting coroutine never loses an
+    item: if it had already been woken up, the next waiter is woken up
+    in its place. The queue is not thread-safe.
+
+    The synchronous Queue interface is also available: enqueue and
+    dequeue never wait.
+
+    Args:
+        capacity (Optional[int]): Maximum number of items in the queue.
+            Defaults to None, i.e. the queue is unbounded.
+
+    Attributes (public):
+        Nothing.
+
+    Raises:
+        ValueError: An error occurs if capacity < 1.
+    """
+    def __init__(self, capacity=None):
+        Queue.__init__(self)
+        self._items = self._new_items()
+        self._getters = _Deque()
+        self._putters = _Deque()
+        if (capacity is not None) and (capacity < 1):
+            raise ValueError('Argument capacity must be at least 1.')
+        self._capacity = capacity
+
+    def _new_items(self):
+        """Create the internal queue holding the items.
+        """
+        return FIFOQueue()
+
+    def _is_full(self):
+        """Verify if the queue has reached its capacity.
+        """
+        return (self._capacity is not None) and (self._size >= self._capacity)
+
+    def _wake_next(self, waiters):
+        """Resolve the future of the first waiter that is still waiting.
+        """
+        while waiters.size() > 0:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    async def _wait(self, waiters, is_blocked):
+        """Sleep until is_blocked returns False.
+        """
+        while is_blocked():
+            waiter = _asyncio.get_running_loop().create_future()
+            waiters.append(waiter)
+            try:
+                await waiter
+            except _asyncio.CancelledError:
+                waiter.cancel()
+                # A waiter that was woken up before being cancelled hands
+                # its turn over to the next one.
+                if (not waiter.cancelled()) and (not is_blocked()):
+                    self._wake_next(waiters)
+                raise
+
+    async def put(self, item):
+        """Add an item to the queue, waiting for room if it is full.
+
+        Args:
+            item (object): Item to add to the queue.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        await self._wait(self._putters, self._is_full)
+        self.put_nowait(item)
+
+    def put_nowait(self, item):
+        """Add an item to the queue without waiting.
+
+        Args:
+            item (object): Item to add to the queue.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            ValueError: An error occurs when the queue is full.
+        """
+        if self._is_full():
+            raise ValueError('The queue is full.')
+        self._items.enqueue(item)
+        self._size = self._size + 1
+        self._wake_next(self._getters)
+
+    async def get(self):
+        """Remove the first item of the queue, waiting for one if it is
+           empty.
+
+        Args:
+            Nothing.
+
+        Returns:
+            object: First item of the queue.
+
+        Raises:
+            Nothing.
+        """
+        await self._wait(self._getters, self.is_empty)
+        return self.get_nowait()
+
+    def get_nowait(self):
+        """Remove the first item of the queue without waiting.
+
+        Args:
+            Nothing.
+
+        Returns:
+            object: First item of the queue.
+
+        Raises:
+            ValueError: An error occurs when the queue is empty.
+        """
+        if self._size == 0:
+            raise ValueError('The queue is empty.')
+        item = self._items.dequeue()
+        self._size = self._size - 1
+        self._wake_next(self._putters)
+        return item
+
+    async def get_many(self, max_n):
+        """Remove up to max_n items, waiting for one if the queue is empty.
+
+        Args:
+            max_n (int): Maximum number of items to remove.
+
+        Returns:
+            python list: Between 1 and max_n first items of the queue, in
+                         order.
+
+        Raises:
+            ValueError: An error occurs if max_n < 1.
+        """
+        if max_n < 1:
+            raise ValueError('Argument max_n out of range.')
+        await self._wait(self._getters, self.is_empty)
+        return self.get_many_nowait(max_n)
+
+    def get_many_nowait(self, max_n):
+        """Remove up to max_n items without waiting.
+
+        Args:
+            max_n (int): Maximum number of items to remove.
+
+        Returns:
+            python list: Between 1 and max_n first items of the queue, in
+                         order.
+
+        Raises:
+            ValueError: An error occurs if max_n < 1 or if the queue is
+                        empty.
+        """
+        if max_n < 1:
+            raise ValueError('Argument max_n out of range.')
+        if self._size == 0:
+            raise ValueError('The queue is empty.')
+        items = self._items.dequeue_many(min(max_n, self._size))
+        self._size = self._size - len(items)
+        for _ in items:
+            self._wake_next(self._putters)
+        return items
+
+    def enqueue(self, item):
+        self.put_nowait(item)
+
+    def dequeue(self):
+        return self.get_nowait()
+
+    def first(self):
+        if self._size == 0:
+            raise ValueError('The queue is empty.')
+        return self._items.first()
+
+    def last(self):
+        if self._size == 0:
+            raise ValueError('The queue is empty.')
+        return self._items.last()
+
+    def contains(self, item):
+        return self._items.contains(item)
+
+    def clear(self):
+        self._items.clear()
+        self._size = 0
+        while self._putters.size() > 0:
+            self._wake_next(self._putters)
+
+    def copy(self):
+        copy_queue = self.__class__(self._capacity)
+        copy_queue._items = self._items.copy()
+        copy_queue._size = self._size
+        return copy_queue
+
+    def __eq__(self, other_queue):
+        return self._items == other_queue._items
+
+    def __iter__(self):
+        return self._items.__iter__()
+
+    def __repr__(self):
+        return self._items.__repr__()
+
+class AsyncPriorityQueue(AsyncQueue):
+    """Priority queue for coroutines of a single event loop.
+
+    This is an AsyncQueue whose items are dequeued in priority order, as in
+    PriorityQueue.
+
+    Args:
+        capacity (Optional[int]): Maximum number of items in the queue.
+            Defaults to None, i.e. the queue is unbounded.
+        compare (Optional[function]): Function of two items that returns
+            True if the first item has a higher or equal priority than the
+            second one. Defaults to x1 >= x2, i.e. the largest item is
+            dequeued first.
+
+    Attributes (public):
+        Nothing.
+
+    Raises:
+        ValueError: An error occurs if capacity < 1.
+    """
+    def __init__(self, capacity=None, compare=None):
+        self._compare = compare
+        AsyncQueue.__init__(self, capacity)
+
+    def _new_items(self):
+        return PriorityQueue(self._compare)
+
+    def copy(self):
+        copy_queue = self.__class__(self._capacity, self._compare)
+        copy_queue._items = self._items.copy()
+        copy_queue._size = self._size
+        return copy_queue
+
+class SpillQueue(Queue):
+    """FIFO queue that spills to disk when it outgrows its memory budget.
+
+    The oldest items are kept in an in-memory deque of bounded capacity.
+    Once it is full, new items are gathered in batches and every full
+    batch is pickled to a segment file on local disk. When the deque runs
+    empty, the oldest segment is mapped in memory with mmap, loaded back
+    into the deque and deleted. At most capacity + batch_size items are
+    held in memory, and the disk is only touched once per batch, so the
+    queue runs close to in-memory speed while it does not spill.
+
+    The spill only bounds memory, it does not persist the queue: the
+    segment files belong to a single queue object in a single process,
+    and they are deleted by close, clear and when the queue is destroyed.
+    The queue is not thread-safe and cannot be shared between processes.
+    Items must be picklable.
+
+    Args:
+        capacity (Optional[int]): Maximum number of items in the in-memory
+                                  deque. Defaults to 65536.
+        batch_size (Optional[int]): Number of items per segment file, at
+                                    most capacity. Defaults to capacity.
+        directory (Optional[str]): Directory in which to create the spill
+                                   directory. Defaults to the system
+                                   temporary directory.
+
+    Attributes (public):
+        Nothing.
+
+    Raises:
+        ValueError: An error occurs if capacity < 1, or if batch_size < 1
+                    or batch_size > capacity.
+    """
+    def __init__(self, capacity=65536, batch_size=None, directory=None):
+        Queue.__init__(self)
+        self._items = _Deque()
+        self._batch = []
+        self._segments = _Deque()
+        self._path = None
+        if batch_size is None:
+            batch_size = capacity
+        if (capacity < 1) or (batch_size < 1) or (batch_size > capacity):
+            raise ValueError('Arguments capacity and batch_size out of '
+                             'range.')
+        self._capacity = capacity
+        self._batch_size = batch_size
+        self._directory = directory
+        self._n_segments = 0
+        self._last_item = None
+
+    def __del__(self):
+        self.close()
+
+    def _spill(self):
+        """Write the current batch to a new segment file.
+        """
+        if self._path is None:
+            self._path = _tempfile.mkdtemp(prefix='pystruct3-',
+                                           dir=self._directory)
+        path = _os.path.join(self._path,
+                             '{:020d}.seg'.format(self._n_segments))
+        with open(path, 'wb') as segment:
+            _pickle.dump(self._batch, segment, _pickle.HIGHEST_PROTOCOL)
+        self._n_segments = self._n_segments + 1
+        self._segments.append(path)
+        self._batch = []
+
+    def _load(self, path):
+        """Read the items of a segment file.
+        """
+        with open(path, 'rb') as segment:
+            with _mmap.mmap(segment.fileno(), 0,
+                            access=_mmap.ACCESS_READ) as mapping:
+                return _pickle.loads(mapping)
+
+    def _refill(self):
+        """Move the oldest spilled items in the empty in-memory deque.
+        """
+        if self._segments.size() > 0:
+            path = self._segments.popleft()
+            self._items.extend(self._load(path))
+            _os.remove(path)
+        else:
+            self._items.extend(self._batch)
+            self._batch = []
+
+    def spilled(self):
+        """Get the number of items that are not in the in-memory deque.
+
+        Args:
+            Nothing.
+
+        Returns:
+            int: The number of items in segment files or in the batch
+                 being gathered.
+
+        Raises:
+            Nothing.
+        """
+        return self._size - self._items.size()
+
+    def enqueue(self, item):
+        # Once an item was spilled, the next ones must be spilled too so
+        # that they are dequeued after it.
+        if (self._items.size() < self._capacity) and \
+           (self._size == self._items.size()):
+            self._items.append(item)
+        else:
+            self._batch.append(item)
+            if len(self._batch) == self._batch_size:
+                self._spill()
+        self._size = self._size + 1
+        self._last_item = item
+
+    def dequeue(self):
+        if self._size == 0:
+            raise ValueError('The queue is empty.')
+        if self._items.size() == 0:
+            self._refill()
+        item = self._items.popleft()
+        self._size = self._size - 1
+        # The batch being gathered can skip the disk if the deque has room
+        # for it and nothing else is spilled.
+        if (self._segments.size() == 0) and self._batch and \
+           (self._items.size() + len(self._batch) <= self._capacity):
+            self._items.extend(self._batch)
+            self._batch = []
+        if self._size == 0:
+            self._last_item = None
+        return item
+
+    def first(self):
+        if self._size == 0:
+            raise ValueError('The queue is empty.')
+        if self._items.size() == 0:
+            self._refill()
+        return self._items.read(0)
+
+    def last(self):
+        if self._size == 0:
+            raise ValueError('The queue is empty.')
+        return self._last_item
+
+    def contains(self, item):
+        for other_item in self:
+            if other_item == item:
+                return True
+        return False
+
+    def clear(self):
+        self._items.clear()
+        self._batch = []
+        while self._segments.size() > 0:
+            _os.remove(self._segments.popleft())
+        self._size = 0
+        self._last_item = None
+
+    def close(self):
+        """Remove all items from the queue and delete its spill directory.
+
+        Args:
+            Nothing.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        self.clear()
+        if self._path is not None:
+            _shutil.rmtree(self._path, ignore_errors=True)
+            self._path = None
+
+    def copy(self):
+        copy_queue = self.__class__(self._capacity, self._batch_size,
+                                    self._directory)
+        for item in self:
+            copy_queue.enqueue(item)
+        return copy_queue
+
+    def __eq__(self, other_queue):
+        if len(self) != len(other_queue):
+            return False
+
+        for item1,item2 in zip(self, other_queue):
+            if item1 != item2:
+                return False
+
+        return True
+
+    def __iter__(self):
+        for item in self._items:
+            yield item
+        for path in list(self._segments):
+            for item in self._load(path):
+                yield item
+        for item in self._batch:
+            yield item
+
+    def __repr__(self):
+        return '[' + ', '.join(str(item) for item in self) + ']'
+
+class _TimingWheel(object):
+    """Hierarchical timing wheel of (deadline, counter, item) entries.
+
+    Time is cut in ticks of a fixed resolution. Level l of the wheel has
+    256 slots that each cover 256**l ticks, so an entry is inserted in
+    O(1) time in the slot of the lowest level that reaches its tick. When
+    the current tick enters the range of a slot of level l > 0, the slot
+    is cascaded, i.e. its entries are inserted again in lower levels.
+    Entries are never due before their deadline, and at most one tick
+    after it.
+
+    Args:
+        resolution (float): Duration of a tick.
+        origin (float): Time of the start of tick 0.
+
+    Attributes (public):
+        Nothing.
+    """
+    _BITS = 8
+    _MASK = 255
+    _LEVELS = 4
+
+    def __init__(self, resolution, origin):
+        self._resolution = resolution
+        self._origin = origin
+        # Next tick to process: the entries of earlier ticks are ready.
+        self._tick = 0
+        self._slots = [[[] for _ in range(self._MASK + 1)]
+                       for _ in range(self._LEVELS)]
+        self._n_slotted = 0
+        self._ready = _Deque()
+
+    def _insert(self, entry):
+        """Put an entry in the slot of its tick.
+        """
+        tick = _math.ceil((entry[0] - self._origin) / self._resolution)
+        delta = tick - self._tick
+        if delta < 0:
+            # Already due: keep the ready deque in (deadline, counter)
+            # order. The entry is usually the latest, so search backwards.
+            ready = self._ready
+            key = (entry[0], entry[1])
+            index = ready.size()
+            while index > 0:
+                other_entry = ready.read(index - 1)
+                if (other_entry[0], other_entry[1]) <= key:
+                    break
+                index = index - 1
+            ready.insert(entry, index)
+            return
+        level = (delta.bit_length() - 1) // self._BITS if delta > 0 else 0
+        if level >= self._LEVELS:
+            # Beyond the wheel: park the entry in the farthest slot, it is
+            # inserted again when that slot is cascaded.
+            level = self._LEVELS - 1
+            tick = self._tick + (1 << (self._BITS*self._LEVELS)) - 1
+        slot = (tick >> (self._BITS*level)) & self._MASK
+        self._slots[level][slot].append(entry)
+        self._n_slotted = self._n_slotted + 1
+
+    push = _insert
+
+    def _next_tick(self):
+        """Return the next tick at which entries get due or are cascaded,
+           skipping the empty slots.
+        """
+        next_tick = None
+        for level in range(self._LEVELS):
+            shift = self._BITS*level
+            slots = self._slots[level]
+            # Slots of level l are only visited at multiples of 256**l.
+            start = -((-self._tick) >> shift)
+            for index in range(start, start + self._MASK + 1):
+                if (next_tick is not None) and ((index << shift) >= next_tick):
+                    break
+                if slots[index & self._MASK]:
+                    next_tick = index << shift
+                    break
+        return next_tick
+
+    def advance(self, now):
+        """Move the entries whose deadline is passed to the ready deque.
+        """
+        last_tick = _math.floor((now - self._origin) / self._resolution)
+        slots = self._slots
+        while self._n_slotted > 0:
+            tick = self._next_tick()
+            if tick > last_tick:
+                break
+            for level in range(self._LEVELS - 1, 0, -1):
+                if tick & ((1 << (self._BITS*level)) - 1) == 0:
+                    slot = (tick >> (self._BITS*level)) & self._MASK
+                    entries = slots[level][slot]
+                    if entries:
+                        slots[level][slot] = []
+                        self._n_slotted = self._n_slotted - len(entries)
+                        self._tick = tick
+                        for entry in entries:
+                            self._insert(entry)
+            entries = slots[0][tick & self._MASK]
+            if entries:
+                slots[0][tick & self._MASK] = []
+                self._n_slotted = self._n_slotted - len(entries)
+                entries.sort(key=_operator.itemgetter(0, 1))
+                self._ready.extend(entries)
+            self._tick = tick + 1
+        if self._tick <= last_tick:
+            self._tick = last_tick + 1
+
+    def pop_due(self, now):
+        """Remove and return the next entry whose deadline is passed.
+        """
+        if self._ready.size() == 0:
+            self.advance(now)
+            if self._ready.size() == 0:
+                raise ValueError('No item is due.')
+        return self._ready.popleft()
+
+    def next_deadline(self):
+        """Return a time before which no entry gets due, or None if the
+           wheel is empty.
+        """
+        if self._ready.size() > 0:
+            return -_math.inf
+        if self._n_slotted == 0:
+            return None
+        tick = self._next_tick()
+        return self._origin + tick*self._resolution
+
+    def size(self):
+        """Return the number of entries.
+        """
+        return self._ready.size() + self._n_slotted
+
+    def entries(self):
+        """Iterate over the entries, in no particular order.
+        """
+        for entry in self._ready:
+            yield entry
+        for level in self._slots:
+            for slot in level:
+                for entry in slot:
+                    yield entry
+
+class DelayQueue(Queue):
+    """Thread-safe queue of items that are delivered after a delay.
+
+    Every item is put with a delay, which gives it a deadline on a
+    monotonic clock, and can only be got once its deadline is passed.
+    Items with the same deadline are delivered in the order they were put.
+    get sleeps on a condition variable until the earliest deadline, and is
+    woken up early when an item is put.
+
+    By default the items are kept in a Heap ordered by deadline, so put
+    and get take O(log n) time. With a resolution, the items are kept in a
+    hierarchical timing wheel instead, which makes put O(1) for millions
+    of timers, at the cost of delivering items up to one tick of the
+    resolution after their deadline.
+
+    enqueue puts an item with no delay, and dequeue gets an item without
+    waiting: it raises ValueError when no item is due yet.
+
+    Args:
+        resolution (Optional[float]): Duration in seconds of a tick of the
+            timing wheel. Defaults to None, i.e. a heap is used.
+        clock (Optional[function]): Function returning the current time in
+            seconds. Defaults to time.monotonic.
+
+    Attributes (public):
+        Nothing.
+
+    Raises:
+        ValueError: An error occurs if resolution <= 0.
+    """
+    def __init__(self, resolution=None, clock=None):
+        Queue.__init__(self)
+        self._lock = _threading.Lock()
+        self._changed = _threading.Condition(self._lock)
+        self._clock = _time.monotonic if clock is None else clock
+        self._resolution = resolution
+        self._counter = 0
+        self._n_waiting = 0
+        self._heap = _Heap(_operator.le)
+        self._wheel = None
+        if resolution is not None:
+            if resolution <= 0:
+                raise ValueError('Argument resolution must be positive.')
+            self._wheel = _TimingWheel(resolution, self._clock())
+
+    def _push(self, deadline, item):
+        """Add an item with a deadline, with the lock held.
+        """
+        self._counter = self._counter + 1
+        entry = (deadline, self._counter, item)
+        if self._wheel is None:
+            self._heap.push(entry)
+        else:
+            self._wheel.push(entry)
+        self._size = self._size + 1
+
+    def _pop_due(self, now):
+        """Remove the next entry whose deadline is passed, with the lock
+           held.
+        """
+        if self._wheel is None:
+            if (self._size == 0) or (self._heap.peek()[0] > now):
+                raise ValueError('No item is due.')
+            entry = self._heap.pop()
+        else:
+            entry = self._wheel.pop_due(now)
+        self._size = self._size - 1
+        return entry
+
+    def _next_deadline(self):
+        """Return a time before which no item gets due, or None if the
+           queue is empty, with the lock held.
+        """
+        if self._wheel is None:
+            return self._heap.peek()[0] if self._size > 0 else None
+        return self._wheel.next_deadline()
+
+    def _wait_due(self, block, timeout):
+        """Remove the next due entry, waiting for it if needed, with the
+           lock held.
+        """
+        if (timeout is not None) and (timeout < 0):
+            raise ValueError('Argument timeout must be non-negative.')
+        clock = self._clock
+        end = None if timeout is None else clock() + timeout
+        while True:
+            now = clock()
+            try:
+                return self._pop_due(now)
+            except ValueError:
+                if not block or ((end is not None) and (now >= end)):
+                    raise
+            wake = self._next_deadline()
+            if end is not None:
+                wake = end if wake is None else min(wake, end)
+            self._n_waiting = self._n_waiting + 1
+            try:
+                self._changed.wait(
+                    None if wake is None else max(wake - now, 0))
+            finally:
+                self._n_waiting = self._n_waiting - 1
+
+    def _entries(self):
+        """Return the entries sorted by deadline, with the lock held.
+        """
+        if self._wheel is None:
+            entries = self._heap._vertices[1:self._size + 1]
+        else:
+            entries = list(self._wheel.entries())
+        entries.sort(key=_operator.itemgetter(0, 1))
+        return entries
+
+    def put(self, item, delay=0):
+        """Add an item that is due after a delay.
+
+        Args:
+            item (object): Item to add to the queue.
+            delay (Optional[float]): Delay in seconds. Defaults to 0.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        deadline = self._clock() + delay
+        with self._lock:
+            self._push(deadline, item)
+            if self._n_waiting > 0:
+                self._changed.notify()
+
+    def get(self, block=True, timeout=None):
+        """Remove the item with the earliest deadline, once it is due.
+
+        Args:
+            block (Optional[bool]): Whether to wait until an item is due.
+                                    Defaults to True.
+            timeout (Optional[float]): Maximum time to wait, in seconds.
+                                       Defaults to None, i.e. no limit.
+
+        Returns:
+            object: The item.
+
+        Raises:
+            ValueError: An error occurs if no item is due when block is
+                        False or when the timeout expires.
+        """
+        with self._lock:
+            return self._wait_due(block, timeout)[2]
+
+    def get_many(self, max_n, block=True, timeout=None):
+        """Remove up to max_n due items at once.
+
+        Only the first item is waited for: the batch holds the items that
+        are due then.
+
+        Args:
+            max_n (int): Maximum number of items to remove.
+            block (Optional[bool]): Whether to wait until an item is due.
+                                    Defaults to True.
+            timeout (Optional[float]): Maximum time to wait, in seconds.
+                                       Defaults to None, i.e. no limit.
+
+        Returns:
+            python list: Between 1 and max_n items, by deadline.
+
+        Raises:
+            ValueError: An error occurs if max_n < 1, or if no item is due
+                        when block is False or when the timeout expires.
+        """
+        if max_n < 1:
+            raise ValueError('Argument max_n out of range.')
+        with self._lock:
+            items = [self._wait_due(block, timeout)[2]]
+            now = self._clock()
+            while len(items) < max_n:
+                try:
+                    items.append(self._pop_due(now)[2])
+                except ValueError:
+                    break
+            return items
+
+    def enqueue(self, item):
+        self.put(item)
+
+    def dequeue(self):
+        return self.get(block=False)
+
+    def first(self):
+        with self._lock:
+            if self._size == 0:
+                raise ValueError('The queue is empty.')
+            if self._wheel is None:
+                return self._heap.peek()[2]
+            return self._entries()[0][2]
+
+    def last(self):
+        with self._lock:
+            if self._size == 0:
+                raise ValueError('The queue is empty.')
+            return self._entries()[-1][2]
+
+    def contains(self, item):
+        return item in list(self)
+
+    def clear(self):
+        with self._lock:
+            self._heap.clear()
+            if self._wheel is not None:
+                self._wheel = _TimingWheel(self._resolution, self._clock())
+            self._size = 0
+
+    def copy(self):
+        copy_queue = self.__class__(self._resolution, self._clock)
+        with self._lock:
+            entries = self._entries()
+        for deadline, _, item in entries:
+            copy_queue._push(deadline, item)
+        return copy_queue
+
+    def __eq__(self, other_queue):
+        # Compare snapshots so that the two locks are never held together.
+        return list(self) == list(other_queue)
+
+    def __iter__(self):
+        with self._lock:
+            entries = self._entries()
+        return iter([entry[2] for entry in entries])
+
+    def __repr__(self):
+        return '[' + ', '.join(str(item) for item in self) + ']'
+
+class _Histogram(object):
+    """Histogram of non-negative integers with bounded relative error.
+
+    As in HDR histograms, values below 2**bits have their own bucket and
+    larger values share log-linear buckets: each power of two is cut in
+    2**(bits - 1) buckets, so the relative error of a bucket is below
+    2**(1 - bits) whatever the magnitude of the values.
+
+    Args:
+        bits (Optional[int]): Number of significant bits kept. Defaults to
+                              7, i.e. an error below 1.6%.
+
+    Attributes (public):
+        Nothing.
+    """
+    def __init__(self, bits=7):
+        self._bits = bits
+        self._half = 1 << (bits - 1)
+        # Enough buckets for all the values below 2**64.
+        self._counts = [0] * self._index((1 << 64) - 1)
+        self._count = 0
+        self._total = 0
+        self._min = _math.inf
+        self._max = -1
+
+    def _index(self, value):
+        """Return the bucket of a value.
+        """
+        shift = value.bit_length() - self._bits
+        if shift <= 0:
+            return value
+        return (1 << self._bits) + (shift - 1)*self._half + \
+            (value >> shift) - self._half
+
+    def _highest(self, index):
+        """Return the largest value of a bucket.
+        """
+        if index < (1 << self._bits):
+            return index
+        shift, top = divmod(index - (1 << self._bits), self._half)
+        shift = shift + 1
+        top = top + self._half
+        return ((top + 1) << shift) - 1
+
+    def record(self, value):
+        """Add a value to the histogram.
+        """
+        index = self._index(value)
+        counts = self._counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] = counts[index] + 1
+        self._count = self._count + 1
+        self._total = self._total + value
+        if value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+
+    def percentile(self, percent):
+        """Return a value that percent % of the values do not exceed, up
+           to the error of the buckets.
+        """
+        if self._count == 0:
+            return None
+        rank = max(1, _math.ceil(percent*self._count/100))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen = seen + count
+            if seen >= rank:
+                return min(self._highest(index), self._max)
+
+    def snapshot(self, scale=1):
+        """Return the count, min, max, mean and percentiles in a dict, with
+           the values multiplied by scale.
+        """
+        if self._count == 0:
+            return {'count': 0}
+        snapshot = {'count': self._count,
+                    'min': self._min*scale,
+                    'max': self._max*scale,
+                    'mean': self._total*scale/self._count}
+        for name, percent in (('p50', 50), ('p90', 90), ('p99', 99),
+                              ('p999', 99.9)):
+            snapshot[name] = self.percentile(percent)*scale
+        return snapshot
+
+class MeteredQueue(Queue):
+    """Queue that records metrics about another queue.
+
+    The metrics layer wraps a queue instead of living in the queue classes,
+    so queues that are not wrapped run the exact same code as before: when
+    metrics are disabled they cost nothing. The wrapper forwards the Queue
+    interface, as well as enqueue_many, dequeue_many and the put, get and
+    get_many methods of the queues that have them, and records:
+        - the current depth and its high-water mark,
+        - the number of items enqueued and dequeued, and their rates,
+        - the residence time of the items, from a timestamp taken just
+          before they are handed to the wrapped queue, in a histogram with
+          log-linear buckets. A put that waits for room counts its wait.
+    The metrics are exported as plain dicts by snapshot. They are updated
+    under a lock of their own, so the wrapper can be shared by threads
+    when the wrapped queue is thread-safe. An AsyncQueue cannot be wrapped:
+    its put and get are coroutines.
+
+    Args:
+        queue (Queue): The queue to wrap.
+        clock (Optional[function]): Function returning the current time in
+            integer nanoseconds. Defaults to time.monotonic_ns.
+
+    Attributes (public):
+        Nothing.
+
+    Raises:
+        ValueError: An error occurs if queue is an AsyncQueue.
+    """
+    def __init__(self, queue, clock=None):
+        if isinstance(queue, AsyncQueue):
+            raise ValueError('Argument queue cannot be an AsyncQueue.')
+        Queue.__init__(self)
+        self._queue = queue
+        self._clock = _time.monotonic_ns if clock is None else clock
+        self._lock = _threading.Lock()
+        self._enqueued_at = {}
+        self._histogram = _Histogram()
+        self._n_enqueued = 0
+        self._n_dequeued = 0
+        self._high_water_mark = queue.size()
+        self._last_snapshot = (self._clock(), 0, 0)
+
+    def __del__(self):
+        # The wrapped queue may outlive the wrapper: leave it untouched.
+        pass
+
+    def _stamp(self, items):
+        """Timestamp items that are about to be enqueued.
+
+        The timestamps are stored before the items become visible in the
+        wrapped queue, so that a consumer never dequeues an item before
+        its timestamp.
+        """
+        now = self._clock()
+        enqueued_at = self._enqueued_at
+        with self._lock:
+            for item in items:
+                # The same object can be in the queue several times: it then
+                # has a deque of timestamps, oldest first.
+                timestamp = enqueued_at.get(id(item))
+                if timestamp is None:
+                    enqueued_at[id(item)] = now
+                elif type(timestamp) is _Deque:
+                    timestamp.append(now)
+                else:
+                    timestamps = _Deque()
+                    timestamps.append(timestamp)
+                    timestamps.append(now)
+                    enqueued_at[id(item)] = timestamps
+
+    def _unstamp(self, items):
+        """Drop the timestamps of items that could not be enqueued.
+        """
+        enqueued_at = self._enqueued_at
+        with self._lock:
+            for item in items:
+                # The newest timestamp is the one of this attempt.
+                timestamp = enqueued_at.pop(id(item), None)
+                if type(timestamp) is _Deque:
+                    timestamp.pop()
+                    if timestamp.size() > 0:
+                        enqueued_at[id(item)] = timestamp
+
+    def _enqueue(self, method, items, *args, **kwargs):
+        """Timestamp items, then add them with a method of the wrapped
+           queue called with args and kwargs.
+        """
+        self._stamp(items)
+        try:
+            method(*args, **kwargs)
+        except BaseException:
+            self._unstamp(items)
+            raise
+        with self._lock:
+            self._n_enqueued = self._n_enqueued + len(items)
+            size = self._queue.size()
+            if size > self._high_water_mark:
+                self._high_water_mark = size
+
+    def _record_dequeue(self, items):
+        """Record the residence time of items that were just dequeued.
+        """
+        now = self._clock()
+        enqueued_at = self._enqueued_at
+        record = self._histogram.record
+        with self._lock:
+            for item in items:
+                # Items enqueued before the wrapper have no timestamp.
+                timestamp = enqueued_at.pop(id(item), None)
+                if timestamp is None:
+                    continue
+                if type(timestamp) is _Deque:
+                    timestamps = timestamp
+                    timestamp = timestamps.popleft()
+                    if timestamps.size() > 0:
+                        enqueued_at[id(item)] = timestamps
+                record(now - timestamp)
+            self._n_dequeued = self._n_dequeued + len(items)
+
+    def snapshot(self):
+        """Export the metrics.
+
+        The rates are computed over the time elapsed since the previous
+        snapshot, or since the creation of the wrapper.
+
+        Args:
+            Nothing.
+
+        Returns:
+            dict: The keys are 'depth', 'high_water_mark', 'enqueued',
+                  'dequeued', 'enqueue_rate' and 'dequeue_rate', in items
+                  per second, and 'residence', a dict of the 'count' of
+                  timed items and of the 'min', 'max', 'mean', 'p50',
+                  'p90', 'p99' and 'p999' residence times in seconds.
+
+        Raises:
+            Nothing.
+        """
+        now = self._clock()
+        with self._lock:
+            last_time, last_enqueued, last_dequeued = self._last_snapshot
+            elapsed = (now - last_time) / 1e9
+            snapshot = {
+                'depth': self._queue.size(),
+                'high_water_mark': self._high_water_mark,
+                'enqueued': self._n_enqueued,
+                'dequeued': self._n_dequeued,
+                'enqueue_rate': ((self._n_enqueued - last_enqueued)/elapsed
+                                 if elapsed > 0 else 0.0),
+                'dequeue_rate': ((self._n_dequeued - last_dequeued)/elapsed
+                                 if elapsed > 0 else 0.0),
+                'residence': self._histogram.snapshot(1e-9)}
+            self._last_snapshot = (now, self._n_enqueued, self._n_dequeued)
+        return snapshot
+
+    def enqueue(self, item):
+        self._enqueue(self._queue.enqueue, (item,), item)
+
+    def enqueue_many(self, items):
+        """Add several items to the wrapped queue.
+
+        Args:
+            items (iterable (object)): Items to add to the queue.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        items = list(items)
+        self._enqueue(self._queue.enqueue_many, items, items)
+
+    def put(self, item, *args, **kwargs):
+        """Add an item with the put method of the wrapped queue.
+
+        Args:
+            item (object): Item to add to the queue.
+            *args, **kwargs: Other arguments of the put method.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            ValueError: The errors of the put method.
+        """
+        self._enqueue(self._queue.put, (item,), item, *args, **kwargs)
+
+    def dequeue(self):
+        item = self._queue.dequeue()
+        self._record_dequeue((item,))
+        return item
+
+    def dequeue_many(self, k):
+        """Remove the k first items of the wrapped queue.
+
+        Args:
+            k (int): Number of items to remove.
+
+        Returns:
+            python list: The k first items of the queue, in order.
+
+        Raises:
+            ValueError: An error occurs if k < 0 or if k > queue size.
+        """
+        items = self._queue.dequeue_many(k)
+        self._record_dequeue(items)
+        return items
+
+    def get(self, *args, **kwargs):
+        """Remove an item with the get method of the wrapped queue.
+
+        Args:
+            *args, **kwargs: Arguments of the get method.
+
+        Returns:
+            object: The item.
+
+        Raises:
+            ValueError: The errors of the get method.
+        """
+        item = self._queue.get(*args, **kwargs)
+        self._record_dequeue((item,))
+        return item
+
+    def get_many(self, max_n, *args, **kwargs):
+        """Remove up to max_n items with the get_many method of the wrapped
+        queue.
+
+        Args:
+            max_n (int): Maximum number of items to remove.
+            *args, **kwargs: Other arguments of the get_many method.
+
+        Returns:
+            python list: The items.
+
+        Raises:
+            ValueError: The errors of the get_many method.
+        """
+        items = self._queue.get_many(max_n, *args, **kwargs)
+        self._record_dequeue(items)
+        return items
+
+    def first(self):
+        return self._queue.first()
+
+    def last(self):
+        return self._queue.last()
+
+    def contains(self, item):
+        return self._queue.contains(item)
+
+    def clear(self):
+        self._queue.clear()
+        with self._lock:
+            self._enqueued_at.clear()
+
+    def copy(self):
+        return self.__class__(self._queue.copy(), self._clock)
+
+    def size(self):
+        return self._queue.size()
+
+    def is_empty(self):
+        return self._queue.is_empty()
+
+    def __len__(self):
+        return self._queue.size()
+
+    def __eq__(self, other_queue):
+        return list(self) == list(other_queue)
+
+    def __iter__(self):
+        return iter(self._queue)
+
+    def __repr__(self):
+        return repr(self._queue)
+
+class SharedRingBuffer(object):
+    """Single-producer single-consumer ring buffer in shared memory.
+
+    The buffer holds fixed-size records in a circular array of slots
+    stored in a multiprocessing.shared_memory block, so that one process
+    can push records that another process pops. The producer only writes
+    the tail counter and the consumer only writes the head counter, so no
+    lock is needed: a record is written before the tail moves past it and
+    read before the head moves past it. The counters are 64-bit integers
+    on separate cache lines and are never reset, the slot of counter c
+    being c modulo the capacity.
+
+    This relies on aligned 64-bit stores being atomic and seen in program
+    order by the other process, which holds on x86-64. Only one process
+    may push and only one process may pop. The buffer never blocks: push
+    and pop raise ValueError when it is full or empty, and push_many and
+    pop_many move as many records as they can. Those two copy whole slices
+    of the shared memoryview, which amortizes the per-call cost.
+
+    The buffer is pickled as its name, so it can be handed over to a
+    multiprocessing.Process, which then attaches to the same memory.
+
+    Args:
+        slot_size (int): Size of a record, in bytes.
+        capacity (Optional[int]): Number of slots, rounded up to a power of
+                                  two. Defaults to 1024.
+
+    Attributes (public):
+        name (str): Name of the shared memory block.
+
+    Raises:
+        ValueError: An error occurs if slot_size < 1 or capacity < 1.
+    """
+    # Offsets in 64-bit words of the header fields. The data follows the
+    # header.
+    _CAPACITY = 0
+    _SLOT_SIZE = 1
+    _HEAD = 8
+    _TAIL = 16
+    _HEADER_SIZE = 192
+
+    def __init__(self, slot_size, capacity=1024):
+        if (slot_size < 1) or (capacity < 1):
+            raise ValueError('Arguments slot_size and capacity must be at '
+                             'least 1.')
+        n_slots = 1
+        while n_slots < capacity:
+            n_slots = 2*n_slots
+        shm = _shared_memory.SharedMemory(
+            create=True, size=self._HEADER_SIZE + n_slots*slot_size)
+        # Forked children get a copy of the buffer but must not free it.
+        self._owner_pid = _os.getpid()
+        self._open(shm)
+        self._counters[self._CAPACITY] = n_slots
+        self._counters[self._SLOT_SIZE] = slot_size
+        self._counters[self._HEAD] = 0
+        self._counters[self._TAIL] = 0
+        self._read_header()
+
+    @classmethod
+    def attach(cls, name):
+        """Attach to a ring buffer created by another process.
+
+        Args:
+            name (str): The name of the buffer.
+
+        Returns:
+            SharedRingBuffer: A view of the same buffer.
+
+        Raises:
+            FileNotFoundError: An error occurs if no buffer has this name.
+        """
+        try:
+            # Only the creator unlinks the block.
+            shm = _shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Before python 3.13 the block is also tracked here, which is
+            # harmless in the child processes of the creator since they
+            # share its resource tracker.
+            shm = _shared_memory.SharedMemory(name=name)
+        ring = cls.__new__(cls)
+        ring._owner_pid = None
+        ring._open(shm)
+        ring._read_header()
+        return ring
+
+    def _open(self, shm):
+        """Create the views of the header and data of a memory block.
+        """
+        self._shm = shm
+        self.name = shm.name
+        self._counters = shm.buf[:self._HEADER_SIZE].cast('Q')
+        self._data = shm.buf[self._HEADER_SIZE:]
+
+    def _read_header(self):
+        """Cache the layout of the buffer.
+        """
+        self._capacity = self._counters[self._CAPACITY]
+        self._mask = self._capacity - 1
+        self._slot_size = self._counters[self._SLOT_SIZE]
+
+    def push(self, record):
+        """Add a record at the tail of the buffer.
+
+        Must only be called by the producer.
+
+        Args:
+            record (bytes-like): The record, of exactly slot_size bytes.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            ValueError: An error occurs if the record does not have the
+                        size of a slot or if the buffer is full.
+        """
+        if len(record) != self._slot_size:
+            raise ValueError('Argument record must have the size of a slot.')
+        counters = self._counters
+        tail = counters[self._TAIL]
+        if tail - counters[self._HEAD] == self._capacity:
+            raise ValueError('The queue is full.')
+        start = (tail & self._mask) * self._slot_size
+        self._data[start:start + self._slot_size] = record
+        counters[self._TAIL] = tail + 1
+
+    def push_many(self, records):
+        """Add as many records as there is room for at the tail.
+
+        Must only be called by the producer.
+
+        Args:
+            records (bytes-like): Records concatenated one after another.
+
+        Returns:
+            int: The number of records added, from the start of records.
+
+        Raises:
+            ValueError: An error occurs if the size of records is not a
+                        multiple of the size of a slot.
+        """
+        slot_size = self._slot_size
+        records = memoryview(records).cast('B')
+        if len(records) % slot_size != 0:
+            raise ValueError('Argument records must hold whole slots.')
+        counters = self._counters
+        tail = counters[self._TAIL]
+        n_records = min(len(records) // slot_size,
+                        self._capacity - (tail - counters[self._HEAD]))
+        start = tail & self._mask
+        # The records wrap around the end of the array at most once.
+        n_first = min(n_records, self._capacity - start)
+        data = self._data
+        data[start*slot_size:(start + n_first)*slot_size] = \
+            records[:n_first*slot_size]
+        data[:(n_records - n_first)*slot_size] = \
+            records[n_first*slot_size:n_records*slot_size]
+        counters[self._TAIL] = tail + n_records
+        return n_records
+
+    def pop(self):
+        """Remove the record at the head of the buffer.
+
+        Must only be called by the consumer.
+
+        Args:
+            Nothing.
+
+        Returns:
+            bytes: The record.
+
+        Raises:
+            ValueError: An error occurs when the buffer is empty.
+        """
+        counters = self._counters
+        head = counters[self._HEAD]
+        if head == counters[self._TAIL]:
+            raise ValueError('The queue is empty.')
+        start = (head & self._mask) * self._slot_size
+        record = self._data[start:start + self._slot_size].tobytes()
+        counters[self._HEAD] = head + 1
+        return record
+
+    def pop_many(self, max_n):
+        """Remove up to max_n records from the head of the buffer.
+
+        Must only be called by the consumer.
+
+        Args:
+            max_n (int): Maximum number of records to remove.
+
+        Returns:
+            bytes: The records concatenated one after another, possibly
+                   none.
+
+        Raises:
+            ValueError: An error occurs if max_n < 0.
+        """
+        if max_n < 0:
+            raise ValueError('Argument max_n out of range.')
+        slot_size = self._slot_size
+        counters = self._counters
+        head = counters[self._HEAD]
+        n_records = min(max_n, counters[self._TAIL] - head)
+        start = head & self._mask
+        n_first = min(n_records, self._capacity - start)
+        data = self._data
+        records = data[start*slot_size:(start + n_first)*slot_size].tobytes()
+        if n_first < n_records:
+            records = records + data[:(n_records - n_first)*slot_size].tobytes()
+        counters[self._HEAD] = head + n_records
+        return records
+
+    def capacity(self):
+        """Get the number of slots of the buffer.
+
+        Args:
+            Nothing.
+
+        Returns:
+            int: The maximum number of records in the buffer.
+
+        Raises:
+            Nothing.
+        """
+        return self._capacity
+
+    def slot_size(self):
+        """Get the size of a record.
+
+        Args:
+            Nothing.
+
+        Returns:
+            int: The size of a record, in bytes.
+
+        Raises:
+            Nothing.
+        """
+        return self._slot_size
+
+    def size(self):
+        """Get the number of records in the buffer.
+
+        The value may already be outdated if the other process is
+        concurrently pushing or popping records.
+
+        Args:
+            Nothing.
+
+        Returns:
+            int: The number of records.
+
+        Raises:
+            Nothing.
+        """
+        head = self._counters[self._HEAD]
+        return self._counters[self._TAIL] - head
+
+    def is_empty(self):
+        """Verify if the buffer is empty.
+
+        Args:
+            Nothing.
+
+        Returns:
+            bool: True if the buffer contains no records, False otherwise.
+
+        Raises:
+            Nothing.
+        """
+        return self.size() == 0
+
+    def close(self):
+        """Detach from the shared memory block.
+
+        The process that created the buffer also frees the block, so it
+        must close the buffer last.
+
+        Args:
+            Nothing.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        if self._shm is None:
+            return
+        self._counters.release()
+        self._data.release()
+        self._shm.close()
+        if self._owner_pid == _os.getpid():
+            self._shm.unlink()
+        self._shm = None
+
+    def __len__(self):
+        return self.size()
+
+    def __reduce__(self):
+        return (self.__class__.attach, (self.name,))
+
+    def __del__(self):
+        if getattr(self, '_shm', None) is not None:
+            self.close()
+
+class WorkStealingDeque(object):
+    """Work-stealing deque with the semantics of the Chase-Lev deque.
+
+    The deque has a single owner thread, which pushes and pops items at
+    the bottom, as a stack, while any other thread can steal items from
+    the top, i.e. the oldest ones. The items live in a circular python
+    list indexed by two counters, top and bottom, that only grow. The
+    owner never takes a lock, except when it races with thieves for the
+    last item. Thieves take an item by moving top forward with a
+    compare-and-swap, emulated here by a lock shared by the thieves. The
+    owner doubles the array when it is full; a thief that still reads the
+    previous array finds the same items there.
+
+    Args:
+        capacity (Optional[int]): Initial capacity of the array, rounded up
+                                  to a power of two. Defaults to 64.
+
+    Attributes (public):
+        Nothing.
+    """
+    def __init__(self, capacity=64):
+        n_slots = 1
+        while n_slots < capacity:
+            n_slots = 2*n_slots
+        self._array = [None] * n_slots
+        self._top = 0
+        self._bottom = 0
+        self._steal_lock = _threading.Lock()
+
+    def _compare_and_swap_top(self, expected):
+        """Increment top if it is still equal to expected.
+        """
+        with self._steal_lock:
+            if self._top != expected:
+                return False
+            self._top = expected + 1
+            return True
+
+    def push(self, item):
+        """Add an item at the bottom of the deque.
+
+        Must only be called by the owner thread.
+
+        Args:
+            item (object): The item to add.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        bottom = self._bottom
+        array = self._array
+        if bottom - self._top >= len(array):
+            new_array = [None] * (2*len(array))
+            for index in range(self._top, bottom):
+                new_array[index & (len(new_array) - 1)] = \
+                    array[index & (len(array) - 1)]
+            self._array = array = new_array
+        array[bottom & (len(array) - 1)] = item
+        # The item is written before the thieves can see it.
+        self._bottom = bottom + 1
+
+    def pop(self):
+        """Remove the item at the bottom of the deque, i.e. the newest one.
+
+        Must only be called by the owner thread.
+
+        Args:
+            Nothing.
+
+        Returns:
+            object: The newest item.
+
+        Raises:
+            ValueError: An error occurs when the deque is empty, or when a
+                        thief took its last item.
+        """
+        bottom = self._bottom - 1
+        array = self._array
+        # Reserve the bottom item before looking at top, so that a thief
+        # can only take it through the compare-and-swap.
+        self._bottom = bottom
+        top = self._top
+        if top > bottom:
+            self._bottom = bottom + 1
+            raise ValueError('The deque is empty.')
+        item = array[bottom & (len(array) - 1)]
+        if top < bottom:
+            array[bottom & (len(array) - 1)] = None
+            return item
+        # Last item: whoever moves top first gets it.
+        won = self._compare_and_swap_top(top)
+        self._bottom = bottom + 1
+        if not won:
+            raise ValueError('The deque is empty.')
+        array[bottom & (len(array) - 1)] = None
+        return item
+
+    def steal(self):
+        """Remove the item at the top of the deque, i.e. the oldest one.
+
+        Can be called by any thread.
+
+        Args:
+            Nothing.
+
+        Returns:
+            object: The oldest item.
+
+        Raises:
+            ValueError: An error occurs when the deque is empty, or when
+                        another thread took the item first.
+        """
+        top = self._top
+        bottom = self._bottom
+        if top >= bottom:
+            raise ValueError('The deque is empty.')
+        array = self._array
+        item = array[top & (len(array) - 1)]
+        if not self._compare_and_swap_top(top):
+            raise ValueError('The deque is empty.')
+        return item
+
+    def size(self):
+        """Get the number of items in the deque.
+
+        The value may already be outdated if other threads use the deque.
+
+        Args:
+            Nothing.
+
+        Returns:
+            int: The number of items.
+
+        Raises:
+            Nothing.
+        """
+        return max(self._bottom - self._top, 0)
+
+    def is_empty(self):
+        """Verify if the deque is empty.
+
+        Args:
+            Nothing.
+
+        Returns:
+            bool: True if the deque contains no items, False otherwise.
+
+        Raises:
+            Nothing.
+        """
+        return self.size() == 0
+
+    def __len__(self):
+        return self.size()
+
+class WorkStealingPool(object):
+    """Thread pool that balances the load with work-stealing deques.
+
+    Every worker thread owns a WorkStealingDeque. A task submitted by a
+    running task is pushed on the deque of its worker, which runs it next
+    since the newest tasks are popped first and are the most likely to
+    share data with the current one. A worker with an empty deque steals
+    the oldest task of another worker, which is usually the root of a
+    large part of the remaining task graph, so recursive task graphs such
+    as graph traversals spread over the workers with little contention.
+    Tasks submitted from outside the pool go through a shared
+    BlockingQueue.
+
+    Each worker counts the tasks it submitted and finished, so running a
+    task takes no lock. wait returns once every submitted task, including
+    the ones they submitted recursively, is finished.
+
+    Args:
+        n_workers (Optional[int]): Number of worker threads. Defaults to the
+                                   number of processors.
+
+    Attributes (public):
+        Nothing.
+
+    Raises:
+        ValueError: An error occurs if n_workers < 1.
+    """
+    def __init__(self, n_workers=None):
+        if n_workers is None:
+            n_workers = _os.cpu_count() or 1
+        if n_workers < 1:
+            raise ValueError('Argument n_workers must be at least 1.')
+        self._deques = [WorkStealingDeque() for _ in range(n_workers)]
+        self._injected = BlockingQueue()
+        self._submitted = [0] * n_workers
+        self._finished = [0] * n_workers
+        self._n_injected = 0
+        self._n_idle = 0
+        self._error = None
+        self._closed = False
+        self._lock = _threading.Lock()
+        self._work = _threading.Condition(self._lock)
+        self._done = _threading.Condition(self._lock)
+        self._local = _threading.local()
+        self._threads = [_threading.Thread(target=self._run, args=(index,),
+                                           daemon=True)
+                         for index in range(n_workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, function, *args):
+        """Schedule a call of function(*args) on a worker thread.
+
+        Args:
+            function (function): The function to call.
+            *args (object): The arguments of the call.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            ValueError: An error occurs if the pool is shut down.
+        """
+        if self._closed:
+            raise ValueError('The pool is shut down.')
+        index = getattr(self._local, 'index', None)
+        if index is None:
+            with self._lock:
+                self._n_injected = self._n_injected + 1
+            self._injected.put((function, args))
+        else:
+            self._submitted[index] = self._submitted[index] + 1
+            self._deques[index].push((function, args))
+        # A worker that goes idle checks for tasks again after counting
+        # itself idle, so reading the count without the lock is enough.
+        if self._n_idle > 0:
+            with self._lock:
+                self._work.notify()
+
+    def _find_task(self, index):
+        """Return a task for a worker: its newest task, or else the oldest
+           task of another worker, or else an injected task, or None.
+        """
+        try:
+            return self._deques[index].pop()
+        except ValueError:
+            pass
+        n_workers = len(self._deques)
+        for offset in range(1, n_workers):
+            try:
+                return self._deques[(index + offset) % n_workers].steal()
+            except ValueError:
+                pass
+        try:
+            return self._injected.get(block=False)
+        except ValueError:
+            return None
+
+    def _is_done(self):
+        """Verify if all the submitted tasks are finished.
+        """
+        # A task finishes after the tasks it submitted were counted, so
+        # reading the finished counts first never reports a running task
+        # as done.
+        n_finished = sum(self._finished)
+        return n_finished == sum(self._submitted) + self._n_injected
+
+    def _run(self, index):
+        """Main loop of a worker thread.
+        """
+        self._local.index = index
+        finished = self._finished
+        while True:
+            task = self._find_task(index)
+            if task is None:
+                with self._lock:
+                    self._n_idle = self._n_idle + 1
+                    self._done.notify_all()
+                    while (task is None) and (not self._closed):
+                        task = self._find_task(index)
+                        if task is None:
+                            self._work.wait()
+                    self._n_idle = self._n_idle - 1
+                if task is None:
+                    return
+
+            function, args = task
+            try:
+                function(*args)
+            except BaseException as error:
+                with self._lock:
+                    if self._error is None:
+                        self._error = error
+            finished[index] = finished[index] + 1
+
+    def wait(self):
+        """Wait until all the submitted tasks are finished.
+
+        Args:
+            Nothing.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Exception: The first exception raised by a task, if any. It is
+                       then cleared.
+        """
+        with self._lock:
+            while not self._is_done():
+                self._done.wait()
+            error = self._error
+            self._error = None
+        if error is not None:
+            raise error
+
+    def shutdown(self):
+        """Stop the worker threads once they are idle.
+
+        Args:
+            Nothing.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        with self._lock:
+            self._closed = True
+            self._work.notify_all()
+        for thread in self._threads:
+            if thread is not _threading.current_thread():
+                thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            self.wait()
+        finally:
+            self.shutdown()
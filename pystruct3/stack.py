@@ -25,9 +25,15 @@
 """
 Stack data structures.
 
-This module contains a class implementation of a stack type.
+This module contains class implementations of stack types.
+The available stacks are:
+    Stack
+    ArrayStack
+    PersistentStack
 """
 
+import array as _array
+
 class Stack(object):
     """Stack data structure.
 
@@ -51,15 +57,12 @@ class Stack(object):
             item (object): Item contained in the node.
             next_node (_Node): Pointer to neighbor node.
         """
+        __slots__ = ('item', 'next_node')
 
         def __init__(self, item, next_node=None):
             self.item = item
             self.next_node = next_node
 
-        def __del__(self):
-            self.item = None
-            self.next_node = None
-
     class _ForwardIterator(object):
         """Iterator for Stack.
 
@@ -216,8 +219,15 @@ class Stack(object):
         Raises:
             Nothing.
         """
-        while self._size > 0:
-            self.pop()
+        # Unlink the nodes one by one, so that freeing a long stack never
+        # chains deallocations.
+        sentinel = self._head
+        self._head = None
+        while sentinel is not None:
+            next_node = sentinel.next_node
+            sentinel.next_node = None
+            sentinel = next_node
+        self._size = 0
 
     def is_empty(self):
         """Verify if the stack is empty.
@@ -263,14 +273,20 @@ class Stack(object):
         Raises:
             Nothing.
         """
-        tmp_stack = self.__class__()
         copy_stack = self.__class__()
-        for item in self:
-            tmp_stack.push(item)
-
-        while not tmp_stack.is_empty():
-            copy_stack.push(tmp_stack.pop())
+        sentinel = self._head
+        if sentinel is None:
+            return copy_stack
 
+        # Link the new nodes from the top down, in a single pass.
+        new_node = self._Node
+        copy_node = copy_stack._head = new_node(sentinel.item)
+        sentinel = sentinel.next_node
+        while sentinel is not None:
+            copy_node.next_node = new_node(sentinel.item)
+            copy_node = copy_node.next_node
+            sentinel = sentinel.next_node
+        copy_stack._size = self._size
         return copy_stack
 
     def __len__(self):
@@ -302,4 +318,325 @@ class Stack(object):
             items.insert(1, '(')
             del items[-1]
         items.append(']')
-        return ''.join(items)
\ No newline at end of file
+        return ''.join(items)
+
+class ArrayStack(Stack):
+    """Stack data structure.
+
+    This stack stores its items contiguously, at the end of a python list,
+    or of an array.array when a typecode is given, instead of allocating a
+    linked list node per item. push, pop and peek work on the end of the
+    array at list speed, and a typed array only costs the size of its
+    machine values per item. The items are iterated from the top to the
+    bottom of the stack, as in Stack.
+
+    With a capacity, the array is allocated once with room for capacity
+    items and keeps it, so that push and pop do not reallocate it while
+    the stack holds less than capacity items.
+
+    Args:
+        typecode (Optional[str]): Type code of an array.array, e.g. 'd'
+            for floats. Defaults to None, i.e. a python list holding any
+            object.
+        capacity (Optional[int]): Number of items to reserve room for.
+            Defaults to None, i.e. no reserve.
+
+    Attributes (public):
+        Nothing.
+
+    Raises:
+        ValueError: An error occurs if capacity < 0 or if typecode is not
+                    a valid array type code.
+    """
+    def __init__(self, typecode=None, capacity=None):
+        if capacity is None:
+            capacity = 0
+        if capacity < 0:
+            raise ValueError('Argument capacity out of range.')
+        if typecode is not None:
+            # Raises ValueError on an invalid type code.
+            _array.array(typecode)
+        Stack.__init__(self)
+        self._typecode = typecode
+        self._capacity = capacity
+        self._items = self._new_items()
+
+    def __del__(self):
+        # The array is freed with the stack, whereas clear would allocate
+        # a new one with the whole reserve.
+        pass
+
+    def _new_items(self):
+        """Create the array with the reserved room.
+        """
+        if self._typecode is None:
+            return [None] * self._capacity
+        items = _array.array(self._typecode)
+        items.frombytes(bytes(items.itemsize * self._capacity))
+        return items
+
+    def capacity(self):
+        """Get the number of items the stack has room for.
+
+        Args:
+            Nothing.
+
+        Returns:
+            int: The number of items the array can hold.
+
+        Raises:
+            Nothing.
+        """
+        return max(len(self._items), self._capacity)
+
+    def push(self, item):
+        items = self._items
+        if self._size < len(items):
+            items[self._size] = item
+        else:
+            items.append(item)
+        self._size = self._size + 1
+
+    def pop(self):
+        if self._size == 0:
+            raise ValueError('The stack is empty.')
+        self._size = self._size - 1
+        if self._size >= self._capacity:
+            return self._items.pop()
+        item = self._items[self._size]
+        if self._typecode is None:
+            # Release the item, the reserved slot stays.
+            self._items[self._size] = None
+        return item
+
+    def peek(self):
+        if self._size == 0:
+            raise ValueError('The stack is empty.')
+        return self._items[self._size - 1]
+
+    def write(self, item):
+        if self._size == 0:
+            raise ValueError('The stack is empty.')
+        self._items[self._size - 1] = item
+
+    def contains(self, item):
+        if len(self._items) == self._size:
+            return item in self._items
+        return item in self._items[:self._size]
+
+    def clear(self):
+        self._items = self._new_items()
+        self._size = 0
+
+    def copy(self):
+        copy_stack = self.__class__(self._typecode, self._capacity)
+        copy_stack._items[:self._size] = self._items[:self._size]
+        copy_stack._size = self._size
+        return copy_stack
+
+    def __iter__(self):
+        items = self._items
+        for index in range(self._size - 1, -1, -1):
+            yield items[index]
+
+class PersistentStack(object):
+    """Persistent stack data structure.
+
+    The stack is immutable: push and pop leave it untouched and return a
+    new version of the stack instead. The versions share their nodes, a
+    push only allocates one node and a pop none, so keeping every version
+    costs O(1) memory per operation and copy is O(1). This is the stack to
+    use to take many snapshots, e.g. of an undo history.
+
+    Args:
+        Nothing.
+
+    Attributes (public):
+        Nothing.
+    """
+
+    class _Node(object):
+        """Node class for linked list.
+
+        Args:
+            item (object): Item contained in the node.
+            next_node (_Node): Pointer to neighbor node.
+
+        Attributes (public):
+            item (object): Item contained in the node.
+            next_node (_Node): Pointer to neighbor node.
+        """
+        __slots__ = ('item', 'next_node')
+
+        def __init__(self, item, next_node=None):
+            self.item = item
+            self.next_node = next_node
+
+    def __init__(self):
+        """Create an empty stack.
+
+        Args:
+            Nothing.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        self._size = 0
+        self._head = None
+
+    def _new_version(self, head, size):
+        """Create a stack sharing the nodes from head.
+        """
+        version = self.__class__.__new__(self.__class__)
+        version._head = head
+        version._size = size
+        return version
+
+    def push(self, item):
+        """Return a new stack with an item pushed on top of this one.
+
+        Args:
+            item (object): The item to add to the stack.
+
+        Returns:
+            PersistentStack: The new version of the stack.
+
+        Raises:
+            Nothing.
+        """
+        return self._new_version(self._Node(item, self._head), self._size + 1)
+
+    def pop(self):
+        """Return a new stack without the item at the top of this one.
+
+        Use peek to read the removed item.
+
+        Args:
+            Nothing.
+
+        Returns:
+            PersistentStack: The new version of the stack.
+
+        Raises:
+            ValueError: An error occurs when the stack is empty.
+        """
+        if self._size == 0:
+            raise ValueError('The stack is empty.')
+        return self._new_version(self._head.next_node, self._size - 1)
+
+    def peek(self):
+        """Returns the element at the top of the stack.
+
+        Args:
+            Nothing.
+
+        Returns:
+            object: The item at the top of the stack.
+
+        Raises:
+            ValueError: An error occurs when the stack is empty.
+        """
+        if self._size == 0:
+            raise ValueError('The stack is empty.')
+        return self._head.item
+
+    def contains(self, item):
+        """Verify if an item is in the stack.
+
+        Args:
+            item (object): The queried item.
+
+        Returns:
+            bool: True if item is in the stack, False otherwise.
+
+        Raises:
+            Nothing
+        """
+        for stack_item in self:
+            if stack_item == item:
+                return True
+        return False
+
+    def is_empty(self):
+        """Verify if the stack is empty.
+
+        Args:
+            Nothing.
+
+        Returns:
+            bool: True if the stack is empty, False otherwise.
+
+        Raises:
+            Nothing.
+        """
+        return self._size == 0
+
+    def size(self):
+        """Get the size of the stack.
+
+        Args:
+            Nothing.
+
+        Returns:
+            int: The size of the stack.
+
+        Raises:
+            Nothing.
+        """
+        return self._size
+
+    def copy(self):
+        """Copy of the stack.
+
+        The stack is immutable, so the copy shares all its nodes.
+
+        Args:
+            Nothing.
+
+        Returns:
+            PersistentStack: A copy of the stack.
+
+        Raises:
+            Nothing.
+        """
+        return self._new_version(self._head, self._size)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        node = self._head
+        while node is not None:
+            yield node.item
+            node = node.next_node
+
+    def __contains__(self, item):
+        return self.contains(item)
+
+    def __eq__(self, other_stack):
+        if self._size != other_stack.size():
+            return False
+
+        if getattr(other_stack, '_head', None) is self._head:
+            return True
+
+        for item1,item2 in zip(self,other_stack):
+            if item1 != item2:
+                return False
+
+        return True
+
+    def __repr__(self):
+        items = ['[']
+        for item in self:
+            items.append(str(item))
+            items.append(', ')
+        if not self.is_empty():
+            items.insert(2, ')')
+            items.insert(1, '(')
+            del items[-1]
+        items.append(']')
+        return ''.join(items)
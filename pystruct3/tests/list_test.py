@@ -23,8 +23,11 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import array
+import functools
 import unittest
 import random
+import tracemalloc
 
 class TestListMethods(unittest.TestCase):
 
@@ -238,6 +241,16 @@ class TestListMethods(unittest.TestCase):
         self.some_list.clear()
         self.assertEqual(self.some_list, self.empty_list)
 
+    def test_clear_reuse_ok(self):
+        a = self.some_list.copy()
+        self.some_list.clear()
+        self.some_list.append(5)
+        self.some_list.insert(4, 0)
+        self.assertEqual([4, 5], list(self.some_list))
+        self.assertEqual(4, self.some_list.pop(0))
+        self.assertEqual(5, self.some_list.pop())
+        self.assertEqual([3, 1, 2], list(a))
+
     def test_index_raises(self):
         with self.assertRaises(ValueError):
             self.empty_list.index(2)
@@ -435,6 +448,337 @@ class TestListMethods(unittest.TestCase):
         l[0] = 123
         self.assertFalse(l == self.some_list)
 
+class TestArrayListMethods(unittest.TestCase):
+
+    def test_init_raises(self):
+        with self.assertRaises(ValueError):
+            ArrayList(2, 'i', 'int32')
+        with self.assertRaises(ValueError):
+            ArrayList(2, 'x')
+
+    def test_typed_ok(self):
+        a = ArrayList(2, 'i')
+        for item in range(10):
+            a.append(item)
+        self.assertIsInstance(a._array, array.array)
+        self.assertEqual(list(range(10)), list(a))
+        with self.assertRaises(TypeError):
+            a.append('a')
+        with self.assertRaises(OverflowError):
+            a.append(2**40)
+        b = a.copy()
+        b.write(-1, 0)
+        self.assertEqual(0, a[0])
+        self.assertEqual(b.pop(0), -1)
+
+    def test_memoryview_ok(self):
+        a = ArrayList(8, 'i')
+        for item in range(6):
+            a.append(item)
+        for _ in range(4):
+            a.pop(0)
+        for item in range(6, 10):
+            a.append(item)
+        self.assertGreater(a._head, a._tail)
+        view = a.memoryview()
+        self.assertEqual(list(range(4, 10)), view.tolist())
+        self.assertEqual('i', view.format)
+        a.write(-1, 0)
+        self.assertEqual(-1, view[0])
+        view[1] = -2
+        self.assertEqual(-2, a[1])
+        with self.assertRaises(ValueError):
+            ArrayList().memoryview()
+
+    def test_del_ok(self):
+        a = ArrayList(1000000, 'i')
+        tracemalloc.start()
+        del a
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self.assertLess(peak, 100000)
+
+    def test_memoryview_shift_ok(self):
+        a = ArrayList(16, 'q')
+        a.extend(range(10))
+        view = a.memoryview()
+        a.insert(99, 5)
+        a.insert(98, 2)
+        self.assertEqual(7, a.pop(9))
+        self.assertEqual(1, a.pop(1))
+        self.assertEqual([0, 98, 2, 3, 4, 99, 5, 6, 8, 9], list(a))
+        # Same moves across the end of the circular array.
+        for _ in range(10):
+            a.append(a.pop(0))
+        self.assertGreater(a._head, a._tail)
+        a.insert(97, 5)
+        self.assertEqual(5, a.pop(7))
+        self.assertEqual([0, 98, 2, 3, 4, 97, 99, 6, 8, 9], list(a))
+        a.extend([])
+        self.assertEqual(10, a.size())
+        view.release()
+
+    def test_random_ok(self):
+        for a in (ArrayList(), ArrayList(2, 'q')):
+            reference = []
+            for item in range(3000):
+                operation = random.randint(0, 3)
+                if operation == 0 and reference:
+                    index = random.randrange(len(reference))
+                    self.assertEqual(reference.pop(index), a.pop(index))
+                elif operation == 1:
+                    items = range(item, item + random.randint(0, 5))
+                    a.extend(items)
+                    reference.extend(items)
+                else:
+                    index = random.randint(0, len(reference))
+                    a.insert(item, index)
+                    reference.insert(index, item)
+            self.assertEqual(reference, list(a))
+            self.assertEqual(len(reference), a.size())
+            for index in range(len(reference) - 1, -1, -3):
+                self.assertEqual(reference.pop(index), a.pop(index))
+            self.assertEqual(reference, list(a))
+
+    def test_dtype_ok(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest('numpy is not installed.')
+        a = ArrayList(2, dtype='int32')
+        for item in range(10):
+            a.insert(item, 0)
+        self.assertEqual(list(range(9, -1, -1)), list(a))
+        view = a.memoryview()
+        self.assertEqual(4, view.itemsize)
+        self.assertEqual(list(range(9, -1, -1)),
+                         numpy.asarray(view).tolist())
+        a.extend(range(10, 20))
+        self.assertEqual(9, a.pop(0))
+        self.assertEqual(10, a.pop(9))
+        a.insert(-1, 5)
+        self.assertEqual([8, 7, 6, 5, 4, -1, 3, 2, 1, 0] + list(range(11, 20)),
+                         list(a))
+        b = a.copy()
+        b.write(100, 0)
+        a.write(-100, 1)
+        self.assertEqual(8, a[0])
+        self.assertEqual(7, b[1])
+        self.assertEqual(list(range(11, 20)), list(b)[10:])
+
+class TestDequeMethods(unittest.TestCase):
+
+    def test_ends_ok(self):
+        a = Deque(2)
+        a.append(2)
+        a.appendleft(1)
+        a.append(3)
+        a.appendleft(0)
+        self.assertEqual([0, 1, 2, 3], list(a))
+        self.assertEqual(0, a.popleft())
+        self.assertEqual(3, a.pop())
+        self.assertEqual(1, a[0])
+        self.assertEqual(2, a[-1])
+
+    def test_popleft_raises(self):
+        with self.assertRaises(ValueError):
+            Deque().popleft()
+        with self.assertRaises(ValueError):
+            Deque().pop()
+
+    def test_capacity_ok(self):
+        a = Deque(3)
+        self.assertEqual(4, a.capacity())
+        for item in range(100):
+            a.append(item)
+        self.assertEqual(128, a.capacity())
+        for _ in range(98):
+            a.popleft()
+        self.assertEqual([98, 99], list(a))
+        self.assertEqual(8, a.capacity())
+        a.clear()
+        self.assertEqual(4, a.capacity())
+
+    def test_many_ok(self):
+        a = Deque(4)
+        a.append(-1)
+        a.popleft()
+        a.extend(range(3))
+        a.extend(range(3, 10))
+        self.assertEqual(16, a.capacity())
+        self.assertEqual(list(range(10)), list(a))
+        self.assertEqual(list(range(9, -1, -1)), list(reversed(a)))
+        self.assertEqual([0, 1, 2], a.popleft_many(3))
+        self.assertEqual([9, 8], a.pop_many(2))
+        self.assertEqual([], a.pop_many(0))
+        self.assertEqual([3, 4, 5, 6, 7], list(a))
+        with self.assertRaises(ValueError):
+            a.popleft_many(6)
+        with self.assertRaises(ValueError):
+            a.pop_many(-1)
+
+    def test_random_many_ok(self):
+        a = Deque(1)
+        reference = []
+        for item in range(0, 20000, 10):
+            operation = random.randint(0, 3)
+            n_items = random.randint(0, 10)
+            if operation == 0:
+                a.extend(range(item, item + n_items))
+                reference.extend(range(item, item + n_items))
+            elif operation == 1:
+                a.appendleft(item)
+                reference.insert(0, item)
+            elif operation == 2 and n_items <= len(reference):
+                self.assertEqual(reference[:n_items], a.popleft_many(n_items))
+                del reference[:n_items]
+            elif operation == 3 and n_items <= len(reference):
+                self.assertEqual(reference[::-1][:n_items], a.pop_many(n_items))
+                del reference[len(reference) - n_items:]
+        self.assertEqual(reference, list(a))
+
+    def test_random_ok(self):
+        a = Deque(1)
+        reference = []
+        for item in range(5000):
+            operation = random.randint(0,7)
+            if operation == 0:
+                a.append(item)
+                reference.append(item)
+            elif operation == 1:
+                a.appendleft(item)
+                reference.insert(0, item)
+            elif operation == 2 and reference:
+                self.assertEqual(reference.pop(0), a.popleft())
+            elif operation == 3 and reference:
+                self.assertEqual(reference.pop(), a.pop())
+            elif operation == 4:
+                index = random.randint(0, len(reference))
+                a.insert(item, index)
+                reference.insert(index, item)
+            elif operation == 5 and reference:
+                index = random.randrange(len(reference))
+                self.assertEqual(reference.pop(index), a.pop(index))
+            elif operation == 6 and reference:
+                index = random.randrange(len(reference))
+                a[index] = item
+                reference[index] = item
+            else:
+                a.append(item)
+                a.append(item)
+                reference.append(item)
+                reference.append(item)
+        self.assertEqual(reference, list(a))
+        self.assertEqual(reference, list(a.copy()))
+        self.assertEqual(len(reference), a.size())
+
+class TestSkipListMethods(unittest.TestCase):
+
+    def setUp(self):
+        # {}
+        self.empty_list = SkipList()
+
+        # {2: 'b', 4: 'd', 5: 'e'}
+        self.some_list = SkipList(seed=0)
+        self.some_list.insert(4, 'd')
+        self.some_list.insert(5, 'e')
+        self.some_list.insert(2, 'b')
+
+    def test_insert_delete_ok(self):
+        a = SkipList()
+        reference = {}
+        for i in range(5000):
+            key = random.randint(1,500)
+            if random.random() < 0.6:
+                a.insert(key, i)
+                reference[key] = i
+            elif key in reference:
+                a.delete(key)
+                del reference[key]
+            if i % 100 == 0:
+                self.assertTrue(a._is_valid())
+        self.assertTrue(a._is_valid())
+        self.assertEqual(list(a.items()), sorted(reference.items()))
+        self.assertEqual(a.size(), len(reference))
+
+    def test_delete_raises(self):
+        with self.assertRaises(ValueError):
+            self.empty_list.delete(1)
+        with self.assertRaises(ValueError):
+            self.some_list.delete(3)
+
+    def test_search_ok(self):
+        self.assertEqual(self.some_list.search(2), 'b')
+        self.assertEqual(self.some_list[5], 'e')
+        self.some_list[5] = 'x'
+        self.assertEqual(self.some_list[5], 'x')
+        self.assertTrue(4 in self.some_list)
+        self.assertFalse(3 in self.some_list)
+        self.assertFalse(6 in self.some_list)
+        with self.assertRaises(ValueError):
+            self.empty_list.search(1)
+
+    def test_read_index_ok(self):
+        self.assertEqual(self.some_list.read(0), 2)
+        self.assertEqual(self.some_list.read(2), 5)
+        self.assertEqual(self.some_list.read(-3), 2)
+        self.assertEqual(self.some_list.index(4), 1)
+
+        a = SkipList()
+        keys = random.sample(range(10000), 1000)
+        for key in keys:
+            a.insert(key)
+        for key in keys[:500]:
+            a.delete(key)
+        keys = sorted(keys[500:])
+        for index,key in enumerate(keys):
+            self.assertEqual(a.read(index), key)
+            self.assertEqual(a.index(key), index)
+
+    def test_read_index_raises(self):
+        with self.assertRaises(ValueError):
+            self.empty_list.read(0)
+        with self.assertRaises(ValueError):
+            self.some_list.read(3)
+        with self.assertRaises(ValueError):
+            self.some_list.read(-4)
+        with self.assertRaises(ValueError):
+            self.some_list.index(3)
+
+    def test_items_range_ok(self):
+        self.assertEqual(list(self.some_list.items(3, 5)),
+                         [(4, 'd'), (5, 'e')])
+        self.assertEqual(list(self.some_list.items(lo=5)), [(5, 'e')])
+        self.assertEqual(list(self.some_list.items(hi=4)),
+                         [(2, 'b'), (4, 'd')])
+        self.assertEqual(list(self.some_list.items(6, 10)), [])
+
+    def test_seed_ok(self):
+        a = SkipList(seed=42)
+        b = SkipList(seed=42)
+        for key in range(100):
+            a.insert(key)
+            b.insert(key)
+        node_a = a._head.next_nodes[0]
+        node_b = b._head.next_nodes[0]
+        while node_a is not None:
+            self.assertEqual(len(node_a.next_nodes), len(node_b.next_nodes))
+            node_a = node_a.next_nodes[0]
+            node_b = node_b.next_nodes[0]
+
+    def test_copy_ok(self):
+        a = self.some_list.copy()
+        self.assertEqual(a, self.some_list)
+        a.delete(4)
+        self.assertNotEqual(a, self.some_list)
+        self.assertTrue(4 in self.some_list)
+
+    def test_clear_ok(self):
+        self.some_list.clear()
+        self.assertTrue(self.some_list.is_empty())
+        self.assertEqual(repr(self.some_list), '{}')
+
+
 if __name__ == '__main__':
     from pystruct3.list import SingleLinkedList as List
     unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestListMethods))
@@ -445,8 +789,22 @@ if __name__ == '__main__':
     from pystruct3.list import ArrayList as List
     unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestListMethods))
 
+    from pystruct3.list import ArrayList
+    List = functools.partial(ArrayList, 2, 'q')
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestListMethods))
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestArrayListMethods))
+
     from pystruct3.list import CircularSingleLinkedList as List
     unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestListMethods))
 
     from pystruct3.list import CircularDoubleLinkedList as List
-    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestListMethods))
\ No newline at end of file
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestListMethods))
+
+    from pystruct3.list import Deque as List
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestListMethods))
+
+    from pystruct3.list import Deque
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestDequeMethods))
+
+    from pystruct3.list import SkipList
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestSkipListMethods))
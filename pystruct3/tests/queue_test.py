@@ -23,6 +23,14 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import asyncio
+import functools
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
 import unittest
 
 class TestQueueMethods(unittest.TestCase):
@@ -57,6 +65,7 @@ class TestQueueMethods(unittest.TestCase):
     def test_dequeue_raises(self):
         with self.assertRaises(ValueError):
             self.empty_queue.dequeue()
+        self.assertEqual(0, self.empty_queue.size())
 
         self.unit_queue.dequeue()
         with self.assertRaises(ValueError):
@@ -167,7 +176,817 @@ class TestQueueMethods(unittest.TestCase):
         self.assertNotEqual(a.first(), self.some_queue.first())
 
 
+class TestFIFOQueueMethods(unittest.TestCase):
+
+    def test_many_ok(self):
+        a = FIFOQueue()
+        a.enqueue(0)
+        a.enqueue_many(range(1, 20))
+        a.enqueue_many([])
+        self.assertEqual(20, a.size())
+        self.assertEqual(0, a.first())
+        self.assertEqual(19, a.last())
+        self.assertEqual([0, 1, 2], a.dequeue_many(3))
+        self.assertEqual([], a.dequeue_many(0))
+        self.assertEqual(3, a.dequeue())
+        self.assertEqual(list(range(4, 20)), a.dequeue_many(16))
+        with self.assertRaises(ValueError):
+            a.dequeue_many(1)
+
+    def test_random_ok(self):
+        a = FIFOQueue()
+        reference = []
+        for item in range(0, 20000, 10):
+            n_items = random.randint(0, 10)
+            if random.random() < 0.5:
+                a.enqueue_many(range(item, item + n_items))
+                reference.extend(range(item, item + n_items))
+            elif n_items <= len(reference):
+                self.assertEqual(reference[:n_items], a.dequeue_many(n_items))
+                del reference[:n_items]
+            self.assertEqual(len(reference), a.size())
+        self.assertEqual(reference, list(a))
+
+class TestLIFOQueueMethods(unittest.TestCase):
+
+    def test_order_ok(self):
+        a = LIFOQueue()
+        a.enqueue(3)
+        a.enqueue(1)
+        a.enqueue(2)
+        self.assertEqual(2, a.first())
+        self.assertEqual(3, a.last())
+        self.assertEqual([2, 1, 3], list(a))
+        self.assertEqual('[2, 1, 3]', str(a))
+        self.assertEqual(a, a.copy())
+        self.assertEqual(2, a.dequeue())
+        self.assertEqual(1, a.dequeue())
+        self.assertEqual(3, a.dequeue())
+        with self.assertRaises(ValueError):
+            a.dequeue()
+        with self.assertRaises(ValueError):
+            a.first()
+
+    def test_many_ok(self):
+        a = LIFOQueue()
+        a.enqueue_many(range(10))
+        self.assertEqual([9, 8, 7], a.dequeue_many(3))
+        a.enqueue_many([10, 11])
+        self.assertEqual([11, 10, 6, 5, 4, 3, 2, 1, 0], a.dequeue_many(9))
+        with self.assertRaises(ValueError):
+            a.dequeue_many(1)
+
+
+class TestPriorityQueueMethods(unittest.TestCase):
+
+    def setUp(self):
+        # []
+        self.empty_queue = PriorityQueue()
+
+        # [3, 2, 1]
+        self.some_queue = PriorityQueue()
+        self.some_queue.enqueue(3)
+        self.some_queue.enqueue(1)
+        self.some_queue.enqueue(2)
+
+        # [(2, 'a'), (2, 'c'), (1, 'b'), (1, 'd')]
+        self.tie_queue = PriorityQueue(lambda x1,x2 : x1[0] >= x2[0])
+        self.tie_queue.enqueue((1, 'b'))
+        self.tie_queue.enqueue((2, 'a'))
+        self.tie_queue.enqueue((1, 'd'))
+        self.tie_queue.enqueue((2, 'c'))
+
+    def test_dequeue_ok(self):
+        self.assertEqual(3, self.some_queue.dequeue())
+        self.assertEqual(2, self.some_queue.dequeue())
+        self.assertEqual(1, self.some_queue.dequeue())
+        self.assertEqual(0, self.some_queue.size())
+
+    def test_dequeue_raises(self):
+        with self.assertRaises(ValueError):
+            self.empty_queue.dequeue()
+        self.some_queue.clear()
+        with self.assertRaises(ValueError):
+            self.some_queue.dequeue()
+
+    def test_dequeue_stable_ok(self):
+        self.assertEqual((2, 'a'), self.tie_queue.dequeue())
+        self.assertEqual((2, 'c'), self.tie_queue.dequeue())
+        self.assertEqual((1, 'b'), self.tie_queue.dequeue())
+        self.assertEqual((1, 'd'), self.tie_queue.dequeue())
+
+        a = PriorityQueue(lambda x1,x2 : x1 % 10 <= x2 % 10)
+        items = [random.randint(0, 1000) for _ in range(500)]
+        for item in items:
+            a.enqueue(item)
+        expected = sorted(items, key=lambda x : x % 10)
+        self.assertEqual(expected, [a.dequeue() for _ in range(500)])
+
+    def test_enqueue_many_ok(self):
+        a = PriorityQueue(lambda x1,x2 : x1[0] <= x2[0])
+        a.enqueue((5, 0))
+        a.enqueue_many((random.randint(0, 5), i + 1) for i in range(100))
+        a.enqueue_many([(0, 101), (5, 102)])
+        self.assertEqual(a.size(), 103)
+        items = list(a)
+        self.assertEqual(items, sorted(items, key=lambda x : x[0]))
+        for item1,item2 in zip(items, items[1:]):
+            if item1[0] == item2[0]:
+                self.assertLess(item1[1], item2[1])
+
+    def test_dequeue_many_ok(self):
+        self.assertEqual([], self.some_queue.dequeue_many(0))
+        self.assertEqual([3, 2], self.some_queue.dequeue_many(2))
+        self.assertEqual(1, self.some_queue.size())
+        with self.assertRaises(ValueError):
+            self.some_queue.dequeue_many(2)
+
+    def test_first_last_ok(self):
+        with self.assertRaises(ValueError):
+            self.empty_queue.first()
+        with self.assertRaises(ValueError):
+            self.empty_queue.last()
+        self.assertEqual(3, self.some_queue.first())
+        self.assertEqual(1, self.some_queue.last())
+        self.assertEqual((2, 'a'), self.tie_queue.first())
+        self.assertEqual((1, 'd'), self.tie_queue.last())
+
+    def test_contains_ok(self):
+        self.assertFalse(1 in self.empty_queue)
+        self.assertTrue(1 in self.some_queue)
+        self.assertTrue(self.some_queue.contains(3))
+        self.assertFalse(self.some_queue.contains(4))
+        self.some_queue.dequeue()
+        self.assertFalse(self.some_queue.contains(3))
+
+    def test_iter_ok(self):
+        self.assertEqual([], list(self.empty_queue))
+        self.assertEqual([3, 2, 1], list(self.some_queue))
+        self.assertEqual(3, self.some_queue.size())
+        self.assertEqual('[3, 2, 1]', repr(self.some_queue))
+
+    def test_copy_ok(self):
+        a = self.tie_queue.copy()
+        self.assertEqual(a, self.tie_queue)
+        a.dequeue()
+        self.assertNotEqual(a, self.tie_queue)
+        self.assertEqual(4, self.tie_queue.size())
+        a.enqueue((2, 'e'))
+        self.assertEqual([(2, 'c'), (2, 'e'), (1, 'b'), (1, 'd')], list(a))
+
+
+class TestBlockingQueueMethods(unittest.TestCase):
+
+    def setUp(self):
+        # [3, 1]
+        self.full_queue = BlockingQueue(2)
+        self.full_queue.put(3)
+        self.full_queue.put(1)
+
+    def test_init_raises(self):
+        with self.assertRaises(ValueError):
+            BlockingQueue(0)
+
+    def test_put_raises(self):
+        with self.assertRaises(ValueError):
+            self.full_queue.put(2, block=False)
+        with self.assertRaises(ValueError):
+            self.full_queue.put(2, timeout=0.01)
+        with self.assertRaises(ValueError):
+            self.full_queue.put(2, timeout=-1)
+        self.assertEqual([3, 1], list(self.full_queue))
+
+    def test_get_raises(self):
+        a = BlockingQueue()
+        with self.assertRaises(ValueError):
+            a.get(block=False)
+        with self.assertRaises(ValueError):
+            a.get(timeout=0.01)
+        with self.assertRaises(ValueError):
+            a.get_many(0)
+        self.assertEqual(0, a.size())
+
+    def test_get_many_ok(self):
+        a = BlockingQueue()
+        for item in range(5):
+            a.put(item)
+        self.assertEqual([0, 1, 2], a.get_many(3))
+        self.assertEqual([3, 4], a.get_many(3))
+        self.assertTrue(a.is_empty())
+
+    def test_put_wakeup_ok(self):
+        consumer = threading.Timer(0.05, self.full_queue.get)
+        consumer.start()
+        self.full_queue.put(2, timeout=10)
+        consumer.join()
+        self.assertEqual([1, 2], list(self.full_queue))
+
+    def test_get_wakeup_ok(self):
+        a = BlockingQueue()
+        producer = threading.Timer(0.05, a.put, [7])
+        producer.start()
+        self.assertEqual(7, a.get(timeout=10))
+        producer.join()
+
+    def test_producers_consumers_ok(self):
+        a = BlockingQueue(8)
+        n_items = 2000
+        results = []
+
+        def produce(start):
+            for item in range(start, n_items, 4):
+                a.put(item)
+
+        def consume():
+            items = []
+            while len(items) < n_items // 4:
+                items.extend(a.get_many(n_items // 4 - len(items)))
+            results.append(items)
+
+        threads = [threading.Thread(target=produce, args=(start,))
+                   for start in range(4)]
+        threads += [threading.Thread(target=consume) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(a.is_empty())
+        self.assertEqual(list(range(n_items)),
+                         sorted(item for items in results for item in items))
+
+
+class TestAsyncQueueMethods(unittest.TestCase):
+
+    def test_put_get_ok(self):
+        async def run():
+            a = AsyncQueue()
+            await a.put(3)
+            await a.put(1)
+            a.put_nowait(2)
+            return [await a.get(), a.get_nowait(), await a.get()]
+        self.assertEqual([3, 1, 2], asyncio.run(run()))
+
+    def test_nowait_raises(self):
+        a = AsyncQueue(1)
+        with self.assertRaises(ValueError):
+            a.get_nowait()
+        with self.assertRaises(ValueError):
+            a.get_many_nowait(1)
+        with self.assertRaises(ValueError):
+            a.get_many_nowait(0)
+        a.put_nowait(1)
+        with self.assertRaises(ValueError):
+            a.put_nowait(2)
+        with self.assertRaises(ValueError):
+            AsyncQueue(0)
+
+    def test_get_many_ok(self):
+        async def run():
+            a = AsyncQueue()
+            getter = asyncio.ensure_future(a.get_many(3))
+            await asyncio.sleep(0)
+            for item in range(5):
+                a.put_nowait(item)
+            return [await getter, a.get_many_nowait(3)]
+        self.assertEqual([[0, 1, 2], [3, 4]], asyncio.run(run()))
+
+    def test_backpressure_ok(self):
+        async def run():
+            a = AsyncQueue(2)
+            received = []
+
+            async def produce():
+                for item in range(10):
+                    await a.put(item)
+                    self.assertTrue(a.size() <= 2)
+                await a.put(None)
+
+            async def consume():
+                while True:
+                    item = await a.get()
+                    if item is None:
+                        return
+                    received.append(item)
+
+            await asyncio.gather(produce(), consume())
+            return received
+        self.assertEqual(list(range(10)), asyncio.run(run()))
+
+    def test_cancel_waiting_ok(self):
+        async def run():
+            a = AsyncQueue()
+            cancelled = asyncio.ensure_future(a.get())
+            waiting = asyncio.ensure_future(a.get())
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            await asyncio.sleep(0)
+            a.put_nowait(1)
+            return await waiting
+        self.assertEqual(1, asyncio.run(run()))
+
+    def test_cancel_woken_ok(self):
+        async def run():
+            a = AsyncQueue()
+            woken = asyncio.ensure_future(a.get())
+            waiting = asyncio.ensure_future(a.get())
+            await asyncio.sleep(0)
+            # The first getter is woken up then cancelled before it runs,
+            # so it passes the item on to the second one.
+            a.put_nowait(1)
+            woken.cancel()
+            return await waiting
+        self.assertEqual(1, asyncio.run(run()))
+
+    def test_cancel_put_ok(self):
+        async def run():
+            a = AsyncQueue(1)
+            a.put_nowait(1)
+            cancelled = asyncio.ensure_future(a.put(2))
+            waiting = asyncio.ensure_future(a.put(3))
+            await asyncio.sleep(0)
+            a.get_nowait()
+            cancelled.cancel()
+            await waiting
+            return list(a)
+        self.assertEqual([3], asyncio.run(run()))
+
+    def test_priority_ok(self):
+        async def run():
+            a = AsyncPriorityQueue()
+            for item in [3, 1, 4, 1, 5]:
+                await a.put(item)
+            b = AsyncPriorityQueue(compare=lambda x1,x2 : x1 <= x2)
+            for item in [3, 1, 4, 1, 5]:
+                b.put_nowait(item)
+            c = b.copy()
+            return ([await a.get() for _ in range(5)],
+                    b.get_many_nowait(5), list(c))
+        self.assertEqual(([5, 4, 3, 1, 1], [1, 1, 3, 4, 5], [1, 1, 3, 4, 5]),
+                         asyncio.run(run()))
+
+
+class TestSpillQueueMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.queue = SpillQueue(4, 3, self.directory)
+
+    def tearDown(self):
+        self.queue.close()
+        self.assertEqual([], os.listdir(self.directory))
+        os.rmdir(self.directory)
+
+    def test_init_raises(self):
+        with self.assertRaises(ValueError):
+            SpillQueue(0)
+        with self.assertRaises(ValueError):
+            SpillQueue(2, 3)
+
+    def test_spill_ok(self):
+        for item in range(20):
+            self.queue.enqueue(item)
+        self.assertEqual(16, self.queue.spilled())
+        self.assertEqual(19, self.queue.last())
+        self.assertEqual(list(range(20)), list(self.queue))
+        self.assertTrue(13 in self.queue)
+        spill_path = os.path.join(self.directory,
+                                  os.listdir(self.directory)[0])
+        self.assertEqual(5, len(os.listdir(spill_path)))
+        self.assertEqual(list(range(20)),
+                         [self.queue.dequeue() for _ in range(20)])
+        self.assertEqual([], os.listdir(spill_path))
+
+    def test_random_ok(self):
+        reference = []
+        item = 0
+        for _ in range(2000):
+            if random.random() < 0.55:
+                self.queue.enqueue(item)
+                reference.append(item)
+                item = item + 1
+            elif reference:
+                self.assertEqual(reference[0], self.queue.first())
+                self.assertEqual(reference.pop(0), self.queue.dequeue())
+            self.assertTrue(self.queue._items.size() <= 4)
+            self.assertTrue(len(self.queue._batch) < 3)
+            self.assertEqual(len(reference), self.queue.size())
+        self.assertEqual(reference, list(self.queue))
+        self.assertEqual(reference, list(self.queue.copy()))
+
+class TestDelayQueueMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.now = [100.0]
+        clock = lambda: self.now[0]
+        self.heap_queue = DelayQueue(clock=clock)
+        self.wheel_queue = DelayQueue(0.01, clock)
+
+    def test_init_raises(self):
+        with self.assertRaises(ValueError):
+            DelayQueue(0)
+
+    def test_deadline_ok(self):
+        for queue in (self.heap_queue, self.wheel_queue):
+            self.now[0] = 100.0
+            for item, delay in (('c', 3), ('a', 1), ('d', 3), ('b', 2)):
+                queue.put(item, delay)
+            self.assertEqual(['a', 'b', 'c', 'd'], list(queue))
+            self.assertEqual('a', queue.first())
+            self.assertEqual('d', queue.last())
+            with self.assertRaises(ValueError):
+                queue.get(block=False)
+            self.now[0] = 101.5
+            self.assertEqual('a', queue.dequeue())
+            with self.assertRaisesRegex(ValueError, 'No item is due.'):
+                queue.dequeue()
+            with self.assertRaisesRegex(ValueError, 'No item is due.'):
+                queue.get(block=False)
+            self.now[0] = 103.5
+            self.assertEqual(['b', 'c'], queue.get_many(2))
+            self.assertEqual(['d'], queue.get_many(2))
+            self.assertTrue(queue.is_empty())
+            with self.assertRaises(ValueError):
+                queue.first()
+
+    def test_random_ok(self):
+        random.seed(0)
+        for queue in (self.heap_queue, self.wheel_queue):
+            self.now[0] = 100.0
+            deadlines = {}
+            for item in range(3000):
+                delay = random.choice((random.random(), 10*random.random(),
+                                       1e4*random.random(), 1e6))
+                deadlines[item] = self.now[0] + delay
+                queue.put(item, delay)
+            self.assertEqual(sorted(deadlines, key=deadlines.get),
+                             list(queue))
+            got = []
+            while queue.size() > 0:
+                self.now[0] = self.now[0] + random.random()**8*1e5
+                try:
+                    batch = queue.get_many(100, block=False)
+                except ValueError:
+                    batch = []
+                for item in batch:
+                    self.assertLessEqual(deadlines[item], self.now[0])
+                got.extend(batch)
+            self.assertEqual(sorted(deadlines), sorted(got))
+            self.assertEqual(0, queue.size())
+
+    def test_past_due_order_ok(self):
+        for queue in (self.heap_queue, self.wheel_queue):
+            self.now[0] = 100.0
+            queue.put('a', 1)
+            queue.put('b', 2)
+            self.now[0] = 103.0
+            self.assertEqual('a', queue.get(block=False))
+            queue.enqueue('e')
+            queue.put('d', -1)
+            queue.put('c', -2.5)
+            self.assertEqual(['c', 'b', 'd', 'e'],
+                             queue.get_many(4, block=False))
+
+    def test_far_deadline_ok(self):
+        self.wheel_queue.put('far', 1e9)
+        self.wheel_queue.put('near', 1)
+        self.now[0] = 100.0 + 5e8
+        self.assertEqual(['near'], self.wheel_queue.get_many(2, block=False))
+        with self.assertRaises(ValueError):
+            self.wheel_queue.get(block=False)
+        self.now[0] = 100.0 + 1e9
+        self.assertEqual('far', self.wheel_queue.get(block=False))
+
+    def test_copy_clear_ok(self):
+        for queue in (self.heap_queue, self.wheel_queue):
+            for item in range(5):
+                queue.put(item, 5 - item)
+            copy_queue = queue.copy()
+            self.assertEqual(queue, copy_queue)
+            queue.clear()
+            self.assertEqual(0, queue.size())
+            self.assertEqual([4, 3, 2, 1, 0], list(copy_queue))
+
+    def test_blocking_ok(self):
+        for resolution in (None, 0.005):
+            queue = DelayQueue(resolution)
+            with self.assertRaises(ValueError):
+                queue.get(timeout=0.01)
+            start = time.monotonic()
+            queue.put('late', 0.05)
+            threading.Timer(0.01, queue.put, ('early', 0.01)).start()
+            self.assertEqual('early', queue.get(timeout=1))
+            self.assertGreaterEqual(time.monotonic() - start, 0.02)
+            self.assertEqual('late', queue.get())
+            self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+
+class TestMeteredQueueMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.now = [0]
+        self.queue = MeteredQueue(FIFOQueue(), lambda: self.now[0])
+
+    def test_depth_ok(self):
+        self.queue.enqueue_many(range(5))
+        self.queue.dequeue_many(3)
+        self.queue.enqueue(5)
+        self.assertEqual(3, self.queue.size())
+        snapshot = self.queue.snapshot()
+        self.assertEqual(3, snapshot['depth'])
+        self.assertEqual(5, snapshot['high_water_mark'])
+        self.assertEqual(6, snapshot['enqueued'])
+        self.assertEqual(3, snapshot['dequeued'])
+
+    def test_rates_ok(self):
+        self.queue.enqueue_many(range(10))
+        self.now[0] = 2*10**9
+        self.queue.dequeue_many(4)
+        snapshot = self.queue.snapshot()
+        self.assertEqual(5.0, snapshot['enqueue_rate'])
+        self.assertEqual(2.0, snapshot['dequeue_rate'])
+        self.now[0] = 3*10**9
+        self.queue.dequeue()
+        snapshot = self.queue.snapshot()
+        self.assertEqual(0.0, snapshot['enqueue_rate'])
+        self.assertEqual(1.0, snapshot['dequeue_rate'])
+
+    def test_residence_ok(self):
+        self.assertEqual({'count': 0}, self.queue.snapshot()['residence'])
+        item = object()
+        for _ in range(100):
+            self.queue.enqueue(item)
+            self.now[0] = self.now[0] + 10**6
+        for _ in range(100):
+            self.queue.dequeue()
+        residence = self.queue.snapshot()['residence']
+        self.assertEqual(100, residence['count'])
+        self.assertAlmostEqual(0.001, residence['min'])
+        self.assertAlmostEqual(0.1, residence['max'])
+        self.assertAlmostEqual(0.0505, residence['mean'])
+        self.assertAlmostEqual(0.05, residence['p50'], delta=0.05*0.016)
+        self.assertAlmostEqual(0.099, residence['p99'], delta=0.099*0.016)
+
+    def test_wrapped_ok(self):
+        blocking_queue = BlockingQueue()
+        blocking_queue.put(-1)
+        queue = MeteredQueue(blocking_queue)
+        queue.put(0)
+        queue.put(1, timeout=1)
+        queue.enqueue(2)
+        self.assertEqual([-1, 0, 1, 2], list(queue))
+        self.assertEqual(-1, queue.get(timeout=1))
+        self.assertEqual([0, 1], queue.get_many(2))
+        snapshot = queue.snapshot()
+        self.assertEqual(2, snapshot['residence']['count'])
+        self.assertEqual(3, snapshot['dequeued'])
+        del queue
+        self.assertEqual([2], list(blocking_queue))
+
+    def test_stamp_before_visible_ok(self):
+        visible = []
+        class SpyQueue(FIFOQueue):
+            def enqueue(inner, item):
+                visible.append(id(item) in self.queue._enqueued_at)
+                FIFOQueue.enqueue(inner, item)
+            def enqueue_many(inner, items):
+                visible.extend(id(item) in self.queue._enqueued_at
+                               for item in items)
+                FIFOQueue.enqueue_many(inner, items)
+        self.queue = MeteredQueue(SpyQueue(), lambda: self.now[0])
+        self.queue.enqueue(object())
+        self.queue.enqueue_many([object(), object()])
+        self.assertEqual([True, True, True], visible)
+
+    def test_failed_put_ok(self):
+        item = object()
+        queue = MeteredQueue(BlockingQueue(1))
+        queue.put(item)
+        with self.assertRaises(ValueError):
+            queue.put(item, block=False)
+        with self.assertRaises(ValueError):
+            queue.put(object(), block=False)
+        self.assertEqual(1, len(queue._enqueued_at))
+        self.assertIs(item, queue.get())
+        self.assertEqual({}, queue._enqueued_at)
+        snapshot = queue.snapshot()
+        self.assertEqual(1, snapshot['enqueued'])
+        self.assertEqual(1, snapshot['residence']['count'])
+
+    def test_init_raises(self):
+        with self.assertRaises(ValueError):
+            MeteredQueue(AsyncQueue())
+
+def produce_records(ring, n_records):
+    """Push n_records 8-byte records, in batches of random sizes.
+    """
+    records = b''.join(item.to_bytes(8, 'little')
+                       for item in range(n_records))
+    start = 0
+    while start < len(records):
+        stop = start + 8*random.randint(1, 50)
+        start = start + 8*ring.push_many(records[start:stop])
+    ring.close()
+
+class TestSharedRingBufferMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.ring = SharedRingBuffer(4, 6)
+
+    def tearDown(self):
+        self.ring.close()
+
+    def test_init_ok(self):
+        self.assertEqual(8, self.ring.capacity())
+        self.assertEqual(4, self.ring.slot_size())
+        self.assertTrue(self.ring.is_empty())
+        with self.assertRaises(ValueError):
+            SharedRingBuffer(0)
+
+    def test_push_pop_ok(self):
+        for _ in range(3):
+            for item in range(5):
+                self.ring.push(bytes([item] * 4))
+            self.assertEqual(5, len(self.ring))
+            for item in range(5):
+                self.assertEqual(bytes([item] * 4), self.ring.pop())
+
+    def test_push_pop_raises(self):
+        with self.assertRaises(ValueError):
+            self.ring.pop()
+        with self.assertRaises(ValueError):
+            self.ring.push(b'abc')
+        for _ in range(8):
+            self.ring.push(b'abcd')
+        with self.assertRaises(ValueError):
+            self.ring.push(b'abcd')
+        with self.assertRaises(ValueError):
+            self.ring.push_many(b'abcdef')
+        with self.assertRaises(ValueError):
+            self.ring.pop_many(-1)
+
+    def test_push_pop_many_ok(self):
+        records = bytes(range(48))
+        self.ring.push(b'0000')
+        self.assertEqual(7, self.ring.push_many(records))
+        self.assertEqual(0, self.ring.push_many(records))
+        self.assertEqual(b'0000' + records[:12], self.ring.pop_many(4))
+        # The next records wrap around the end of the array.
+        self.assertEqual(4, self.ring.push_many(records[28:]))
+        self.assertEqual(records[12:44], self.ring.pop_many(100))
+        self.assertEqual(b'', self.ring.pop_many(100))
+
+    def test_attach_ok(self):
+        other = SharedRingBuffer.attach(self.ring.name)
+        self.ring.push(b'abcd')
+        self.assertEqual(b'abcd', other.pop())
+        self.assertTrue(self.ring.is_empty())
+        other.close()
+
+    def test_processes_ok(self):
+        n_records = 5000
+        ring = SharedRingBuffer(8, 64)
+        context = multiprocessing.get_context('spawn')
+        producer = context.Process(target=produce_records,
+                                   args=(ring, n_records))
+        producer.start()
+        records = bytearray()
+        while len(records) < 8*n_records:
+            records.extend(ring.pop_many(random.randint(1, 50)))
+        producer.join()
+        ring.close()
+        self.assertEqual(0, producer.exitcode)
+        self.assertEqual([item.to_bytes(8, 'little')
+                          for item in range(n_records)],
+                         [bytes(records[start:start + 8])
+                          for start in range(0, 8*n_records, 8)])
+
+
+class TestWorkStealingMethods(unittest.TestCase):
+
+    def test_deque_ok(self):
+        a = WorkStealingDeque(2)
+        for item in range(10):
+            a.push(item)
+        self.assertEqual(10, a.size())
+        self.assertEqual(9, a.pop())
+        self.assertEqual(0, a.steal())
+        self.assertEqual(1, a.steal())
+        self.assertEqual([8, 7, 6, 5, 4, 3, 2], [a.pop() for _ in range(7)])
+        self.assertTrue(a.is_empty())
+
+    def test_deque_raises(self):
+        a = WorkStealingDeque()
+        with self.assertRaises(ValueError):
+            a.pop()
+        with self.assertRaises(ValueError):
+            a.steal()
+        a.push(1)
+        a.pop()
+        with self.assertRaises(ValueError):
+            a.steal()
+
+    def test_deque_threads_ok(self):
+        a = WorkStealingDeque(4)
+        n_items = 20000
+        owner_items = []
+        stolen = [[] for _ in range(3)]
+        done = threading.Event()
+
+        def steal(items):
+            while not done.is_set() or not a.is_empty():
+                try:
+                    items.append(a.steal())
+                except ValueError:
+                    pass
+
+        thieves = [threading.Thread(target=steal, args=(items,))
+                   for items in stolen]
+        for thief in thieves:
+            thief.start()
+        for item in range(n_items):
+            a.push(item)
+            if item % 3 == 0:
+                try:
+                    owner_items.append(a.pop())
+                except ValueError:
+                    pass
+        done.set()
+        for thief in thieves:
+            thief.join()
+        taken = owner_items + [item for items in stolen for item in items]
+        self.assertEqual(list(range(n_items)), sorted(taken))
+
+    def test_pool_recursive_ok(self):
+        results = []
+
+        def split(lo, hi):
+            if hi - lo == 1:
+                results.append(lo)
+            else:
+                pool.submit(split, lo, (lo + hi) // 2)
+                pool.submit(split, (lo + hi) // 2, hi)
+
+        with WorkStealingPool(4) as pool:
+            pool.submit(split, 0, 1000)
+            pool.wait()
+            self.assertEqual(list(range(1000)), sorted(results))
+            results.clear()
+            pool.submit(split, 0, 10)
+        self.assertEqual(list(range(10)), sorted(results))
+
+    def test_pool_raises(self):
+        def fail():
+            raise KeyError('task')
+
+        pool = WorkStealingPool(2)
+        pool.submit(fail)
+        with self.assertRaises(KeyError):
+            pool.wait()
+        pool.wait()
+        pool.shutdown()
+        with self.assertRaises(ValueError):
+            pool.submit(fail)
+        with self.assertRaises(ValueError):
+            WorkStealingPool(0)
+
+
 if __name__ == '__main__':
-    from pystruct3.queue import LIFOQueue as Queue
+    from pystruct3.queue import FIFOQueue, LIFOQueue
+    Queue = FIFOQueue
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestQueueMethods))
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestFIFOQueueMethods))
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestLIFOQueueMethods))
+
+    from pystruct3.queue import PriorityQueue
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestPriorityQueueMethods))
+
+    from pystruct3.queue import BlockingQueue
+    Queue = BlockingQueue
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestQueueMethods))
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestBlockingQueueMethods))
+
+    from pystruct3.queue import AsyncQueue, AsyncPriorityQueue
+    Queue = AsyncQueue
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestQueueMethods))
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestAsyncQueueMethods))
+
+    from pystruct3.queue import SharedRingBuffer
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestSharedRingBufferMethods))
+
+    from pystruct3.queue import SpillQueue
+    Queue = functools.partial(SpillQueue, 2, 1)
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestQueueMethods))
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestSpillQueueMethods))
+
+    from pystruct3.queue import DelayQueue
+    Queue = DelayQueue
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestQueueMethods))
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestDelayQueueMethods))
+
+    from pystruct3.queue import MeteredQueue
+    Queue = lambda : MeteredQueue(FIFOQueue())
     unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestQueueMethods))
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestMeteredQueueMethods))
 
+    from pystruct3.queue import WorkStealingDeque, WorkStealingPool
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestWorkStealingMethods))
@@ -23,8 +23,10 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import functools
 import unittest
 import random
+import tracemalloc
 from pystruct3.stack import Stack
 
 class TestStackMethods(unittest.TestCase):
@@ -120,6 +122,9 @@ class TestStackMethods(unittest.TestCase):
         self.some_stack.clear()
         self.assertTrue(self.some_stack.is_empty())
 
+        self.some_stack.push(5)
+        self.assertEqual([5], list(self.some_stack))
+
     def test_equal_ok(self):
         a = Stack()
         self.assertEqual(a, self.empty_stack)
@@ -171,6 +176,127 @@ class TestStackMethods(unittest.TestCase):
         a.write(-1)
         self.assertNotEqual(a.peek(), self.some_stack.peek())
 
+class TestArrayStackMethods(unittest.TestCase):
+
+    def test_init_raises(self):
+        with self.assertRaises(ValueError):
+            ArrayStack(capacity=-1)
+        with self.assertRaises(ValueError):
+            ArrayStack('x')
+
+    def test_typed_ok(self):
+        a = ArrayStack('d')
+        a.push(1.5)
+        a.push(2)
+        self.assertEqual([2.0, 1.5], list(a))
+        with self.assertRaises(TypeError):
+            a.push('a')
+
+    def test_capacity_ok(self):
+        a = ArrayStack(capacity=4)
+        self.assertEqual(4, a.capacity())
+        for item in range(6):
+            a.push(item)
+        self.assertEqual(6, a.capacity())
+        self.assertEqual([5, 4, 3, 2], [a.pop() for _ in range(4)])
+        self.assertEqual(4, a.capacity())
+        self.assertFalse(3 in a)
+        self.assertTrue(1 in a)
+        self.assertEqual([1, 0], list(a.copy()))
+
+    def test_del_ok(self):
+        a = ArrayStack('d', 1000000)
+        tracemalloc.start()
+        del a
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self.assertLess(peak, 100000)
+
+    def test_linked_equal_ok(self):
+        a = ArrayStack('q', 2)
+        b = Stack()
+        for item in range(5):
+            a.push(item)
+            b.push(item)
+        self.assertEqual(a, b)
+        self.assertEqual(repr(b), repr(a))
+
+    def test_random_ok(self):
+        for a in (ArrayStack(), ArrayStack('q', 16)):
+            reference = []
+            for item in range(2000):
+                if reference and random.random() < 0.45:
+                    self.assertEqual(reference.pop(), a.pop())
+                else:
+                    a.push(item)
+                    reference.append(item)
+                self.assertEqual(len(reference), a.size())
+            self.assertEqual(reference[::-1], list(a))
+
+class TestPersistentStackMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.empty_stack = PersistentStack()
+        self.some_stack = self.empty_stack.push(3).push(1).push(2)
+
+    def test_push_pop_ok(self):
+        a = self.some_stack.push(4)
+        self.assertEqual([4, 2, 1, 3], list(a))
+        self.assertEqual([2, 1, 3], list(self.some_stack))
+        self.assertEqual(4, a.size())
+        self.assertEqual(3, self.some_stack.size())
+        b = self.some_stack.pop()
+        self.assertEqual([1, 3], list(b))
+        self.assertEqual(2, self.some_stack.peek())
+        self.assertEqual(0, self.empty_stack.size())
+        self.assertTrue(self.empty_stack.is_empty())
+
+    def test_pop_peek_raises(self):
+        with self.assertRaises(ValueError):
+            self.empty_stack.pop()
+        with self.assertRaises(ValueError):
+            self.empty_stack.peek()
+
+    def test_sharing_ok(self):
+        a = self.some_stack.copy()
+        self.assertEqual(a, self.some_stack)
+        self.assertIs(a._head, self.some_stack._head)
+        b = a.pop().push(5)
+        self.assertIs(b._head.next_node, self.some_stack._head.next_node)
+        self.assertNotEqual(b, self.some_stack)
+        self.assertEqual('[(5), 1, 3]', repr(b))
+
+    def test_contains_equal_ok(self):
+        self.assertTrue(1 in self.some_stack)
+        self.assertFalse(4 in self.some_stack)
+        linked_stack = Stack()
+        for item in (3, 1, 2):
+            linked_stack.push(item)
+        self.assertEqual(self.some_stack, linked_stack)
+        self.assertEqual(linked_stack, self.some_stack)
+
+    def test_random_ok(self):
+        versions = [(PersistentStack(), [])]
+        for item in range(2000):
+            stack, reference = random.choice(versions)
+            if reference and random.random() < 0.4:
+                versions.append((stack.pop(), reference[:-1]))
+            else:
+                versions.append((stack.push(item), reference + [item]))
+        for stack, reference in versions:
+            self.assertEqual(reference[::-1], list(stack))
+            self.assertEqual(len(reference), stack.size())
+
 
 if __name__ == '__main__':
     unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestStackMethods))
+
+    from pystruct3.stack import PersistentStack
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestPersistentStackMethods))
+
+    from pystruct3.stack import ArrayStack
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestArrayStackMethods))
+    Stack = ArrayStack
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestStackMethods))
+    Stack = functools.partial(ArrayStack, 'q', 2)
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestStackMethods))
@@ -24,6 +24,8 @@
 # SOFTWARE.
 
 
+import functools
+import itertools
 import random
 import unittest
 
@@ -52,7 +54,710 @@ class TestTreeMethods(unittest.TestCase):
 
             self.assertTrue(a.is_empty())
 
+    def test_heapify_ok(self):
+        a = Tree()
+        elements = [random.randint(1,100) for _ in range(200)]
+        a.heapify(elements)
+        self.assertTrue(a._is_heap())
+        self.assertEqual(a.size(), 200)
+        self.assertEqual(sorted(elements, reverse=True),
+                         [a.pop() for _ in range(200)])
+
+    def test_heapify_raises(self):
+        with self.assertRaises(ValueError):
+            self.empty_tree.heapify((1, 2, 3))
+
+    def test_push_many_ok(self):
+        self.some_tree.push_many([1, 7])
+        self.assertTrue(self.some_tree._is_heap())
+        self.some_tree.push_many(range(20))
+        self.assertTrue(self.some_tree._is_heap())
+        self.assertEqual(self.some_tree.size(), 25)
+        self.assertEqual(self.some_tree.peek(), 19)
+
+    def test_replace_ok(self):
+        self.assertEqual(self.some_tree.replace(3), 5)
+        self.assertTrue(self.some_tree._is_heap())
+        self.assertEqual(self.some_tree.pop(), 4)
+        self.assertEqual(self.some_tree.pop(), 3)
+
+    def test_replace_raises(self):
+        with self.assertRaises(ValueError):
+            self.empty_tree.replace(1)
+
+    def test_contains_ok(self):
+        self.assertTrue(5 in self.some_tree)
+        self.some_tree.pop()
+        self.assertFalse(5 in self.some_tree)
+        self.assertFalse(None in self.some_tree)
+
+    def test_iter_ok(self):
+        self.assertEqual(list(self.empty_tree), [])
+        self.assertEqual(list(self.some_tree), [5, 4, 2])
+        elements = [random.randint(1,100) for _ in range(100)]
+        self.empty_tree.heapify(elements)
+        self.assertEqual(list(self.empty_tree), sorted(elements, reverse=True))
+        self.assertEqual(self.empty_tree.size(), 100)
+
+    def test_copy_ok(self):
+        a = self.some_tree.copy()
+        a.pop()
+        self.assertEqual(self.some_tree.size(), 3)
+        self.assertEqual(self.some_tree.peek(), 5)
+
+    def test_merge_ok(self):
+        a = Tree()
+        a.push_many([1, 6, 3])
+        self.some_tree.merge(a)
+        self.assertTrue(self.some_tree._is_heap())
+        self.assertEqual(list(self.some_tree), [6, 5, 4, 3, 2, 1])
+        self.some_tree.merge(self.empty_tree)
+        self.assertEqual(self.some_tree.size(), 6)
+
+    def test_add_ok(self):
+        a = self.some_tree + self.unit_tree
+        self.assertEqual(list(a), [5, 4, 2, 2])
+        self.assertEqual(self.some_tree.size(), 3)
+        self.assertEqual(self.unit_tree.size(), 1)
+
+
+class TestPairingHeapMethods(unittest.TestCase):
+
+    def test_merge_ok(self):
+        heaps = [PairingHeap() for _ in range(20)]
+        elements = []
+        for heap in heaps:
+            for _ in range(30):
+                element = random.randint(1,100)
+                heap.push(element)
+                elements.append(element)
+
+        a = PairingHeap()
+        for heap in heaps:
+            a.merge(heap)
+            self.assertTrue(heap.is_empty())
+        self.assertTrue(a._is_heap())
+        self.assertEqual(a.size(), 600)
+        self.assertEqual(sorted(elements, reverse=True),
+                         [a.pop() for _ in range(600)])
+
+    def test_decrease_key_ok(self):
+        a = PairingHeap(lambda x1,x2 : x1 <= x2)
+        nodes = [a.push(i) for i in range(100)]
+        for _ in range(20):
+            a.pop()
+        for node in nodes[50:]:
+            a.decrease_key(node, node.vertice - 50)
+            self.assertTrue(a._is_heap())
+        a.decrease_key(nodes[20], -1)
+        self.assertEqual(a.pop(), -1)
+        self.assertEqual(a.size(), 79)
+        elements = [a.pop() for _ in range(79)]
+        self.assertEqual(elements, sorted(elements))
+
+    def test_decrease_key_raises(self):
+        a = PairingHeap()
+        node = a.push(5)
+        with self.assertRaises(ValueError):
+            a.decrease_key(node, 4)
+        other_node = a.push(3)
+        a.pop()
+        with self.assertRaises(ValueError):
+            a.decrease_key(node, 6)
+        self.assertEqual(1, a.size())
+        self.assertEqual(3, a.peek())
+        a.decrease_key(other_node, 7)
+        self.assertEqual(7, a.pop())
+        node = a.push(3)
+        a.push(5)
+        a.clear()
+        with self.assertRaises(ValueError):
+            a.decrease_key(node, 10)
+        a.push(1)
+        with self.assertRaises(ValueError):
+            a.decrease_key(node, 10)
+        self.assertEqual(1, a.pop())
+        self.assertTrue(a.is_empty())
+        node = a.push(2)
+        a.heapify([4, 6])
+        with self.assertRaises(ValueError):
+            a.decrease_key(node, 10)
+        self.assertEqual([6, 4], [a.pop(), a.pop()])
+
+
+
+class TestSearchTreeMethods(unittest.TestCase):
+
+    def setUp(self):
+        # {}
+        self.empty_tree = SearchTree()
+
+        # {2: 'b', 4: 'd', 5: 'e'}
+        self.some_tree = SearchTree()
+        self.some_tree.insert(4, 'd')
+        self.some_tree.insert(5, 'e')
+        self.some_tree.insert(2, 'b')
+
+    def test_insert_delete_ok(self):
+        a = SearchTree()
+        reference = {}
+        for i in range(5000):
+            key = random.randint(1,500)
+            if random.random() < 0.6:
+                a.insert(key, i)
+                reference[key] = i
+            elif key in reference:
+                a.delete(key)
+                del reference[key]
+            if i % 100 == 0:
+                self.assertTrue(a._is_balanced())
+        self.assertTrue(a._is_balanced())
+        self.assertEqual(list(a.items()), sorted(reference.items()))
+        self.assertEqual(a.size(), len(reference))
+
+    def test_insert_sorted_ok(self):
+        a = SearchTree()
+        for key in range(1000):
+            a.insert(key)
+        self.assertTrue(a._is_balanced())
+        for key in range(0, 1000, 2):
+            a.delete(key)
+        self.assertTrue(a._is_balanced())
+        self.assertEqual(list(a), list(range(1, 1000, 2)))
+
+    def test_insert_replace_ok(self):
+        self.some_tree.insert(4, 'x')
+        self.assertEqual(self.some_tree.size(), 3)
+        self.assertEqual(self.some_tree.search(4), 'x')
+        self.some_tree[6] = 'f'
+        self.assertEqual(self.some_tree[6], 'f')
+
+    def test_delete_raises(self):
+        with self.assertRaises(ValueError):
+            self.empty_tree.delete(1)
+        with self.assertRaises(ValueError):
+            self.some_tree.delete(3)
+
+    def test_search_ok(self):
+        self.assertEqual(self.some_tree.search(2), 'b')
+        self.assertEqual(self.some_tree[5], 'e')
+        self.assertTrue(4 in self.some_tree)
+        self.assertFalse(3 in self.some_tree)
+        self.assertFalse(self.empty_tree.contains(3))
+
+    def test_search_raises(self):
+        with self.assertRaises(ValueError):
+            self.empty_tree.search(1)
+        with self.assertRaises(ValueError):
+            self.some_tree[3]
+
+    def test_floor_ceiling_ok(self):
+        self.assertEqual(self.some_tree.floor(3), 2)
+        self.assertEqual(self.some_tree.floor(4), 4)
+        self.assertEqual(self.some_tree.floor(10), 5)
+        self.assertEqual(self.some_tree.ceiling(3), 4)
+        self.assertEqual(self.some_tree.ceiling(5), 5)
+        self.assertEqual(self.some_tree.ceiling(0), 2)
+
+    def test_floor_ceiling_raises(self):
+        with self.assertRaises(ValueError):
+            self.empty_tree.floor(1)
+        with self.assertRaises(ValueError):
+            self.some_tree.floor(1)
+        with self.assertRaises(ValueError):
+            self.some_tree.ceiling(6)
+
+    def test_items_range_ok(self):
+        self.assertEqual(list(self.empty_tree.items(1, 3)), [])
+        self.assertEqual(list(self.some_tree.items(3, 5)),
+                         [(4, 'd'), (5, 'e')])
+        self.assertEqual(list(self.some_tree.items(2, 4)),
+                         [(2, 'b'), (4, 'd')])
+        self.assertEqual(list(self.some_tree.items(lo=5)), [(5, 'e')])
+        self.assertEqual(list(self.some_tree.items(hi=1)), [])
+        self.assertEqual(list(self.some_tree.items(6, 1)), [])
+
+        a = SearchTree()
+        keys = random.sample(range(1000), 300)
+        for key in keys:
+            a.insert(key)
+        expected = [key for key in sorted(keys) if 250 <= key <= 750]
+        self.assertEqual([key for key,_ in a.items(250, 750)], expected)
+
+    def test_clear_ok(self):
+        self.some_tree.clear()
+        self.assertTrue(self.some_tree.is_empty())
+        self.assertEqual(len(self.some_tree), 0)
+
+    def test_copy_ok(self):
+        a = self.some_tree.copy()
+        self.assertEqual(a, self.some_tree)
+        a.delete(4)
+        self.assertNotEqual(a, self.some_tree)
+        self.assertTrue(4 in self.some_tree)
+        self.assertTrue(a._is_balanced())
+
+    def test_repr_ok(self):
+        self.assertEqual(repr(self.empty_tree), '{}')
+        self.assertEqual(repr(self.some_tree), '{2: b, 4: d, 5: e}')
+
+
+class TestOrderStatisticTreeMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.some_tree = SearchTree()
+        for key in [40, 10, 30, 20, 50]:
+            self.some_tree.insert(key)
+
+    def test_rank_ok(self):
+        self.assertEqual(self.some_tree.rank(5), 0)
+        self.assertEqual(self.some_tree.rank(10), 0)
+        self.assertEqual(self.some_tree.rank(30), 2)
+        self.assertEqual(self.some_tree.rank(35), 3)
+        self.assertEqual(self.some_tree.rank(60), 5)
+
+    def test_select_ok(self):
+        self.assertEqual(self.some_tree.select(0), 10)
+        self.assertEqual(self.some_tree.select(2), 30)
+        self.assertEqual(self.some_tree.select(4), 50)
+        self.assertEqual(self.some_tree.select(-1), 50)
+
+    def test_select_raises(self):
+        with self.assertRaises(ValueError):
+            self.some_tree.select(5)
+        with self.assertRaises(ValueError):
+            self.some_tree.select(-6)
+
+    def test_count_range_ok(self):
+        self.assertEqual(self.some_tree.count_range(10, 50), 5)
+        self.assertEqual(self.some_tree.count_range(15, 45), 3)
+        self.assertEqual(self.some_tree.count_range(20, 20), 1)
+        self.assertEqual(self.some_tree.count_range(21, 29), 0)
+        self.assertEqual(self.some_tree.count_range(50, 10), 0)
+        self.assertEqual(SearchTree().count_range(0, 1), 0)
+
+    def test_rank_select_random_ok(self):
+        a = SearchTree()
+        keys = random.sample(range(10000), 1000)
+        for key in keys:
+            a.insert(key)
+        for key in keys[:500]:
+            a.delete(key)
+        keys = sorted(keys[500:])
+        for index,key in enumerate(keys):
+            self.assertEqual(a.select(index), key)
+            self.assertEqual(a.rank(key), index)
+        for _ in range(100):
+            lo = random.randint(0, 10000)
+            hi = random.randint(lo, 10000)
+            self.assertEqual(a.count_range(lo, hi),
+                             len([key for key in keys if lo <= key <= hi]))
+
+
+class TestFromSortedTreeMethods(unittest.TestCase):
+
+    def test_from_sorted_ok(self):
+        for n in range(100):
+            a = SearchTree.from_sorted((i, -i) for i in range(n))
+            self.assertTrue(a._is_balanced())
+            self.assertEqual(a.size(), n)
+            if n > 0:
+                self.assertEqual(a.select(n // 2), n // 2)
+            self.assertEqual(list(a.items()), [(i, -i) for i in range(n)])
+
+        a = SearchTree.from_sorted((i, None) for i in range(0, 1000, 2))
+        for key in range(1, 1000, 2):
+            a.insert(key)
+        for key in range(0, 1000, 3):
+            a.delete(key)
+        self.assertTrue(a._is_balanced())
+        self.assertEqual(list(a), [i for i in range(1000) if i % 3 != 0])
+
+    def test_from_sorted_raises(self):
+        with self.assertRaises(ValueError):
+            SearchTree.from_sorted([(1, None), (3, None), (2, None)])
+        with self.assertRaises(ValueError):
+            SearchTree.from_sorted([(1, None), (1, None)])
+
+
+class TestBPlusTreeMethods(unittest.TestCase):
+
+    def test_fanout_raises(self):
+        with self.assertRaises(ValueError):
+            BPlusTree(2)
+
+    def test_typecode_ok(self):
+        a = BPlusTree(8, 'd')
+        keys = [random.random() for _ in range(1000)]
+        for key in keys:
+            a.insert(key, -key)
+        self.assertTrue(a._is_balanced())
+        self.assertEqual(list(a), sorted(keys))
+        self.assertEqual(a.search(keys[10]), -keys[10])
+        for key in keys[::2]:
+            a.delete(key)
+        self.assertTrue(a._is_balanced())
+        self.assertEqual(list(a), sorted(keys[1::2]))
+        with self.assertRaises(TypeError):
+            a.insert('a')
+
+    def test_floor_ceiling_across_leaves_ok(self):
+        a = BPlusTree(4)
+        for key in range(0, 1000, 10):
+            a.insert(key)
+        for key in range(1, 990):
+            self.assertEqual(a.floor(key), key - key % 10)
+            self.assertEqual(a.ceiling(key), key + (-key) % 10)
+
+
+class TestIntervalTreeMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.some_tree = IntervalTree()
+        self.some_tree.insert((1, 3), 'a')
+        self.some_tree.insert((2, 8), 'b')
+        self.some_tree.insert((5, 6), 'c')
+        self.some_tree.insert((9, 12), 'd')
+
+    def test_overlap_ok(self):
+        self.assertEqual([value for _,value in self.some_tree.overlap(3, 5)],
+                         ['a', 'b', 'c'])
+        self.assertEqual([value for _,value in self.some_tree.overlap(7, 9)],
+                         ['b', 'd'])
+        self.assertEqual(list(self.some_tree.overlap(13, 20)), [])
+        self.assertEqual(list(self.some_tree.stab(12)), [((9, 12), 'd')])
+        self.assertEqual(list(IntervalTree().overlap(0, 1)), [])
+
+    def test_overlap_random_ok(self):
+        a = IntervalTree()
+        intervals = set()
+        for _ in range(1000):
+            start = random.randint(0, 1000)
+            interval = (start, start + random.randint(0, 50))
+            a.insert(interval)
+            intervals.add(interval)
+        for interval in random.sample(sorted(intervals), 300):
+            a.delete(interval)
+            intervals.remove(interval)
+        self.assertTrue(a._is_balanced())
+
+        for _ in range(100):
+            lo = random.randint(0, 1100)
+            hi = lo + random.randint(0, 30)
+            expected = sorted(interval for interval in intervals
+                              if interval[0] <= hi and lo <= interval[1])
+            self.assertEqual([interval for interval,_ in a.overlap(lo, hi)],
+                             expected)
+
+    def test_insert_raises(self):
+        with self.assertRaises(ValueError):
+            self.some_tree.insert((3, 1))
+
+    def test_from_intervals_ok(self):
+        a = IntervalTree.from_intervals([(9, 12), (1, 3), (5, 6), (2, 8)],
+                                        ['d', 'a', 'c', 'b'])
+        self.assertTrue(a._is_balanced())
+        self.assertEqual(a, self.some_tree)
+        with self.assertRaises(ValueError):
+            IntervalTree.from_intervals([(1, 0)])
+
+
+class TestSegmentTreeMethods(unittest.TestCase):
+
+    def test_query_ok(self):
+        elements = [random.randint(-100, 100) for _ in range(100)]
+        for operation,function in [(None, sum), (min, min), (max, max)]:
+            a = SegmentTree(elements, operation)
+            for _ in range(200):
+                start = random.randint(0, 99)
+                stop = random.randint(start + 1, 100)
+                self.assertEqual(a.query(start, stop),
+                                 function(elements[start:stop]))
+
+    def test_query_not_commutative_ok(self):
+        a = SegmentTree(['a', 'b', 'c', 'd', 'e'])
+        self.assertEqual(a.query(0, 5), 'abcde')
+        self.assertEqual(a.query(1, 4), 'bcd')
+        self.assertEqual(a.query(3, 4), 'd')
+
+    def test_query_raises(self):
+        a = SegmentTree([1, 2, 3])
+        with self.assertRaises(ValueError):
+            a.query(1, 1)
+        with self.assertRaises(ValueError):
+            a.query(-1, 2)
+        with self.assertRaises(ValueError):
+            a.query(0, 4)
+
+    def test_write_ok(self):
+        elements = [random.randint(-100, 100) for _ in range(37)]
+        a = SegmentTree(elements, min)
+        for _ in range(100):
+            index = random.randint(0, 36)
+            elements[index] = random.randint(-100, 100)
+            a[index] = elements[index]
+            start = random.randint(0, 36)
+            self.assertEqual(a.query(start, 37), min(elements[start:]))
+        self.assertEqual(list(a), elements)
+        self.assertEqual(a[-1], elements[-1])
+
+    def test_write_raises(self):
+        a = SegmentTree([1, 2, 3])
+        with self.assertRaises(ValueError):
+            a.write(0, 3)
+        with self.assertRaises(ValueError):
+            a.read(-4)
+
+
+class TestRadixTreeMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.empty_tree = RadixTree()
+
+        self.some_tree = RadixTree()
+        for value,key in enumerate(['tea', 'ten', 'team', 'to', 'i', 'in']):
+            self.some_tree.insert(key, value)
+
+    def random_keys(self, n):
+        return list(set(''.join(random.choice('abc')
+                                for _ in range(random.randint(0, 8)))
+                        for _ in range(n)))
+
+    def test_insert_delete_ok(self):
+        a = RadixTree()
+        keys = self.random_keys(2000)
+        for key in keys:
+            a.insert(key, len(key))
+        self.assertTrue(a._is_compressed())
+        self.assertEqual(list(a), sorted(keys))
+
+        random.shuffle(keys)
+        for key in keys[:len(keys) // 2]:
+            a.delete(key)
+            self.assertTrue(a._is_compressed())
+        self.assertEqual(list(a), sorted(keys[len(keys) // 2:]))
+        self.assertEqual(a.size(), len(keys) - len(keys) // 2)
+        for key in keys[len(keys) // 2:]:
+            self.assertEqual(a[key], len(key))
+
+    def test_insert_replace_ok(self):
+        self.some_tree.insert('tea', 'x')
+        self.assertEqual(self.some_tree.size(), 6)
+        self.assertEqual(self.some_tree.search('tea'), 'x')
+
+    def test_delete_raises(self):
+        with self.assertRaises(ValueError):
+            self.empty_tree.delete('a')
+        with self.assertRaises(ValueError):
+            self.some_tree.delete('te')
+        with self.assertRaises(ValueError):
+            self.some_tree.delete('teams')
+
+    def test_search_ok(self):
+        self.assertEqual(self.some_tree.search('team'), 2)
+        self.assertTrue('in' in self.some_tree)
+        self.assertFalse('t' in self.some_tree)
+        self.assertFalse('tex' in self.some_tree)
+        self.assertFalse(self.empty_tree.contains(''))
+        with self.assertRaises(ValueError):
+            self.some_tree['te']
+
+    def test_longest_prefix_ok(self):
+        self.assertEqual(self.some_tree.longest_prefix('teams'), ('team', 2))
+        self.assertEqual(self.some_tree.longest_prefix('teapot'), ('tea', 0))
+        self.assertEqual(self.some_tree.longest_prefix('inn'), ('in', 5))
+        with self.assertRaises(ValueError):
+            self.some_tree.longest_prefix('te')
+        self.some_tree.insert('')
+        self.assertEqual(self.some_tree.longest_prefix('te'), ('', None))
+
+        keys = self.random_keys(500)
+        a = RadixTree()
+        for key in keys:
+            a.insert(key)
+        for _ in range(100):
+            query = ''.join(random.choice('abc') for _ in range(10))
+            expected = max((key for key in keys if query.startswith(key)),
+                           key=len)
+            self.assertEqual(a.longest_prefix(query)[0], expected)
+
+    def test_items_prefix_ok(self):
+        self.assertEqual([key for key,_ in self.some_tree.items('te')],
+                         ['tea', 'team', 'ten'])
+        self.assertEqual([key for key,_ in self.some_tree.items('tea')],
+                         ['tea', 'team'])
+        self.assertEqual(list(self.some_tree.items('tex')), [])
+        self.assertEqual(list(self.some_tree.items('teamwork')), [])
+        self.assertEqual(list(self.some_tree),
+                         ['i', 'in', 'tea', 'team', 'ten', 'to'])
+
+        keys = self.random_keys(1000)
+        a = RadixTree()
+        for key in keys:
+            a.insert(key)
+        for prefix in ['', 'a', 'ab', 'bca', 'ccc', 'abcabcab']:
+            self.assertEqual([key for key,_ in a.items(prefix)],
+                             sorted(key for key in keys
+                                    if key.startswith(prefix)))
+
+class TestStreamingMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.items = [random.randint(0,50) for _ in range(1000)]
+        self.pairs = [(random.randint(0,10), i) for i in range(1000)]
+
+    def test_nlargest_ok(self):
+        for k in [0, 1, 10, 1000, 2000]:
+            self.assertEqual(nlargest(k, self.items),
+                             sorted(self.items, reverse=True)[:k])
+            self.assertEqual(nlargest(k, iter(self.items)),
+                             sorted(self.items, reverse=True)[:k])
+        self.assertEqual(nlargest(-1, self.items), [])
+        self.assertEqual(nlargest(3, []), [])
+
+    def test_nsmallest_ok(self):
+        for k in [0, 1, 10, 1000, 2000]:
+            self.assertEqual(nsmallest(k, self.items), sorted(self.items)[:k])
+            self.assertEqual(nsmallest(k, iter(self.items)),
+                             sorted(self.items)[:k])
+
+    def test_key_stable_ok(self):
+        key = lambda pair : pair[0]
+        for k in [1, 10, 100]:
+            self.assertEqual(nlargest(k, self.pairs, key),
+                             sorted(self.pairs, key=key, reverse=True)[:k])
+            self.assertEqual(nsmallest(k, self.pairs, key),
+                             sorted(self.pairs, key=key)[:k])
+
+    def test_merge_ok(self):
+        shards = [sorted(random.randint(0,100)
+                         for _ in range(random.randint(0,50)))
+                  for _ in range(20)]
+        self.assertEqual(list(merge(*shards)),
+                         sorted(item for shard in shards for item in shard))
+        self.assertEqual(list(merge()), [])
+        self.assertEqual(list(merge([], [1, 2], [])), [1, 2])
+
+    def test_merge_key_stable_ok(self):
+        key = lambda pair : pair[0]
+        shards = [sorted(((random.randint(0,10), j) for j in range(30)),
+                         key=key) for _ in range(10)]
+        shards = [[(value, j, i) for value,j in shard]
+                  for i,shard in enumerate(shards)]
+        self.assertEqual(list(merge(*shards, key=key)),
+                         sorted((item for shard in shards for item in shard),
+                                key=lambda item : (item[0], item[2])))
+
+    def test_merge_lazy_ok(self):
+        evens = itertools.count(0, 2)
+        odds = itertools.count(1, 2)
+        self.assertEqual(list(itertools.islice(merge(evens, odds), 10)),
+                         list(range(10)))
+
+
+class TestEytzingerTreeMethods(unittest.TestCase):
+
+    def setUp(self):
+        # {}
+        self.empty_tree = EytzingerTree([])
+
+        # {2: 'b', 4: 'd', 5: 'e'}
+        self.some_tree = EytzingerTree([4, 2, 5], ['d', 'b', 'e'])
+
+    def test_init_raises(self):
+        with self.assertRaises(ValueError):
+            EytzingerTree([1, 2, 1])
+        with self.assertRaises(ValueError):
+            EytzingerTree([1, 2], ['a'])
+
+    def test_search_ok(self):
+        self.assertEqual(self.some_tree.search(2), 'b')
+        self.assertEqual(self.some_tree[5], 'e')
+        self.assertTrue(4 in self.some_tree)
+        self.assertFalse(3 in self.some_tree)
+        self.assertFalse(6 in self.some_tree)
+        self.assertFalse(1 in self.empty_tree)
+
+    def test_search_raises(self):
+        with self.assertRaises(ValueError):
+            self.empty_tree.search(1)
+        with self.assertRaises(ValueError):
+            self.some_tree.search(3)
+
+    def test_ceiling_ok(self):
+        self.assertEqual(self.some_tree.ceiling(1), 2)
+        self.assertEqual(self.some_tree.ceiling(3), 4)
+        self.assertEqual(self.some_tree.ceiling(5), 5)
+        with self.assertRaises(ValueError):
+            self.some_tree.ceiling(6)
+
+    def test_random_ok(self):
+        for n_keys in [1, 2, 3, 7, 8, 100, 1000]:
+            keys = random.sample(range(4*n_keys), n_keys)
+            queries = list(range(-1, 4*n_keys + 1))
+            expected = [2*query if query in keys else None
+                        for query in queries]
+            for typecode in [None, 'q']:
+                tree = EytzingerTree(keys, [2*key for key in keys], typecode)
+                self.assertEqual(list(tree), sorted(keys))
+                self.assertEqual(tree.search_many(queries), expected)
+                self.assertEqual(tree.search_many(iter(queries)), expected)
+                for query in queries:
+                    self.assertEqual(query in tree, query in keys)
+
+    def test_search_many_ok(self):
+        self.assertEqual(self.some_tree.search_many([5, 3, 2], 'x'),
+                         ['e', 'x', 'b'])
+        self.assertEqual(self.empty_tree.search_many([1]), [None])
+        tree = EytzingerTree([1, 2, 3], typecode='d')
+        self.assertEqual(tree.search_many([2.0, 2.5], False), [None, False])
+
+    def test_repr_eq_ok(self):
+        self.assertEqual(repr(self.some_tree), '{2: b, 4: d, 5: e}')
+        self.assertEqual(repr(self.empty_tree), '{}')
+        self.assertEqual(self.some_tree,
+                         EytzingerTree([2, 4, 5], ['b', 'd', 'e'], None))
+        self.assertNotEqual(self.some_tree, self.empty_tree)
+
 
 if __name__ == '__main__':
     from pystruct3.tree import Heap as Tree
     unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestTreeMethods))
+
+    from pystruct3.tree import PairingHeap as Tree
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestTreeMethods))
+
+    from pystruct3.tree import PairingHeap
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestPairingHeapMethods))
+
+    from pystruct3.tree import AVLTree as SearchTree
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestSearchTreeMethods))
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestOrderStatisticTreeMethods))
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestFromSortedTreeMethods))
+
+    from pystruct3.tree import RedBlackTree as SearchTree
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestSearchTreeMethods))
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestOrderStatisticTreeMethods))
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestFromSortedTreeMethods))
+
+    from pystruct3.tree import BPlusTree
+    SearchTree = functools.partial(BPlusTree, 4)
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestSearchTreeMethods))
+    SearchTree = functools.partial(BPlusTree, 5, 'q')
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestSearchTreeMethods))
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestBPlusTreeMethods))
+
+    from pystruct3.tree import IntervalTree
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestIntervalTreeMethods))
+
+    from pystruct3.tree import SegmentTree
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestSegmentTreeMethods))
+
+    from pystruct3.tree import RadixTree
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestRadixTreeMethods))
+
+    from pystruct3.tree import nlargest, nsmallest, merge
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestStreamingMethods))
+
+    from pystruct3.tree import EytzingerTree
+    unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestEytzingerTreeMethods))
@@ -25,6 +25,15 @@
 """
 """
 
+import array as _array
+import bisect as _bisect
+import operator as _operator
+
+try:
+    import numpy as _numpy
+except ImportError:
+    _numpy = None
+
 class Tree(object):
     """A tree is a directed graph in which: 1. any two vertices are
        connected by exactly one path, 2. there is a node call the source, and
@@ -43,7 +52,7 @@ class Heap(Tree):
         self._capacity = 1
         self._n_vertices = 0
         if compare is None:
-            self._compare = lambda x1,x2 : x1 >= x2
+            self._compare = _operator.ge
         else:
             self._compare = compare
 
@@ -61,8 +70,30 @@ class Heap(Tree):
         """
         self._augment_capacity_if_needed()
         self._vertices[self._n_vertices + 1] = vertice
-        self._shift_up(self._n_vertices + 1)
         self._n_vertices = self._n_vertices + 1
+        self._shift_up(self._n_vertices)
+
+    def push_many(self, vertices):
+        """Insert several vertices in the heap.
+
+        When the batch is large compared to the heap, the heap is rebuilt
+        in linear time instead of shifting up each vertice.
+
+        Args:
+            vertices (iterable (object)): The vertices to insert.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        vertices = list(vertices)
+        if len(vertices) < self._n_vertices:
+            for vertice in vertices:
+                self.push(vertice)
+        else:
+            self.heapify(self._vertices[1:self._n_vertices + 1] + vertices)
 
     def clear(self):
         """Remove all vertices from the heap.
@@ -112,11 +143,13 @@ class Heap(Tree):
         if self._n_vertices == 0:
             raise ValueError('The heap is empty.')
         root = self._vertices[1]
-        self._vertices[1], self._vertices[self._n_vertices] = (
-            self._vertices[self._n_vertices], self._vertices[1])
+        last = self._vertices[self._n_vertices]
+        self._vertices[self._n_vertices] = None
 
         self._n_vertices = self._n_vertices - 1
-        self._shift_down(1)
+        if self._n_vertices > 0:
+            self._vertices[1] = last
+            self._shift_down(1)
         self._reduce_capacity_if_needed()
 
         return root
@@ -142,55 +175,40 @@ class Heap(Tree):
            satisfied. The index is with respect to the internal vertices
            array.
         """
+        vertices = self._vertices
+        compare = self._compare
         index = start_index
-        if index == 1:
-            return
-        parent = index // 2
-        heap_condition = self._compare(self._vertices[parent],
-                                       self._vertices[index])
-        while not heap_condition:
-            self._vertices[index], self._vertices[parent] = (
-               self._vertices[parent], self._vertices[index])
-
-            index = parent
-            if index == 1:
-                return
+        vertice = vertices[index]
+        while index > 1:
             parent = index // 2
-            heap_condition = self._compare(self._vertices[parent],
-                                           self._vertices[index])
+            if compare(vertices[parent], vertice):
+                break
+            vertices[index] = vertices[parent]
+            index = parent
+        vertices[index] = vertice
+
     def _shift_down(self, start_index):
         """Shift down a vertice at a start_index until the heap property is
            satisfied. The index is with respect to the internal vertices
            array.
         """
+        vertices = self._vertices
+        compare = self._compare
+        n_vertices = self._n_vertices
         index = start_index
-        swap_index = index
-        left_index = 2*index
-        right_index = 2*index + 1
-
-        not_finished = True
-        while not_finished:
-            if left_index <= self._n_vertices:
-                swap_index = left_index
-
-                if ( (right_index <= self._n_vertices) and
-                     (not self._compare(self._vertices[left_index],
-                                       self._vertices[right_index])) ):
-                    swap_index = right_index
-
-            if swap_index == index:
-                not_finished = False
-            else:
-                if self._compare(self._vertices[index],
-                                 self._vertices[swap_index]):
-                    not_finished = False
-                else:
-                    self._vertices[index], self._vertices[swap_index] = (
-                    self._vertices[swap_index], self._vertices[index])
-
-            index = swap_index
-            left_index = 2*index
-            right_index = 2*index + 1
+        vertice = vertices[index]
+        child_index = 2*index
+        while child_index <= n_vertices:
+            if ( (child_index < n_vertices) and
+                 (not compare(vertices[child_index],
+                              vertices[child_index + 1])) ):
+                child_index = child_index + 1
+            if compare(vertice, vertices[child_index]):
+                break
+            vertices[index] = vertices[child_index]
+            index = child_index
+            child_index = 2*index
+        vertices[index] = vertice
 
     def _is_heap(self):
         for i in range(self._n_vertices):
@@ -221,7 +239,12 @@ class Heap(Tree):
         Raises:
             ValueError: An error occurs when the heap is empty.
         """
-        pass
+        if self._n_vertices == 0:
+            raise ValueError('The heap is empty.')
+        root = self._vertices[1]
+        self._vertices[1] = vertice
+        self._shift_down(1)
+        return root
 
     def heapify(self, elements):
         """Create a heap out of elements.
@@ -236,7 +259,13 @@ class Heap(Tree):
         Raises:
             ValueError: An error occurs when elements is not a list.
         """
-        pass
+        if not isinstance(elements, list):
+            raise ValueError('Argument elements must be a python list.')
+        self._vertices = [None] + elements
+        self._n_vertices = len(elements)
+        self._capacity = len(self._vertices)
+        for index in range(self._n_vertices // 2, 0, -1):
+            self._shift_down(index)
 
     def is_empty(self):
         """Verify if the heap contains vertices.
@@ -282,13 +311,33 @@ class Heap(Tree):
         Raises:
             Nothing.
         """
-        return vertice in self._vertices
+        return vertice in self._vertices[1:self._n_vertices + 1]
+
+    def copy(self):
+        """Copy of the heap.
+
+        The vertices themselves are not copied.
+
+        Args:
+            Nothing.
+
+        Returns:
+            Heap: A copy of the heap.
+
+        Raises:
+            Nothing.
+        """
+        copy_heap = self.__class__(self._compare)
+        copy_heap._vertices = self._vertices[:]
+        copy_heap._capacity = self._capacity
+        copy_heap._n_vertices = self._n_vertices
+        return copy_heap
 
     def merge(self, other_heap):
         """Join other_heap to the current one.
 
         Args:
-            other_heap (Heap): The heap to join.
+            other_heap (Heap): The heap to join. It is not modified.
 
         Returns:
             Nothing.
@@ -296,7 +345,7 @@ class Heap(Tree):
         Raises:
             Nothing
         """
-        pass
+        self.push_many(other_heap._vertices[1:other_heap._n_vertices + 1])
 
     def __contains__(self, vertice):
         return self.contains(vertice)
@@ -304,6 +353,27 @@ class Heap(Tree):
     def __len__(self):
         return self._n_vertices
 
+    def __iter__(self):
+        """Iterate over the vertices in the order they would be popped.
+
+        The heap is not modified: the next vertice is always a child of an
+        already visited one, so a small frontier heap of indices is enough.
+        """
+        vertices = self._vertices
+        n_vertices = self._n_vertices
+        compare = self._compare
+        if n_vertices == 0:
+            return
+        frontier = Heap(lambda i1,i2 : compare(vertices[i1], vertices[i2]))
+        frontier.push(1)
+        while not frontier.is_empty():
+            index = frontier.pop()
+            yield vertices[index]
+            if 2*index <= n_vertices:
+                frontier.push(2*index)
+            if 2*index + 1 <= n_vertices:
+                frontier.push(2*index + 1)
+
     def __repr__(self):
         items = ['[']
         for i in range(1, self._n_vertices + 1):
@@ -315,22 +385,2978 @@ class Heap(Tree):
         return ''.join(items)
 
     def __add__(self, other_heap):
-        new_heap = self.__class__()
+        new_heap = self.__class__(self._compare)
         new_heap.merge(self)
         new_heap.merge(other_heap)
         return new_heap
 
 
-class AVLTree(Tree):
-    """Self-balancing tree based on AVL.
+def nlargest(k, iterable, key=None):
+    """Find the k largest items of an iterable.
+
+    The iterable is consumed once and at most k items are kept in memory,
+    in a heap whose root is the smallest kept item. An item only enters the
+    heap when it beats that root.
+
+    Args:
+        k (int): Number of items to find.
+        iterable (iterable (object)): Items to search.
+        key (Optional[function]): Function of one item that returns the
+            value to compare. Defaults to the item itself.
+
+    Returns:
+        python list: The k largest items, largest first. Items that compare
+            equal keep their order in the iterable.
+
+    Raises:
+        Nothing.
     """
-    def __init__(self):
-        Tree.__init__(self)
+    return [entry[2] for entry in reversed(_select_k(k, iterable, key, True))]
 
+def nsmallest(k, iterable, key=None):
+    """Find the k smallest items of an iterable.
 
-class RedBlackTree(Tree):
-    """Self-balancing tree based on red-black.
+    The iterable is consumed once and at most k items are kept in memory,
+    in a heap whose root is the largest kept item. An item only enters the
+    heap when it beats that root.
+
+    Args:
+        k (int): Number of items to find.
+        iterable (iterable (object)): Items to search.
+        key (Optional[function]): Function of one item that returns the
+            value to compare. Defaults to the item itself.
+
+    Returns:
+        python list: The k smallest items, smallest first. Items that
+            compare equal keep their order in the iterable.
+
+    Raises:
+        Nothing.
     """
-    def __init__(self):
+    return [entry[2] for entry in _select_k(k, iterable, key, False)]
+
+def _select_k(k, iterable, key, largest):
+    """Keep the k largest (or smallest) items of an iterable as (value,
+       order, item) entries and return them sorted in ascending order.
+    """
+    if k <= 0:
+        return []
+    # The root of the heap is the entry to evict first: the worst value,
+    # and among equal values the one that arrived last. Orders only need
+    # to be monotonic among the items that enter the heap.
+    sign = -1 if largest else 1
+    iterator = iter(iterable)
+    entries = []
+    for order, item in zip(range(k), iterator):
+        value = item if key is None else key(item)
+        entries.append((value, sign*order, item))
+    heap = Heap(_operator.le if largest else _operator.ge)
+    heap.heapify(entries)
+    if len(entries) < k:
+        return sorted(entries)
+
+    vertices = heap._vertices
+    replace = heap.replace
+    worst = vertices[1][0]
+    order = sign*k
+    # Most items are rejected by a single comparison with the root, so the
+    # loops below neither allocate nor call anything for them.
+    if key is None:
+        if largest:
+            for item in iterator:
+                if worst < item:
+                    replace((item, order, item))
+                    worst = vertices[1][0]
+                    order = order - 1
+        else:
+            for item in iterator:
+                if item < worst:
+                    replace((item, order, item))
+                    worst = vertices[1][0]
+                    order = order + 1
+    else:
+        for item in iterator:
+            value = key(item)
+            if (worst < value) if largest else (value < worst):
+                replace((value, order, item))
+                worst = vertices[1][0]
+                order = order + sign
+    return sorted(vertices[1:])
+
+def merge(*iterables, key=None):
+    """Lazily merge several sorted iterables into a single sorted stream.
+
+    Only the head item of each iterable is held in memory. Heap entries
+    are updated in place when an iterable advances, so no object is
+    allocated per merged item.
+
+    Args:
+        *iterables (iterable (object)): Iterables sorted in ascending order.
+        key (Optional[function]): Function of one item that returns the
+            value to compare. Defaults to the item itself.
+
+    Returns:
+        generator: The items of all iterables in ascending order. Items
+            that compare equal are yielded in the order of their iterables.
+
+    Raises:
+        Nothing.
+    """
+    entries = []
+    for order, iterable in enumerate(iterables):
+        iterator = iter(iterable)
+        for item in iterator:
+            value = item if key is None else key(item)
+            entries.append([value, order, item, iterator])
+            break
+    heap = Heap(_operator.le)
+    heap.heapify(entries)
+    shift_down = heap._shift_down
+
+    while heap._n_vertices > 1:
+        entry = heap._vertices[1]
+        next_item = entry[3].__next__
+        try:
+            while True:
+                yield entry[2]
+                item = next_item()
+                entry[0] = item if key is None else key(item)
+                entry[2] = item
+                shift_down(1)
+                if heap._vertices[1] is not entry:
+                    break
+        except StopIteration:
+            heap.pop()
+
+    if heap._n_vertices == 1:
+        entry = heap._vertices[1]
+        yield entry[2]
+        yield from entry[3]
+
+
+class PairingHeap(Tree):
+    """A pairing heap is a heap-ordered multiway tree.
+
+    Contrary to Heap, merging two pairing heaps takes constant time and
+    the priority of a vertice can be raised in place through the node
+    returned by push. Popping the root takes O(log n) amortized time.
+    """
+
+    class _Node(object):
+        """Node class for pairing heap.
+
+        Args:
+            vertice (object): Vertice contained in the node.
+
+        Attributes (public):
+            vertice (object): Vertice contained in the node.
+            child (_Node): Pointer to the first child node.
+            sibling (_Node): Pointer to the next sibling node.
+            prev (_Node): Pointer to the previous sibling node, or to the
+                          parent node for a first child. Set to _DETACHED
+                          once the node is popped or the heap cleared.
+        """
+        __slots__ = ('vertice', 'child', 'sibling', 'prev')
+
+        def __init__(self, vertice):
+            self.vertice = vertice
+            self.child = None
+            self.sibling = None
+            self.prev = None
+
+    # Marks the nodes that were popped out of the heap.
+    _DETACHED = object()
+
+    def __init__(self, compare=None):
         Tree.__init__(self)
+        self._root = None
+        self._n_vertices = 0
+        if compare is None:
+            self._compare = _operator.ge
+        else:
+            self._compare = compare
+
+    def _link(self, node1, node2):
+        """Make the root with the lowest priority the first child of the
+           other one and return the new root. Both nodes must be roots.
+        """
+        if self._compare(node1.vertice, node2.vertice):
+            parent, child = node1, node2
+        else:
+            parent, child = node2, node1
+        first_child = parent.child
+        child.prev = parent
+        child.sibling = first_child
+        if first_child is not None:
+            first_child.prev = child
+        parent.child = child
+        return parent
+
+    def _merge_pairs(self, first):
+        """Merge a list of siblings into a single tree with the two-pass
+           pairing strategy and return its root.
+        """
+        if first is None:
+            return None
+        pairs = []
+        node = first
+        while node is not None:
+            next_node = node.sibling
+            node.sibling = None
+            node.prev = None
+            if next_node is None:
+                pairs.append(node)
+                break
+            node_after = next_node.sibling
+            next_node.sibling = None
+            next_node.prev = None
+            pairs.append(self._link(node, next_node))
+            node = node_after
+
+        root = pairs.pop()
+        while pairs:
+            root = self._link(pairs.pop(), root)
+        return root
+
+    def push(self, vertice):
+        """Insert a vertice in the heap.
+
+        Args:
+            vertice (object): The vertice to insert.
+
+        Returns:
+            _Node: A handle on the vertice, to be used with decrease_key.
+
+        Raises:
+            Nothing.
+        """
+        node = self._Node(vertice)
+        if self._root is None:
+            self._root = node
+        else:
+            self._root = self._link(self._root, node)
+        self._n_vertices = self._n_vertices + 1
+        return node
+
+    def push_many(self, vertices):
+        """Insert several vertices in the heap.
+
+        Args:
+            vertices (iterable (object)): The vertices to insert.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        for vertice in vertices:
+            self.push(vertice)
+
+    def peek(self):
+        """Inspect the root of the heap.
+
+        Args:
+            Nothing.
+
+        Returns:
+            object: Vertice at the root.
+
+        Raises:
+            ValueError: An error occurs when the heap is empty.
+        """
+        if self._root is None:
+            raise ValueError('The heap is empty.')
+        return self._root.vertice
+
+    def pop(self):
+        """Extract the root of the heap and return it.
+
+        Args:
+            Nothing.
+
+        Returns:
+            object: Vertice at the root.
+
+        Raises:
+            ValueError: An error occurs when the heap is empty.
+        """
+        if self._root is None:
+            raise ValueError('The heap is empty.')
+        root = self._root
+        self._root = self._merge_pairs(root.child)
+        root.child = None
+        root.prev = self._DETACHED
+        self._n_vertices = self._n_vertices - 1
+        return root.vertice
+
+    def replace(self, vertice):
+        """Pop the root then push a vertice.
+
+        Args:
+            vertice (object): The vertice to insert.
+
+        Returns:
+            object: Vertice at the root.
+
+        Raises:
+            ValueError: An error occurs when the heap is empty.
+        """
+        root = self.pop()
+        self.push(vertice)
+        return root
+
+    def decrease_key(self, node, vertice):
+        """Replace the vertice of a node by one of higher or equal priority.
+
+        The node is cut from its parent and linked back with the root, so
+        this takes constant time.
+
+        Args:
+            node (_Node): A handle returned by push.
+            vertice (object): The new vertice.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            ValueError: An error occurs when the node was popped or the
+                        heap cleared since push, or when vertice has a
+                        lower priority than the current vertice of the
+                        node.
+        """
+        if node.prev is self._DETACHED:
+            raise ValueError('The node is not in the heap.')
+        if not self._compare(vertice, node.vertice):
+            raise ValueError('The new vertice has a lower priority.')
+        node.vertice = vertice
+        if node is self._root:
+            return
+
+        if node.prev.child is node:
+            node.prev.child = node.sibling
+        else:
+            node.prev.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.prev = node.prev
+        node.sibling = None
+        node.prev = None
+        self._root = self._link(self._root, node)
+
+    def heapify(self, elements):
+        """Create a heap out of elements.
+
+        Args:
+            elements (python list (object)): A list containing elements
+                                             to form the heap.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            ValueError: An error occurs when elements is not a list.
+        """
+        if not isinstance(elements, list):
+            raise ValueError('Argument elements must be a python list.')
+        self.clear()
+        self.push_many(elements)
+
+    def merge(self, other_heap):
+        """Join other_heap to the current one in constant time.
+
+        The nodes of other_heap are moved to the current heap, which leaves
+        other_heap empty.
+
+        Args:
+            other_heap (PairingHeap): The heap to join.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing
+        """
+        if other_heap is self or other_heap._root is None:
+            return
+        if self._root is None:
+            self._root = other_heap._root
+        else:
+            self._root = self._link(self._root, other_heap._root)
+        self._n_vertices = self._n_vertices + other_heap._n_vertices
+        other_heap._root = None
+        other_heap._n_vertices = 0
+
+    def clear(self):
+        """Remove all vertices from the heap.
+
+        Args:
+            Nothing.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        # Detach every node, so that the handles returned by push are
+        # refused by decrease_key.
+        pending = []
+        if self._root is not None:
+            pending.append(self._root)
+        while pending:
+            node = pending.pop()
+            child = node.child
+            while child is not None:
+                pending.append(child)
+                child = child.sibling
+            node.child = None
+            node.sibling = None
+            node.prev = self._DETACHED
+        self._root = None
+        self._n_vertices = 0
+
+    def is_empty(self):
+        """Verify if the heap contains vertices.
+
+        Does not modify the heap.
+
+        Args:
+            Nothing.
+
+        Returns:
+            bool: True if the heap contains no vertices, False otherwise.
+
+        Raises:
+            Nothing.
+        """
+        return self._n_vertices == 0
+
+    def size(self):
+        """Get the number of vertices in the heap.
+
+        Does not modify the heap.
+
+        Args:
+            Nothing.
+
+        Returns:
+            int: The number of vertices.
+
+        Raises:
+            Nothing.
+        """
+        return self._n_vertices
+
+    def contains(self, vertice):
+        """Verify if a vertice is in the heap.
+
+        Args:
+            vertice (object): The queried vertice.
+
+        Returns:
+            bool: True if the vertice is in the heap, False otherwise.
+
+        Raises:
+            Nothing.
+        """
+        for node in self._nodes():
+            if node.vertice == vertice:
+                return True
+        return False
+
+    def copy(self):
+        """Copy of the heap.
+
+        The vertices themselves are not copied, and the handles returned
+        by push only refer to the nodes of the original heap.
 
+        Args:
+            Nothing.
+
+        Returns:
+            PairingHeap: A copy of the heap.
+
+        Raises:
+            Nothing.
+        """
+        copy_heap = self.__class__(self._compare)
+        if self._root is None:
+            return copy_heap
+
+        copy_heap._root = self._Node(self._root.vertice)
+        copy_heap._n_vertices = self._n_vertices
+        pending = [(self._root, copy_heap._root)]
+        while pending:
+            node, copy_node = pending.pop()
+            prev = copy_node
+            child = node.child
+            while child is not None:
+                copy_child = self._Node(child.vertice)
+                copy_child.prev = prev
+                if prev is copy_node:
+                    copy_node.child = copy_child
+                else:
+                    prev.sibling = copy_child
+                pending.append((child, copy_child))
+                prev = copy_child
+                child = child.sibling
+        return copy_heap
+
+    def _nodes(self):
+        """Iterate over all nodes, in no particular order.
+        """
+        pending = []
+        if self._root is not None:
+            pending.append(self._root)
+        while pending:
+            node = pending.pop()
+            yield node
+            child = node.child
+            while child is not None:
+                pending.append(child)
+                child = child.sibling
+
+    def _is_heap(self):
+        compare = self._compare
+        for node in self._nodes():
+            child = node.child
+            while child is not None:
+                if not compare(node.vertice, child.vertice):
+                    return False
+                child = child.sibling
+        return True
+
+    def __contains__(self, vertice):
+        return self.contains(vertice)
+
+    def __len__(self):
+        return self._n_vertices
+
+    def __iter__(self):
+        """Iterate over the vertices in the order they would be popped.
+
+        The heap is not modified.
+        """
+        compare = self._compare
+        if self._root is None:
+            return
+        frontier = Heap(lambda n1,n2 : compare(n1.vertice, n2.vertice))
+        frontier.push(self._root)
+        while not frontier.is_empty():
+            node = frontier.pop()
+            yield node.vertice
+            child = node.child
+            while child is not None:
+                frontier.push(child)
+                child = child.sibling
+
+    def __repr__(self):
+        return '[' + ', '.join(str(vertice) for vertice in self) + ']'
+
+    def __add__(self, other_heap):
+        new_heap = self.__class__(self._compare)
+        new_heap.merge(self.copy())
+        new_heap.merge(other_heap.copy())
+        return new_heap
+
+
+class BinarySearchTree(Tree):
+    """Binary search tree interface.
+
+    This is the interface of an ordered map from keys to values. All
+    search trees are sub-classes of BinarySearchTree. The keys must be
+    comparable with the < operator. Every node stores the size of its
+    subtree, which gives rank, select and count_range in O(log n) time.
+
+    Args:
+        Nothing.
+
+    Attributes (public):
+        Nothing.
+    """
+    def __init__(self):
+        Tree.__init__(self)
+        self._root = None
+
+    def insert(self, key, value=None):
+        """Insert a key in the tree.
+
+        If the key is already in the tree, its value is replaced.
+
+        Args:
+            key (object): The key to insert.
+            value (Optional[object]): The value associated with the key.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Remove a key from the tree.
+
+        Args:
+            key (object): The key to remove.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            ValueError: An error occurs when key is not in the tree.
+        """
+        raise NotImplementedError
+
+    def _find(self, key):
+        """Return the node containing key, or None.
+        """
+        node = self._root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                return node
+        return None
+
+    def search(self, key):
+        """Get the value associated with a key.
+
+        Args:
+            key (object): The queried key.
+
+        Returns:
+            object: The value associated with the key.
+
+        Raises:
+            ValueError: An error occurs when key is not in the tree.
+        """
+        node = self._find(key)
+        if node is None:
+            raise ValueError('Key not found.')
+        return node.value
+
+    def contains(self, key):
+        """Verify if a key is in the tree.
+
+        Args:
+            key (object): The queried key.
+
+        Returns:
+            bool: True if the key is in the tree, False otherwise.
+
+        Raises:
+            Nothing.
+        """
+        return self._find(key) is not None
+
+    def floor(self, key):
+        """Get the largest key lower than or equal to a key.
+
+        Args:
+            key (object): The queried key.
+
+        Returns:
+            object: The largest key k such that k <= key.
+
+        Raises:
+            ValueError: An error occurs when there is no such key.
+        """
+        node = self._root
+        floor_node = None
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            else:
+                floor_node = node
+                node = node.right
+        if floor_node is None:
+            raise ValueError('Key not found.')
+        return floor_node.key
+
+    def ceiling(self, key):
+        """Get the smallest key greater than or equal to a key.
+
+        Args:
+            key (object): The queried key.
+
+        Returns:
+            object: The smallest key k such that k >= key.
+
+        Raises:
+            ValueError: An error occurs when there is no such key.
+        """
+        node = self._root
+        ceiling_node = None
+        while node is not None:
+            if node.key < key:
+                node = node.right
+            else:
+                ceiling_node = node
+                node = node.left
+        if ceiling_node is None:
+            raise ValueError('Key not found.')
+        return ceiling_node.key
+
+    def rank(self, key):
+        """Get the number of keys strictly lower than a key.
+
+        The key does not need to be in the tree.
+
+        Args:
+            key (object): The queried key.
+
+        Returns:
+            int: The number of keys k such that k < key.
+
+        Raises:
+            Nothing.
+        """
+        node = self._root
+        rank = 0
+        while node is not None:
+            if node.key < key:
+                rank = rank + 1
+                if node.left is not None:
+                    rank = rank + node.left.size
+                node = node.right
+            else:
+                node = node.left
+        return rank
+
+    def _rank_right(self, key):
+        """Return the number of keys lower than or equal to key.
+        """
+        node = self._root
+        rank = 0
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            else:
+                rank = rank + 1
+                if node.left is not None:
+                    rank = rank + node.left.size
+                node = node.right
+        return rank
+
+    def select(self, index):
+        """Get the key at a certain index in sorted order.
+
+        Args:
+            index (int): The index of the key.
+
+        Returns:
+            object: The key such that rank(key) == index.
+
+        Raises:
+            ValueError: An error occurs if index is out of range, i.e.
+                        if index < -1 * tree size or if index >= tree size.
+        """
+        size = self.size()
+        if (index < -size) or (index >= size):
+            raise ValueError('Argument index out of range.')
+        if index < 0:
+            index = size + index
+
+        node = self._root
+        while True:
+            left_size = 0 if node.left is None else node.left.size
+            if index < left_size:
+                node = node.left
+            elif index > left_size:
+                index = index - left_size - 1
+                node = node.right
+            else:
+                return node.key
+
+    def count_range(self, lo, hi):
+        """Count the keys within a range.
+
+        Args:
+            lo (object): Smallest key of the range (inclusive).
+            hi (object): Largest key of the range (inclusive).
+
+        Returns:
+            int: The number of keys such that lo <= key <= hi.
+
+        Raises:
+            Nothing.
+        """
+        if hi < lo:
+            return 0
+        return self._rank_right(hi) - self.rank(lo)
+
+    def items(self, lo=None, hi=None):
+        """Iterate over the (key, value) pairs in sorted order.
+
+        The pairs are generated lazily, so iterating over a small range of
+        a large tree only visits O(log n + k) nodes.
+
+        Args:
+            lo (Optional[object]): Smallest key of the range (inclusive).
+            hi (Optional[object]): Largest key of the range (inclusive).
+
+        Returns:
+            generator: The (key, value) pairs such that lo <= key <= hi.
+
+        Raises:
+            Nothing.
+        """
+        for node in self._inorder(lo, hi):
+            yield node.key, node.value
+
+    def _inorder(self, lo=None, hi=None):
+        """Iterate over the nodes in sorted order, from lo to hi.
+        """
+        pending = []
+        node = self._root
+        while True:
+            while node is not None:
+                if lo is not None and node.key < lo:
+                    node = node.right
+                else:
+                    pending.append(node)
+                    node = node.left
+            if not pending:
+                return
+            node = pending.pop()
+            if hi is not None and hi < node.key:
+                return
+            yield node
+            node = node.right
+
+    def clear(self):
+        """Remove all keys from the tree.
+
+        Args:
+            Nothing.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        self._root = None
+
+    def is_empty(self):
+        """Verify if the tree is empty.
+
+        Does not modify the tree.
+
+        Args:
+            Nothing.
+
+        Returns:
+            bool: True if the tree is empty, False otherwise.
+
+        Raises:
+            Nothing.
+        """
+        return self._root is None
+
+    def size(self):
+        """Get the number of keys in the tree.
+
+        Does not modify the tree.
+
+        Args:
+            Nothing.
+
+        Returns:
+            int: The number of keys.
+
+        Raises:
+            Nothing.
+        """
+        return 0 if self._root is None else self._root.size
+
+    def copy(self):
+        """Copy of the tree.
+
+        The keys and values themselves are not copied.
+
+        Args:
+            Nothing.
+
+        Returns:
+            BinarySearchTree: A copy of the tree.
+
+        Raises:
+            Nothing.
+        """
+        raise NotImplementedError
+
+    def __len__(self):
+        return self.size()
+
+    def __iter__(self):
+        for node in self._inorder():
+            yield node.key
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def __getitem__(self, key):
+        return self.search(key)
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __delitem__(self, key):
+        self.delete(key)
+
+    def __eq__(self, other_tree):
+        if len(self) != len(other_tree):
+            return False
+
+        for item1,item2 in zip(self.items(), other_tree.items()):
+            if item1 != item2:
+                return False
+
+        return True
+
+    def __repr__(self):
+        return '{' + ', '.join(str(key) + ': ' + str(value)
+                               for key,value in self.items()) + '}'
+
+
+class AVLTree(BinarySearchTree):
+    """Self-balancing tree based on AVL.
+
+    The tree is an ordered map from keys to values. It can be used as an
+    ordered set by inserting keys without values. The heights of the two
+    subtrees of any node differ by at most one, so every operation takes
+    O(log n) time.
+
+    Args:
+        Nothing.
+
+    Attributes (public):
+        Nothing.
+    """
+
+    class _Node(object):
+        """Node class for AVL tree.
+
+        Args:
+            key (object): Key contained in the node.
+            value (object): Value associated with the key.
+
+        Attributes (public):
+            key (object): Key contained in the node.
+            value (object): Value associated with the key.
+            left (_Node): Pointer to the left child node.
+            right (_Node): Pointer to the right child node.
+            height (int): Height of the subtree rooted at the node.
+            size (int): Number of nodes in the subtree rooted at the node.
+        """
+        __slots__ = ('key', 'value', 'left', 'right', 'height', 'size')
+
+        def __init__(self, key, value=None):
+            self.key = key
+            self.value = value
+            self.left = None
+            self.right = None
+            self.height = 1
+            self.size = 1
+
+    def __init__(self):
+        BinarySearchTree.__init__(self)
+
+    @classmethod
+    def from_sorted(cls, items):
+        """Create a tree out of (key, value) pairs sorted by key.
+
+        The tree is built in linear time, without any comparison other than
+        the check that the keys are increasing.
+
+        Args:
+            items (iterable ((object, object))): The (key, value) pairs,
+                                                 in strictly increasing
+                                                 order of keys.
+
+        Returns:
+            AVLTree: A tree containing the pairs.
+
+        Raises:
+            ValueError: An error occurs when the keys are not strictly
+                        increasing.
+        """
+        items = list(items)
+        for i in range(1, len(items)):
+            if not items[i - 1][0] < items[i][0]:
+                raise ValueError('Keys must be strictly increasing.')
+
+        tree = cls()
+        node_class = cls._Node
+
+        def build(lo, hi):
+            if lo == hi:
+                return None
+            mid = (lo + hi) // 2
+            key, value = items[mid]
+            node = node_class(key, value)
+            node.left = build(lo, mid)
+            node.right = build(mid + 1, hi)
+            tree._update(node)
+            return node
+
+        tree._root = build(0, len(items))
+        return tree
+
+    def _height(self, node):
+        """Height of a subtree, 0 for an empty one.
+        """
+        return 0 if node is None else node.height
+
+    def _update(self, node):
+        """Recompute the height and the size of a node from its children.
+        """
+        left = node.left
+        right = node.right
+        if left is None:
+            if right is None:
+                node.height = 1
+                node.size = 1
+            else:
+                node.height = right.height + 1
+                node.size = right.size + 1
+        elif right is None:
+            node.height = left.height + 1
+            node.size = left.size + 1
+        else:
+            node.height = max(left.height, right.height) + 1
+            node.size = left.size + right.size + 1
+
+    def _rotate_left(self, node):
+        right = node.right
+        node.right = right.left
+        right.left = node
+        self._update(node)
+        self._update(right)
+        return right
+
+    def _rotate_right(self, node):
+        left = node.left
+        node.left = left.right
+        left.right = node
+        self._update(node)
+        self._update(left)
+        return left
+
+    def _rebalance(self, node):
+        """Restore the AVL property at node and return the root of the
+           rebalanced subtree. Both subtrees of node must be balanced.
+        """
+        left = node.left
+        right = node.right
+        left_height = 0 if left is None else left.height
+        right_height = 0 if right is None else right.height
+
+        if left_height > right_height + 1:
+            if self._height(left.left) < self._height(left.right):
+                node.left = self._rotate_left(left)
+            return self._rotate_right(node)
+        elif right_height > left_height + 1:
+            if self._height(right.right) < self._height(right.left):
+                node.right = self._rotate_right(right)
+            return self._rotate_left(node)
+
+        self._update(node)
+        return node
+
+    def _rebalance_path(self, path):
+        """Rebalance the nodes of a root-to-node path, from the bottom up.
+
+        The sizes along the path must already be up to date, so the walk
+        stops as soon as a subtree keeps its height.
+        """
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            height = node.height
+            new_node = self._rebalance(node)
+            if new_node is not node:
+                if i == 0:
+                    self._root = new_node
+                elif path[i - 1].left is node:
+                    path[i - 1].left = new_node
+                else:
+                    path[i - 1].right = new_node
+            if new_node.height == height:
+                break
+
+    def insert(self, key, value=None):
+        if self._root is None:
+            self._root = self._Node(key, value)
+            return
+
+        path = []
+        node = self._root
+        while True:
+            path.append(node)
+            if key < node.key:
+                if node.left is None:
+                    node.left = self._Node(key, value)
+                    break
+                node = node.left
+            elif node.key < key:
+                if node.right is None:
+                    node.right = self._Node(key, value)
+                    break
+                node = node.right
+            else:
+                node.value = value
+                return
+
+        for node in path:
+            node.size = node.size + 1
+        self._rebalance_path(path)
+
+    def delete(self, key):
+        path = []
+        node = self._root
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                node = node.left
+            elif node.key < key:
+                path.append(node)
+                node = node.right
+            else:
+                break
+        if node is None:
+            raise ValueError('Key not found.')
+
+        if node.left is not None and node.right is not None:
+            # Move the successor in place of node, then unlink the successor.
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            node.key = successor.key
+            node.value = successor.value
+            node = successor
+
+        child = node.left if node.left is not None else node.right
+        if not path:
+            self._root = child
+        elif path[-1].left is node:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+
+        for node in path:
+            node.size = node.size - 1
+        self._rebalance_path(path)
+
+    def copy(self):
+        copy_tree = self.__class__()
+        if self._root is None:
+            return copy_tree
+
+        copy_tree._root = self._copy_node(self._root)
+        pending = [(self._root, copy_tree._root)]
+        while pending:
+            node, copy_node = pending.pop()
+            if node.left is not None:
+                copy_node.left = self._copy_node(node.left)
+                pending.append((node.left, copy_node.left))
+            if node.right is not None:
+                copy_node.right = self._copy_node(node.right)
+                pending.append((node.right, copy_node.right))
+        return copy_tree
+
+    def _copy_node(self, node):
+        """Copy the fields of a node, without its children.
+        """
+        copy_node = self._Node(node.key, node.value)
+        copy_node.height = node.height
+        copy_node.size = node.size
+        return copy_node
+
+    def _is_balanced(self):
+        for node in self._inorder():
+            left_height = 0 if node.left is None else node.left.height
+            right_height = 0 if node.right is None else node.right.height
+            left_size = 0 if node.left is None else node.left.size
+            right_size = 0 if node.right is None else node.right.size
+            if abs(left_height - right_height) > 1:
+                return False
+            if node.height != max(left_height, right_height) + 1:
+                return False
+            if node.size != left_size + right_size + 1:
+                return False
+            if node.left is not None and not node.left.key < node.key:
+                return False
+            if node.right is not None and not node.key < node.right.key:
+                return False
+        return True
+
+
+class RedBlackTree(BinarySearchTree):
+    """Self-balancing tree based on red-black.
+
+    The tree is an ordered map from keys to values. Every node is either
+    red or black, a red node has no red child and all paths from a node to
+    its leaves contain the same number of black nodes, so the height of
+    the tree is at most 2 log(n + 1). A tree can be built in linear time
+    from already sorted pairs with from_sorted.
+
+    Args:
+        Nothing.
+
+    Attributes (public):
+        Nothing.
+    """
+
+    class _Node(object):
+        """Node class for red-black tree.
+
+        Args:
+            key (object): Key contained in the node.
+            value (object): Value associated with the key.
+            parent (_Node): Pointer to the parent node.
+            red (bool): True if the node is red, False if it is black.
+
+        Attributes (public):
+            key (object): Key contained in the node.
+            value (object): Value associated with the key.
+            left (_Node): Pointer to the left child node.
+            right (_Node): Pointer to the right child node.
+            parent (_Node): Pointer to the parent node.
+            red (bool): True if the node is red, False if it is black.
+            size (int): Number of nodes in the subtree rooted at the node.
+        """
+        __slots__ = ('key', 'value', 'left', 'right', 'parent', 'red',
+                     'size')
+
+        def __init__(self, key, value=None, parent=None, red=True):
+            self.key = key
+            self.value = value
+            self.left = None
+            self.right = None
+            self.parent = parent
+            self.red = red
+            self.size = 1
+
+    def __init__(self):
+        BinarySearchTree.__init__(self)
+
+    @classmethod
+    def from_sorted(cls, items):
+        """Create a tree out of (key, value) pairs sorted by key.
+
+        The tree is built in linear time, without any comparison other than
+        the check that the keys are increasing.
+
+        Args:
+            items (iterable ((object, object))): The (key, value) pairs,
+                                                 in strictly increasing
+                                                 order of keys.
+
+        Returns:
+            RedBlackTree: A tree containing the pairs.
+
+        Raises:
+            ValueError: An error occurs when the keys are not strictly
+                        increasing.
+        """
+        items = list(items)
+        for i in range(1, len(items)):
+            if not items[i - 1][0] < items[i][0]:
+                raise ValueError('Keys must be strictly increasing.')
+
+        tree = cls()
+        # All levels but the deepest one are full: its nodes are red and
+        # all the others are black.
+        red_depth = len(items).bit_length() - 1
+        node_class = cls._Node
+
+        def build(lo, hi, depth, parent):
+            if lo == hi:
+                return None
+            mid = (lo + hi) // 2
+            key, value = items[mid]
+            node = node_class(key, value, parent, depth == red_depth)
+            node.size = hi - lo
+            node.left = build(lo, mid, depth + 1, node)
+            node.right = build(mid + 1, hi, depth + 1, node)
+            return node
+
+        tree._root = build(0, len(items), 0, None)
+        if tree._root is not None:
+            tree._root.red = False
+        return tree
+
+    def _rotate_left(self, node):
+        right = node.right
+        node.right = right.left
+        if right.left is not None:
+            right.left.parent = node
+        self._replace_child(node, right)
+        right.left = node
+        node.parent = right
+        right.size = node.size
+        self._update_size(node)
+
+    def _rotate_right(self, node):
+        left = node.left
+        node.left = left.right
+        if left.right is not None:
+            left.right.parent = node
+        self._replace_child(node, left)
+        left.right = node
+        node.parent = left
+        left.size = node.size
+        self._update_size(node)
+
+    def _update_size(self, node):
+        """Recompute the size of a node from its children.
+        """
+        size = 1
+        if node.left is not None:
+            size = size + node.left.size
+        if node.right is not None:
+            size = size + node.right.size
+        node.size = size
+
+    def _replace_child(self, node, new_node):
+        """Put new_node in place of node below the parent of node.
+        """
+        parent = node.parent
+        if parent is None:
+            self._root = new_node
+        elif parent.left is node:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        if new_node is not None:
+            new_node.parent = parent
+
+    def insert(self, key, value=None):
+        parent = None
+        node = self._root
+        while node is not None:
+            parent = node
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                node.value = value
+                return
+
+        node = self._Node(key, value, parent)
+        if parent is None:
+            self._root = node
+        elif key < parent.key:
+            parent.left = node
+        else:
+            parent.right = node
+        while parent is not None:
+            parent.size = parent.size + 1
+            parent = parent.parent
+        self._insert_fixup(node)
+
+    def _insert_fixup(self, node):
+        """Restore the red-black properties after inserting a red node.
+        """
+        parent = node.parent
+        while parent is not None and parent.red:
+            grandparent = parent.parent
+            if parent is grandparent.left:
+                uncle = grandparent.right
+                if uncle is not None and uncle.red:
+                    parent.red = False
+                    uncle.red = False
+                    grandparent.red = True
+                    node = grandparent
+                else:
+                    if node is parent.right:
+                        self._rotate_left(parent)
+                        node, parent = parent, node
+                    parent.red = False
+                    grandparent.red = True
+                    self._rotate_right(grandparent)
+            else:
+                uncle = grandparent.left
+                if uncle is not None and uncle.red:
+                    parent.red = False
+                    uncle.red = False
+                    grandparent.red = True
+                    node = grandparent
+                else:
+                    if node is parent.left:
+                        self._rotate_right(parent)
+                        node, parent = parent, node
+                    parent.red = False
+                    grandparent.red = True
+                    self._rotate_left(grandparent)
+            parent = node.parent
+        self._root.red = False
+
+    def delete(self, key):
+        node = self._find(key)
+        if node is None:
+            raise ValueError('Key not found.')
+
+        if node.left is not None and node.right is not None:
+            # Move the successor in place of node, then unlink the successor.
+            successor = node.right
+            while successor.left is not None:
+                successor = successor.left
+            node.key = successor.key
+            node.value = successor.value
+            node = successor
+
+        child = node.left if node.left is not None else node.right
+        parent = node.parent
+        self._replace_child(node, child)
+        ancestor = parent
+        while ancestor is not None:
+            ancestor.size = ancestor.size - 1
+            ancestor = ancestor.parent
+        if not node.red:
+            self._delete_fixup(child, parent)
+
+    def _delete_fixup(self, node, parent):
+        """Restore the red-black properties after removing a black node
+           whose place was taken by node, a child of parent.
+        """
+        while node is not self._root and (node is None or not node.red):
+            if node is parent.left:
+                sibling = parent.right
+                if sibling.red:
+                    sibling.red = False
+                    parent.red = True
+                    self._rotate_left(parent)
+                    sibling = parent.right
+                if ( (sibling.left is None or not sibling.left.red) and
+                     (sibling.right is None or not sibling.right.red) ):
+                    sibling.red = True
+                    node = parent
+                    parent = node.parent
+                else:
+                    if sibling.right is None or not sibling.right.red:
+                        sibling.left.red = False
+                        sibling.red = True
+                        self._rotate_right(sibling)
+                        sibling = parent.right
+                    sibling.red = parent.red
+                    parent.red = False
+                    sibling.right.red = False
+                    self._rotate_left(parent)
+                    node = self._root
+            else:
+                sibling = parent.left
+                if sibling.red:
+                    sibling.red = False
+                    parent.red = True
+                    self._rotate_right(parent)
+                    sibling = parent.left
+                if ( (sibling.left is None or not sibling.left.red) and
+                     (sibling.right is None or not sibling.right.red) ):
+                    sibling.red = True
+                    node = parent
+                    parent = node.parent
+                else:
+                    if sibling.left is None or not sibling.left.red:
+                        sibling.right.red = False
+                        sibling.red = True
+                        self._rotate_left(sibling)
+                        sibling = parent.left
+                    sibling.red = parent.red
+                    parent.red = False
+                    sibling.left.red = False
+                    self._rotate_right(parent)
+                    node = self._root
+        if node is not None:
+            node.red = False
+
+    def copy(self):
+        return self.from_sorted(self.items())
+
+    def _is_balanced(self):
+        if self._root is None:
+            return True
+        if self._root.red or self._root.parent is not None:
+            return False
+
+        black_height = None
+        pending = [(self._root, 0)]
+        while pending:
+            node, black_count = pending.pop()
+            size = 1
+            if node.left is not None:
+                size = size + node.left.size
+            if node.right is not None:
+                size = size + node.right.size
+            if node.size != size:
+                return False
+            if not node.red:
+                black_count = black_count + 1
+            for child in (node.left, node.right):
+                if child is None:
+                    if black_height is None:
+                        black_height = black_count
+                    elif black_height != black_count:
+                        return False
+                else:
+                    if child.parent is not node or (node.red and child.red):
+                        return False
+                    pending.append((child, black_count))
+            if node.left is not None and not node.left.key < node.key:
+                return False
+            if node.right is not None and not node.key < node.right.key:
+                return False
+        return True
+
+
+class IntervalTree(AVLTree):
+    """Interval tree based on an AVL tree.
+
+    The keys are closed intervals (start, end) with start <= end, ordered
+    by start then end. Each node also stores the largest end point of its
+    subtree, which lets overlap queries skip the subtrees that end before
+    the queried range. Reporting the k intervals that overlap a range
+    takes O(log n + k) time on typical data.
+
+    Args:
+        Nothing.
+
+    Attributes (public):
+        Nothing.
+    """
+
+    class _Node(object):
+        """Node class for interval tree.
+
+        Args:
+            key ((object, object)): Interval contained in the node.
+            value (object): Value associated with the interval.
+
+        Attributes (public):
+            key ((object, object)): Interval contained in the node.
+            value (object): Value associated with the interval.
+            left (_Node): Pointer to the left child node.
+            right (_Node): Pointer to the right child node.
+            height (int): Height of the subtree rooted at the node.
+            size (int): Number of nodes in the subtree rooted at the node.
+            max_end (object): Largest end point in the subtree rooted at
+                              the node.
+        """
+        __slots__ = ('key', 'value', 'left', 'right', 'height', 'size',
+                     'max_end')
+
+        def __init__(self, key, value=None):
+            self.key = key
+            self.value = value
+            self.left = None
+            self.right = None
+            self.height = 1
+            self.size = 1
+            self.max_end = key[1]
+
+    @classmethod
+    def from_intervals(cls, intervals, values=None):
+        """Create a tree out of intervals given in any order.
+
+        The intervals are sorted then the tree is built in linear time.
+        If an interval appears more than once, its last value is kept.
+
+        Args:
+            intervals (iterable ((object, object))): The intervals.
+            values (Optional[iterable (object)]): The values associated
+                                                  with the intervals.
+
+        Returns:
+            IntervalTree: A tree containing the intervals.
+
+        Raises:
+            ValueError: An error occurs when an interval has start > end.
+        """
+        intervals = list(intervals)
+        if values is None:
+            values = [None] * len(intervals)
+        items = {}
+        for interval,value in zip(intervals, values):
+            if interval[1] < interval[0]:
+                raise ValueError('Interval start must not exceed its end.')
+            items[tuple(interval)] = value
+        return cls.from_sorted(sorted(items.items()))
+
+    def _update(self, node):
+        AVLTree._update(self, node)
+        max_end = node.key[1]
+        if node.left is not None and max_end < node.left.max_end:
+            max_end = node.left.max_end
+        if node.right is not None and max_end < node.right.max_end:
+            max_end = node.right.max_end
+        node.max_end = max_end
+
+    def _rebalance_path(self, path):
+        # The rebalancing stops early once heights are settled, but the
+        # end points of all the ancestors may still have changed.
+        AVLTree._rebalance_path(self, path)
+        for i in range(len(path) - 1, -1, -1):
+            self._update(path[i])
+
+    def insert(self, key, value=None):
+        if key[1] < key[0]:
+            raise ValueError('Interval start must not exceed its end.')
+        AVLTree.insert(self, tuple(key), value)
+
+    def overlap(self, lo, hi):
+        """Iterate over the intervals that overlap a range.
+
+        The intervals are generated lazily, in sorted order.
+
+        Args:
+            lo (object): Start of the range (inclusive).
+            hi (object): End of the range (inclusive).
+
+        Returns:
+            generator: The (interval, value) pairs such that
+                       interval start <= hi and interval end >= lo.
+
+        Raises:
+            Nothing.
+        """
+        pending = []
+        node = self._root
+        while True:
+            # Subtrees whose largest end point is before lo are skipped.
+            while node is not None and not node.max_end < lo:
+                pending.append(node)
+                node = node.left
+            if not pending:
+                return
+            node = pending.pop()
+            if hi < node.key[0]:
+                return
+            if not node.key[1] < lo:
+                yield node.key, node.value
+            node = node.right
+
+    def stab(self, point):
+        """Iterate over the intervals that contain a point.
+
+        Args:
+            point (object): The queried point.
+
+        Returns:
+            generator: The (interval, value) pairs such that
+                       interval start <= point <= interval end.
+
+        Raises:
+            Nothing.
+        """
+        return self.overlap(point, point)
+
+    def _copy_node(self, node):
+        copy_node = AVLTree._copy_node(self, node)
+        copy_node.max_end = node.max_end
+        return copy_node
+
+    def _is_balanced(self):
+        if not AVLTree._is_balanced(self):
+            return False
+        for node in self._inorder():
+            ends = [node.key[1]]
+            if node.left is not None:
+                ends.append(node.left.max_end)
+            if node.right is not None:
+                ends.append(node.right.max_end)
+            if node.max_end != max(ends):
+                return False
+        return True
+
+
+class BPlusTree(Tree):
+    """B+ tree, a multiway search tree with all items stored in the leaves.
+
+    The tree is an ordered map from keys to values, with the same interface
+    as the binary search trees. Each node holds up to fanout keys in a
+    sorted container searched with bisect, so a lookup only follows
+    O(log n / log fanout) pointers. Leaves are linked from left to right,
+    which makes range scans sequential. Numeric keys can be stored unboxed
+    in array.array containers by giving a typecode.
+
+    Args:
+        fanout (int): Maximum number of keys in a leaf and of children in
+                      an internal node. Must be at least 3.
+        typecode (Optional[str]): Typecode of the array.array holding the
+                                  keys, e.g. 'q' for 64-bit integers or 'd'
+                                  for floats. By default keys are stored in
+                                  python lists.
+
+    Attributes (public):
+        Nothing.
+    """
+
+    class _Leaf(object):
+        """Leaf node class for B+ tree.
+
+        Attributes (public):
+            keys (python list or array.array): Sorted keys.
+            values (python list): Values associated with the keys.
+            next_leaf (_Leaf): Pointer to the next leaf.
+        """
+        __slots__ = ('keys', 'values', 'next_leaf')
+
+        def __init__(self, keys, values, next_leaf=None):
+            self.keys = keys
+            self.values = values
+            self.next_leaf = next_leaf
+
+    class _Internal(object):
+        """Internal node class for B+ tree.
+
+        The keys of children[i] are lower than keys[i], which is lower than
+        or equal to the keys of children[i + 1].
+
+        Attributes (public):
+            keys (python list or array.array): Sorted separator keys.
+            children (python list): Pointers to the children nodes.
+        """
+        __slots__ = ('keys', 'children')
+
+        def __init__(self, keys, children):
+            self.keys = keys
+            self.children = children
+
+    def __init__(self, fanout=64, typecode=None):
+        Tree.__init__(self)
+        if fanout < 3:
+            raise ValueError('Argument fanout must be at least 3.')
+        self._fanout = fanout
+        self._typecode = typecode
+        self._root = self._Leaf(self._new_keys(), [])
+        self._size = 0
+
+    def _new_keys(self, keys=()):
+        """Create a key container of the right type.
+        """
+        if self._typecode is None:
+            return list(keys)
+        return _array.array(self._typecode, keys)
+
+    def _find_leaf(self, key):
+        """Return the leaf where key is or would be.
+        """
+        node = self._root
+        leaf_class = self._Leaf
+        while node.__class__ is not leaf_class:
+            node = node.children[_bisect.bisect_right(node.keys, key)]
+        return node
+
+    def insert(self, key, value=None):
+        """Insert a key in the tree.
+
+        If the key is already in the tree, its value is replaced.
+
+        Args:
+            key (object): The key to insert.
+            value (Optional[object]): The value associated with the key.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        path = []
+        node = self._root
+        leaf_class = self._Leaf
+        while node.__class__ is not leaf_class:
+            index = _bisect.bisect_right(node.keys, key)
+            path.append((node, index))
+            node = node.children[index]
+
+        index = _bisect.bisect_left(node.keys, key)
+        if index < len(node.keys) and node.keys[index] == key:
+            node.values[index] = value
+            return
+        node.keys.insert(index, key)
+        node.values.insert(index, value)
+        self._size = self._size + 1
+        if len(node.keys) <= self._fanout:
+            return
+
+        # Split the overflowing nodes from the leaf up to the root.
+        mid = len(node.keys) // 2
+        new_node = self._Leaf(node.keys[mid:], node.values[mid:],
+                              node.next_leaf)
+        del node.keys[mid:]
+        del node.values[mid:]
+        node.next_leaf = new_node
+        separator = new_node.keys[0]
+
+        while path:
+            parent, index = path.pop()
+            parent.keys.insert(index, separator)
+            parent.children.insert(index + 1, new_node)
+            if len(parent.children) <= self._fanout:
+                return
+            node = parent
+            mid = len(node.children) // 2
+            separator = node.keys[mid - 1]
+            new_node = self._Internal(node.keys[mid:], node.children[mid:])
+            del node.keys[mid - 1:]
+            del node.children[mid:]
+
+        self._root = self._Internal(self._new_keys((separator,)),
+                                    [self._root, new_node])
+
+    def delete(self, key):
+        """Remove a key from the tree.
+
+        Args:
+            key (object): The key to remove.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            ValueError: An error occurs when key is not in the tree.
+        """
+        path = []
+        node = self._root
+        leaf_class = self._Leaf
+        while node.__class__ is not leaf_class:
+            index = _bisect.bisect_right(node.keys, key)
+            path.append((node, index))
+            node = node.children[index]
+
+        index = _bisect.bisect_left(node.keys, key)
+        if index == len(node.keys) or node.keys[index] != key:
+            raise ValueError('Key not found.')
+        del node.keys[index]
+        del node.values[index]
+        self._size = self._size - 1
+
+        # Refill the underflowing nodes from the leaf up to the root.
+        min_leaf_keys = self._fanout // 2
+        min_children = (self._fanout + 1) // 2
+        while path:
+            if node.__class__ is leaf_class:
+                if len(node.keys) >= min_leaf_keys:
+                    break
+            elif len(node.children) >= min_children:
+                break
+            parent, index = path.pop()
+            self._refill(parent, index)
+            node = parent
+
+        if (self._root.__class__ is not leaf_class and
+                len(self._root.children) == 1):
+            self._root = self._root.children[0]
+
+    def _refill(self, parent, index):
+        """Fix the underflowing child at index of parent by borrowing an
+           item from one of its siblings or by merging with it.
+        """
+        node = parent.children[index]
+        is_leaf = node.__class__ is self._Leaf
+        if is_leaf:
+            minimum = self._fanout // 2
+        else:
+            minimum = (self._fanout + 1) // 2 - 1
+
+        if index > 0 and len(parent.children[index - 1].keys) > minimum:
+            left = parent.children[index - 1]
+            if is_leaf:
+                node.keys.insert(0, left.keys.pop())
+                node.values.insert(0, left.values.pop())
+                parent.keys[index - 1] = node.keys[0]
+            else:
+                node.keys.insert(0, parent.keys[index - 1])
+                node.children.insert(0, left.children.pop())
+                parent.keys[index - 1] = left.keys.pop()
+            return
+
+        if ( index + 1 < len(parent.children) and
+             len(parent.children[index + 1].keys) > minimum ):
+            right = parent.children[index + 1]
+            if is_leaf:
+                node.keys.append(right.keys.pop(0))
+                node.values.append(right.values.pop(0))
+                parent.keys[index] = right.keys[0]
+            else:
+                node.keys.append(parent.keys[index])
+                node.children.append(right.children.pop(0))
+                parent.keys[index] = right.keys.pop(0)
+            return
+
+        # Neither sibling can lend an item: merge with one of them.
+        if index > 0:
+            index = index - 1
+        left = parent.children[index]
+        right = parent.children[index + 1]
+        if is_leaf:
+            left.values.extend(right.values)
+            left.next_leaf = right.next_leaf
+        else:
+            left.keys.append(parent.keys[index])
+            left.children.extend(right.children)
+        left.keys.extend(right.keys)
+        del parent.keys[index]
+        del parent.children[index + 1]
+
+    def search(self, key):
+        """Get the value associated with a key.
+
+        Args:
+            key (object): The queried key.
+
+        Returns:
+            object: The value associated with the key.
+
+        Raises:
+            ValueError: An error occurs when key is not in the tree.
+        """
+        leaf = self._find_leaf(key)
+        index = _bisect.bisect_left(leaf.keys, key)
+        if index == len(leaf.keys) or leaf.keys[index] != key:
+            raise ValueError('Key not found.')
+        return leaf.values[index]
+
+    def contains(self, key):
+        """Verify if a key is in the tree.
+
+        Args:
+            key (object): The queried key.
+
+        Returns:
+            bool: True if the key is in the tree, False otherwise.
+
+        Raises:
+            Nothing.
+        """
+        leaf = self._find_leaf(key)
+        index = _bisect.bisect_left(leaf.keys, key)
+        return index < len(leaf.keys) and leaf.keys[index] == key
+
+    def floor(self, key):
+        """Get the largest key lower than or equal to a key.
+
+        Args:
+            key (object): The queried key.
+
+        Returns:
+            object: The largest key k such that k <= key.
+
+        Raises:
+            ValueError: An error occurs when there is no such key.
+        """
+        node = self._root
+        left_subtree = None
+        leaf_class = self._Leaf
+        while node.__class__ is not leaf_class:
+            index = _bisect.bisect_right(node.keys, key)
+            if index > 0:
+                left_subtree = node.children[index - 1]
+            node = node.children[index]
+
+        index = _bisect.bisect_right(node.keys, key)
+        if index > 0:
+            return node.keys[index - 1]
+        if left_subtree is None:
+            raise ValueError('Key not found.')
+        # The floor is the largest key of the closest subtree on the left.
+        node = left_subtree
+        while node.__class__ is not leaf_class:
+            node = node.children[-1]
+        return node.keys[-1]
+
+    def ceiling(self, key):
+        """Get the smallest key greater than or equal to a key.
+
+        Args:
+            key (object): The queried key.
+
+        Returns:
+            object: The smallest key k such that k >= key.
+
+        Raises:
+            ValueError: An error occurs when there is no such key.
+        """
+        leaf = self._find_leaf(key)
+        index = _bisect.bisect_left(leaf.keys, key)
+        if index < len(leaf.keys):
+            return leaf.keys[index]
+        if leaf.next_leaf is None:
+            raise ValueError('Key not found.')
+        return leaf.next_leaf.keys[0]
+
+    def items(self, lo=None, hi=None):
+        """Iterate over the (key, value) pairs in sorted order.
+
+        The pairs are generated lazily by walking the linked leaves.
+
+        Args:
+            lo (Optional[object]): Smallest key of the range (inclusive).
+            hi (Optional[object]): Largest key of the range (inclusive).
+
+        Returns:
+            generator: The (key, value) pairs such that lo <= key <= hi.
+
+        Raises:
+            Nothing.
+        """
+        if lo is None:
+            leaf = self._root
+            while leaf.__class__ is not self._Leaf:
+                leaf = leaf.children[0]
+            index = 0
+        else:
+            leaf = self._find_leaf(lo)
+            index = _bisect.bisect_left(leaf.keys, lo)
+
+        while leaf is not None:
+            keys = leaf.keys
+            if hi is None or not keys or not hi < keys[-1]:
+                stop = len(keys)
+            else:
+                stop = _bisect.bisect_right(keys, hi)
+            for i in range(index, stop):
+                yield keys[i], leaf.values[i]
+            if stop < len(keys):
+                return
+            leaf = leaf.next_leaf
+            index = 0
+
+    def clear(self):
+        """Remove all keys from the tree.
+
+        Args:
+            Nothing.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        self._root = self._Leaf(self._new_keys(), [])
+        self._size = 0
+
+    def is_empty(self):
+        """Verify if the tree is empty.
+
+        Does not modify the tree.
+
+        Args:
+            Nothing.
+
+        Returns:
+            bool: True if the tree is empty, False otherwise.
+
+        Raises:
+            Nothing.
+        """
+        return self._size == 0
+
+    def size(self):
+        """Get the number of keys in the tree.
+
+        Does not modify the tree.
+
+        Args:
+            Nothing.
+
+        Returns:
+            int: The number of keys.
+
+        Raises:
+            Nothing.
+        """
+        return self._size
+
+    def copy(self):
+        """Copy of the tree.
+
+        The keys and values themselves are not copied.
+
+        Args:
+            Nothing.
+
+        Returns:
+            BPlusTree: A copy of the tree.
+
+        Raises:
+            Nothing.
+        """
+        copy_tree = self.__class__(self._fanout, self._typecode)
+        for key,value in self.items():
+            copy_tree.insert(key, value)
+        return copy_tree
+
+    def _is_balanced(self):
+        leaf_class = self._Leaf
+        leaves = []
+        pending = [(self._root, 0, None, None)]
+        depths = set()
+        while pending:
+            node, depth, lo, hi = pending.pop()
+            keys = list(node.keys)
+            if keys != sorted(set(keys)):
+                return False
+            if keys and ( (lo is not None and keys[0] < lo) or
+                          (hi is not None and not keys[-1] < hi) ):
+                return False
+            is_root = node is self._root
+            if node.__class__ is leaf_class:
+                if len(keys) > self._fanout or len(keys) != len(node.values):
+                    return False
+                if not is_root and len(keys) < self._fanout // 2:
+                    return False
+                depths.add(depth)
+                leaves.append(node)
+            else:
+                if len(node.children) != len(keys) + 1:
+                    return False
+                if len(node.children) > self._fanout:
+                    return False
+                if not is_root and len(node.children) < (self._fanout + 1) // 2:
+                    return False
+                bounds = [lo] + keys + [hi]
+                for i,child in enumerate(node.children):
+                    pending.append((child, depth + 1, bounds[i], bounds[i + 1]))
+        if len(depths) != 1:
+            return False
+        leaves.sort(key=lambda leaf : leaf.keys[0] if leaf.keys else None)
+        for leaf,next_leaf in zip(leaves, leaves[1:] + [None]):
+            if leaf.next_leaf is not next_leaf:
+                return False
+        return sum(len(leaf.keys) for leaf in leaves) == self._size
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for key,_ in self.items():
+            yield key
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def __getitem__(self, key):
+        return self.search(key)
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __delitem__(self, key):
+        self.delete(key)
+
+    def __eq__(self, other_tree):
+        if len(self) != len(other_tree):
+            return False
+
+        for item1,item2 in zip(self.items(), other_tree.items()):
+            if item1 != item2:
+                return False
+
+        return True
+
+    def __repr__(self):
+        return '{' + ', '.join(str(key) + ': ' + str(value)
+                               for key,value in self.items()) + '}'
+
+
+class RadixTree(Tree):
+    """Radix tree (compressed trie) over string keys.
+
+    The tree is a map from strings to values. Each edge is labeled with a
+    substring and a node with a single child is merged with it, so the
+    tree has at most two nodes per key. Looking up a key of length m takes
+    O(m) time whatever the number of keys, and all the keys that start
+    with a prefix are found below a single node. The children of a node
+    are kept in a list sorted by first character rather than in a dict,
+    which keeps the nodes small and the iteration in lexicographic order.
+
+    Args:
+        Nothing.
+
+    Attributes (public):
+        Nothing.
+    """
+
+    class _Node(object):
+        """Node class for radix tree.
+
+        Args:
+            label (str): Label of the edge that leads to the node.
+
+        Attributes (public):
+            label (str): Label of the edge that leads to the node.
+            firsts (str): First characters of the labels of the children,
+                          in increasing order.
+            children (python list): Child nodes, in the order of firsts, or
+                                    None for a leaf.
+            value (object): Value associated with the key ending here.
+            is_key (bool): True if a key ends at the node.
+        """
+        __slots__ = ('label', 'firsts', 'children', 'value', 'is_key')
+
+        def __init__(self, label):
+            self.label = label
+            self.firsts = ''
+            self.children = None
+            self.value = None
+            self.is_key = False
+
+    def __init__(self):
+        Tree.__init__(self)
+        self._root = self._Node('')
+        self._size = 0
+
+    def insert(self, key, value=None):
+        """Insert a key in the tree.
+
+        If the key is already in the tree, its value is replaced.
+
+        Args:
+            key (str): The key to insert.
+            value (Optional[object]): The value associated with the key.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        node = self._root
+        i = 0
+        while i < len(key):
+            index = node.firsts.find(key[i])
+            if index == -1:
+                child = self._Node(key[i:])
+                self._add_child(node, child)
+                node = child
+                break
+
+            child = node.children[index]
+            label = child.label
+            if key.startswith(label, i):
+                node = child
+                i = i + len(label)
+                continue
+
+            # Split the edge where the key and the label differ.
+            j = 1
+            n = min(len(label), len(key) - i)
+            while j < n and label[j] == key[i + j]:
+                j = j + 1
+            middle = self._Node(label[:j])
+            child.label = label[j:]
+            middle.firsts = child.label[0]
+            middle.children = [child]
+            node.children[index] = middle
+            node = middle
+            i = i + j
+
+        if not node.is_key:
+            node.is_key = True
+            self._size = self._size + 1
+        node.value = value
+
+    def _add_child(self, node, child):
+        """Insert child among the children of node.
+        """
+        if node.children is None:
+            node.firsts = child.label[0]
+            node.children = [child]
+        else:
+            index = _bisect.bisect_left(node.firsts, child.label[0])
+            node.firsts = (node.firsts[:index] + child.label[0] +
+                           node.firsts[index:])
+            node.children.insert(index, child)
+
+    def _remove_child(self, node, index):
+        """Remove the child at index among the children of node.
+        """
+        if len(node.children) == 1:
+            node.firsts = ''
+            node.children = None
+        else:
+            node.firsts = node.firsts[:index] + node.firsts[index + 1:]
+            del node.children[index]
+
+    def _find(self, key):
+        """Return the node where key ends, or None.
+        """
+        node = self._root
+        i = 0
+        while i < len(key):
+            index = node.firsts.find(key[i])
+            if index == -1:
+                return None
+            node = node.children[index]
+            if not key.startswith(node.label, i):
+                return None
+            i = i + len(node.label)
+        return node
+
+    def delete(self, key):
+        """Remove a key from the tree.
+
+        Args:
+            key (str): The key to remove.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            ValueError: An error occurs when key is not in the tree.
+        """
+        path = [self._root]
+        node = self._root
+        i = 0
+        while i < len(key):
+            index = node.firsts.find(key[i])
+            if index == -1:
+                raise ValueError('Key not found.')
+            node = node.children[index]
+            if not key.startswith(node.label, i):
+                raise ValueError('Key not found.')
+            i = i + len(node.label)
+            path.append(node)
+        if not node.is_key:
+            raise ValueError('Key not found.')
+
+        node.is_key = False
+        node.value = None
+        self._size = self._size - 1
+        if node is self._root:
+            return
+
+        # Remove the node if it became a leaf, then merge the remaining
+        # node with its only child if it has a single one.
+        parent = path[-2]
+        if node.children is None:
+            self._remove_child(parent, parent.firsts.find(node.label[0]))
+            if parent is self._root or parent.is_key:
+                return
+            node = parent
+            parent = path[-3]
+        if node.children is not None and len(node.children) == 1:
+            child = node.children[0]
+            child.label = node.label + child.label
+            parent.children[parent.firsts.find(child.label[0])] = child
+
+    def search(self, key):
+        """Get the value associated with a key.
+
+        Args:
+            key (str): The queried key.
+
+        Returns:
+            object: The value associated with the key.
+
+        Raises:
+            ValueError: An error occurs when key is not in the tree.
+        """
+        node = self._find(key)
+        if node is None or not node.is_key:
+            raise ValueError('Key not found.')
+        return node.value
+
+    def contains(self, key):
+        """Verify if a key is in the tree.
+
+        Args:
+            key (str): The queried key.
+
+        Returns:
+            bool: True if the key is in the tree, False otherwise.
+
+        Raises:
+            Nothing.
+        """
+        node = self._find(key)
+        return node is not None and node.is_key
+
+    def longest_prefix(self, query):
+        """Get the longest key that is a prefix of a string.
+
+        Args:
+            query (str): The queried string.
+
+        Returns:
+            (str, object): The longest key k such that query starts with k,
+                           and its value.
+
+        Raises:
+            ValueError: An error occurs when no key is a prefix of query.
+        """
+        node = self._root
+        i = 0
+        match = node if node.is_key else None
+        match_length = 0
+        while i < len(query):
+            index = node.firsts.find(query[i])
+            if index == -1:
+                break
+            node = node.children[index]
+            if not query.startswith(node.label, i):
+                break
+            i = i + len(node.label)
+            if node.is_key:
+                match = node
+                match_length = i
+        if match is None:
+            raise ValueError('Key not found.')
+        return query[:match_length], match.value
+
+    def items(self, prefix=''):
+        """Iterate over the (key, value) pairs whose key starts with a
+           prefix, in lexicographic order.
+
+        The pairs are generated lazily.
+
+        Args:
+            prefix (Optional[str]): The prefix of the keys.
+
+        Returns:
+            generator: The (key, value) pairs.
+
+        Raises:
+            Nothing.
+        """
+        node = self._root
+        path = ''
+        i = 0
+        while i < len(prefix):
+            index = node.firsts.find(prefix[i])
+            if index == -1:
+                return
+            node = node.children[index]
+            if prefix.startswith(node.label, i):
+                i = i + len(node.label)
+            elif not node.label.startswith(prefix[i:]):
+                return
+            else:
+                i = len(prefix)
+            path = path + node.label
+
+        pending = [(node, path)]
+        while pending:
+            node, path = pending.pop()
+            if node.is_key:
+                yield path, node.value
+            if node.children is not None:
+                for child in reversed(node.children):
+                    pending.append((child, path + child.label))
+
+    def clear(self):
+        """Remove all keys from the tree.
+
+        Args:
+            Nothing.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            Nothing.
+        """
+        self._root = self._Node('')
+        self._size = 0
+
+    def is_empty(self):
+        """Verify if the tree is empty.
+
+        Does not modify the tree.
+
+        Args:
+            Nothing.
+
+        Returns:
+            bool: True if the tree is empty, False otherwise.
+
+        Raises:
+            Nothing.
+        """
+        return self._size == 0
+
+    def size(self):
+        """Get the number of keys in the tree.
+
+        Does not modify the tree.
+
+        Args:
+            Nothing.
+
+        Returns:
+            int: The number of keys.
+
+        Raises:
+            Nothing.
+        """
+        return self._size
+
+    def _is_compressed(self):
+        n_keys = 0
+        pending = [self._root]
+        while pending:
+            node = pending.pop()
+            if node.is_key:
+                n_keys = n_keys + 1
+            elif node is not self._root and node.value is not None:
+                return False
+            if node.children is None:
+                if node.firsts or (node is not self._root and not node.is_key):
+                    return False
+                continue
+            if not node.children or len(node.children) != len(node.firsts):
+                return False
+            if ( node is not self._root and not node.is_key and
+                 len(node.children) == 1 ):
+                return False
+            if list(node.firsts) != sorted(set(node.firsts)):
+                return False
+            for first,child in zip(node.firsts, node.children):
+                if not child.label or child.label[0] != first:
+                    return False
+                pending.append(child)
+        return n_keys == self._size
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for key,_ in self.items():
+            yield key
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def __getitem__(self, key):
+        return self.search(key)
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __delitem__(self, key):
+        self.delete(key)
+
+    def __repr__(self):
+        return '{' + ', '.join(str(key) + ': ' + str(value)
+                               for key,value in self.items()) + '}'
+
+
+class SegmentTree(Tree):
+    """Segment tree over an array of elements.
+
+    The tree is stored implicitly in a python list of size 2n: the leaves
+    are the elements, at positions n to 2n - 1, and position i holds the
+    aggregate of positions 2i and 2i + 1. It answers range aggregate
+    queries and point updates in O(log n) time, for any associative
+    operation such as a sum, a min or a max.
+
+    Args:
+        elements (iterable (object)): The initial elements.
+        operation (Optional[function]): Associative function of two
+            elements. Defaults to operator.add, i.e. range sums.
+
+    Attributes (public):
+        Nothing.
+    """
+    def __init__(self, elements, operation=None):
+        Tree.__init__(self)
+        if operation is None:
+            operation = _operator.add
+        self._operation = operation
+        elements = list(elements)
+        self._n_elements = len(elements)
+        self._tree = [None] * self._n_elements + elements
+        for index in range(self._n_elements - 1, 0, -1):
+            self._tree[index] = operation(self._tree[2*index],
+                                          self._tree[2*index + 1])
+
+    def query(self, start, stop):
+        """Aggregate the elements in a range of indices.
+
+        Args:
+            start (int): Index of the first element of the range.
+            stop (int): Index after the last element of the range.
+
+        Returns:
+            object: The aggregate of elements[start:stop].
+
+        Raises:
+            ValueError: An error occurs if the range is empty or out of
+                        range, i.e. if not 0 <= start < stop <= size.
+        """
+        if not 0 <= start < stop <= self._n_elements:
+            raise ValueError('Argument index out of range.')
+
+        tree = self._tree
+        operation = self._operation
+        lo = start + self._n_elements
+        hi = stop + self._n_elements
+        # The aggregates are accumulated separately on both sides so the
+        # operation does not need to be commutative.
+        left = None
+        right = None
+        while lo < hi:
+            if lo & 1:
+                left = tree[lo] if left is None else operation(left, tree[lo])
+                lo = lo + 1
+            if hi & 1:
+                hi = hi - 1
+                right = tree[hi] if right is None else operation(tree[hi], right)
+            lo = lo // 2
+            hi = hi // 2
+
+        if left is None:
+            return right
+        if right is None:
+            return left
+        return operation(left, right)
+
+    def read(self, index):
+        """Read the element at a certain index.
+
+        Args:
+            index (int): The index of the element.
+
+        Returns:
+            object: The element at position index.
+
+        Raises:
+            ValueError: An error occurs if index is out of range, i.e.
+                        if index < -1 * size or if index >= size.
+        """
+        if (index < -self._n_elements) or (index >= self._n_elements):
+            raise ValueError('Argument index out of range.')
+        if index < 0:
+            index = self._n_elements + index
+        return self._tree[self._n_elements + index]
+
+    def write(self, item, index):
+        """Modify the element at a certain index.
+
+        The aggregates of the O(log n) ranges that contain the element are
+        updated.
+
+        Args:
+            item (object): The element to write.
+            index (int): The index of the element.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            ValueError: An error occurs if index is out of range, i.e.
+                        if index < -1 * size or if index >= size.
+        """
+        if (index < -self._n_elements) or (index >= self._n_elements):
+            raise ValueError('Argument index out of range.')
+        if index < 0:
+            index = self._n_elements + index
+
+        tree = self._tree
+        operation = self._operation
+        index = self._n_elements + index
+        tree[index] = item
+        while index > 1:
+            index = index // 2
+            tree[index] = operation(tree[2*index], tree[2*index + 1])
+
+    def size(self):
+        """Get the number of elements.
+
+        Args:
+            Nothing.
+
+        Returns:
+            int: The number of elements.
+
+        Raises:
+            Nothing.
+        """
+        return self._n_elements
+
+    def __len__(self):
+        return self._n_elements
+
+    def __getitem__(self, index):
+        return self.read(index)
+
+    def __setitem__(self, index, item):
+        self.write(item, index)
+
+    def __iter__(self):
+        return iter(self._tree[self._n_elements:])
+
+    def __repr__(self):
+        return '[' + ', '.join(str(item) for item in self) + ']'
+
+
+class EytzingerTree(Tree):
+    """Static search tree stored in Eytzinger order.
+
+    The sorted keys are laid out in the breadth-first order of a complete
+    binary search tree, the same implicit layout as Heap: the children of
+    position i are at 2i and 2i + 1. A lookup goes down one level per step
+    with the branch-free update i = 2i + (keys[i] < key), and the top
+    levels of the tree share a few cache lines, so lookups touch less
+    memory than a binary search over a sorted array. The tree cannot be
+    modified once built, which suits lookup tables that are built once
+    and queried many times.
+
+    Numeric keys can be stored unboxed in an array.array by giving a
+    typecode. In that case, and if numpy is installed, search_many runs
+    the descent of a whole batch of keys at once, one vectorized step per
+    level.
+
+    Args:
+        keys (iterable (object)): The keys of the table, all different.
+        values (Optional[iterable (object)]): The values associated with
+            the keys, in the same order. Defaults to None for every key.
+        typecode (Optional[str]): Typecode of the array.array holding the
+                                  keys, e.g. 'q' for 64-bit integers or 'd'
+                                  for floats. By default keys are stored in
+                                  a python list.
+
+    Attributes (public):
+        Nothing.
+
+    Raises:
+        ValueError: An error occurs if a key appears more than once, or if
+                    keys and values have different lengths.
+    """
+    def __init__(self, keys, values=None, typecode=None):
+        Tree.__init__(self)
+        keys = list(keys)
+        if values is None:
+            values = [None] * len(keys)
+        else:
+            values = list(values)
+            if len(values) != len(keys):
+                raise ValueError('Arguments keys and values must have the '
+                                 'same length.')
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        for previous,index in zip(order, order[1:]):
+            if keys[previous] == keys[index]:
+                raise ValueError('Argument keys contains duplicates.')
+
+        self._size = len(keys)
+        self._typecode = typecode
+        # Position 0 is unused so that the children of i are 2i and 2i + 1.
+        tree_keys = [keys[order[0]] if keys else None] * (self._size + 1)
+        tree_values = [None] * (self._size + 1)
+        for position,index in zip(self._inorder_positions(), order):
+            tree_keys[position] = keys[index]
+            tree_values[position] = values[index]
+        if typecode is None:
+            self._keys = tree_keys
+        else:
+            if not keys:
+                tree_keys = [0]
+            self._keys = _array.array(typecode, tree_keys)
+        self._values = tree_values
+
+    def _inorder_positions(self):
+        """Iterate over the positions of the tree in key order.
+        """
+        n_keys = self._size
+        stack = []
+        position = 1
+        while stack or position <= n_keys:
+            while position <= n_keys:
+                stack.append(position)
+                position = 2*position
+            position = stack.pop()
+            yield position
+            position = 2*position + 1
+
+    def _lower_bound(self, key):
+        """Return the position of the smallest key greater than or equal to
+           key, or 0 if there is none.
+        """
+        keys = self._keys
+        n_keys = self._size
+        position = 1
+        while position <= n_keys:
+            position = 2*position + (keys[position] < key)
+        # Going right appends a 1 bit to the position: the answer is the
+        # last node where the descent went left, i.e. the position without
+        # its trailing 1 bits and the 0 bit before them.
+        return position >> ((~position) & (position + 1)).bit_length()
+
+    def search(self, key):
+        """Search the value associated with a key.
+
+        Args:
+            key (object): The queried key.
+
+        Returns:
+            object: The value associated with the key.
+
+        Raises:
+            ValueError: An error occurs if the key is not in the tree.
+        """
+        position = self._lower_bound(key)
+        if position == 0 or self._keys[position] != key:
+            raise ValueError('Key not found.')
+        return self._values[position]
+
+    def search_many(self, keys, default=None):
+        """Search the values associated with several keys.
+
+        The descent is vectorized with numpy when the keys are stored in an
+        array.array and numpy is installed.
+
+        Args:
+            keys (iterable (object)): The queried keys.
+            default (Optional[object]): The value returned for the keys
+                                        that are not in the tree.
+
+        Returns:
+            python list: The value associated with each key, or default.
+
+        Raises:
+            Nothing.
+        """
+        tree_keys = self._keys
+        values = self._values
+        if _numpy is None or self._typecode is None or self._size == 0:
+            results = []
+            for key in keys:
+                position = self._lower_bound(key)
+                if position != 0 and tree_keys[position] == key:
+                    results.append(values[position])
+                else:
+                    results.append(default)
+            return results
+
+        tree_keys = _numpy.frombuffer(tree_keys, dtype=tree_keys.typecode)
+        if not isinstance(keys, (list, tuple, _numpy.ndarray)):
+            keys = list(keys)
+        queries = _numpy.asarray(keys)
+        n_keys = self._size
+        positions = _numpy.ones(len(queries), dtype=_numpy.int64)
+        # Every query takes the same number of steps: the ones that already
+        # left the tree keep their position, clipped reads stay in bounds.
+        for _ in range(n_keys.bit_length()):
+            descended = 2*positions + (
+                tree_keys[_numpy.minimum(positions, n_keys)] < queries)
+            positions = _numpy.where(positions <= n_keys, descended, positions)
+        positions = positions // (2*((~positions) & (positions + 1)))
+        found = (positions != 0) & (tree_keys[positions] == queries)
+        return [values[position] if hit else default
+                for position,hit in zip(positions.tolist(), found.tolist())]
+
+    def contains(self, key):
+        """Verify if a key is in the tree.
+
+        Args:
+            key (object): The queried key.
+
+        Returns:
+            bool: True if the key is in the tree, False otherwise.
+
+        Raises:
+            Nothing.
+        """
+        position = self._lower_bound(key)
+        return position != 0 and self._keys[position] == key
+
+    def ceiling(self, key):
+        """Find the smallest key greater than or equal to a key.
+
+        Args:
+            key (object): The queried key.
+
+        Returns:
+            object: The smallest key k such that k >= key.
+
+        Raises:
+            ValueError: An error occurs if every key is lower than key.
+        """
+        position = self._lower_bound(key)
+        if position == 0:
+            raise ValueError('Key not found.')
+        return self._keys[position]
+
+    def items(self):
+        """Iterate over the (key, value) pairs in key order.
+
+        Args:
+            Nothing.
+
+        Returns:
+            generator: The (key, value) pairs.
+
+        Raises:
+            Nothing.
+        """
+        keys = self._keys
+        values = self._values
+        for position in self._inorder_positions():
+            yield keys[position], values[position]
+
+    def size(self):
+        """Get the number of keys in the tree.
+
+        Args:
+            Nothing.
+
+        Returns:
+            int: The number of keys.
+
+        Raises:
+            Nothing.
+        """
+        return self._size
+
+    def is_empty(self):
+        """Verify if the tree is empty.
+
+        Args:
+            Nothing.
+
+        Returns:
+            bool: True if the tree is empty, False otherwise.
+
+        Raises:
+            Nothing.
+        """
+        return self._size == 0
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        keys = self._keys
+        for position in self._inorder_positions():
+            yield keys[position]
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def __getitem__(self, key):
+        return self.search(key)
+
+    def __eq__(self, other_tree):
+        if len(self) != len(other_tree):
+            return False
+
+        for item1,item2 in zip(self.items(), other_tree.items()):
+            if item1 != item2:
+                return False
+
+        return True
+
+    def __repr__(self):
+        return '{' + ', '.join(str(key) + ': ' + str(value)
+                               for key,value in self.items()) + '}'